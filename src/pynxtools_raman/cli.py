@@ -23,29 +23,108 @@ entry point, mirroring the top-level ``pynx`` dispatcher in pynxtools::
     pynx-raman download [ROD_IDS...]            # download a batch of .rod files
     pynx-raman build-upload-batch [ROD_IDS...]  # download, convert, and stamp a NOMAD upload batch
     pynx-raman analyze-keys [ROD_DIR]           # count CIF key frequency across a directory
+    pynx-raman build-archive [ROD_DIR]          # store all spectra of a directory in one HDF5 file
+    pynx-raman search-spectra WITEC_FILES...    # rank ROD reference spectra by similarity
+    pynx-raman match-peaks POSITIONS...         # list ROD IDs with peaks at all given positions
+    pynx-raman query [ROD_DIR]                  # list ROD IDs by indexed metadata (laser, space group, ...)
 
 ``download`` and ``build-upload-batch`` share the same options
 (--ids-file, --all, --output-dir, --yes/-y); ``analyze-keys`` defaults to
 the same directory (rod_batch) and writes its report there too.
+
+Sub-commands are registered lazily: their modules (and with them pynxtools'
+converter, gemmi, requests, numpy, ...) are only imported once that
+sub-command is actually run, so ``pynx-raman --help`` stays fast.
 """
 
+import importlib
+
 import click
 
-from pynxtools_raman.rod_database.rod_batch import (
-    build_rod_upload_batch,
-    download_rod_files_cli,
-)
-from pynxtools_raman.rod_database.rod_stats import analyze_rod_keys
+# name -> (module, command attribute, one-line summary shown by --help,
+# the first line of the command's docstring)
+LAZY_SUBCOMMANDS: dict[str, tuple[str, str, str]] = {
+    "download": (
+        "pynxtools_raman.rod_database.rod_batch",
+        "download_rod_files_cli",
+        "Download a batch of .rod files from the Raman Open Database.",
+    ),
+    "build-upload-batch": (
+        "pynxtools_raman.rod_database.rod_batch",
+        "build_rod_upload_batch",
+        "Download and convert a batch of ROD records into a NOMAD upload.",
+    ),
+    "analyze-keys": (
+        "pynxtools_raman.rod_database.rod_stats",
+        "analyze_rod_keys",
+        "Count how often each CIF key occurs across the .rod files in ROD_DIR.",
+    ),
+    "build-archive": (
+        "pynxtools_raman.rod_database.spectral_archive",
+        "build_spectral_archive_cli",
+        "Store the spectra of all .rod files in ROD_DIR in one HDF5 archive.",
+    ),
+    "search-spectra": (
+        "pynxtools_raman.rod_database.similarity_search",
+        "search_spectra_cli",
+        "Rank the ROD reference spectra by their similarity to WITEC_FILES.",
+    ),
+    "match-peaks": (
+        "pynxtools_raman.rod_database.peak_index",
+        "match_peaks_cli",
+        "List the ROD IDs of all records with a peak near each of POSITIONS.",
+    ),
+    "query": (
+        "pynxtools_raman.rod_database.metadata_index",
+        "query_rod_metadata",
+        "List the ROD IDs of all records in ROD_DIR matching every condition.",
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    """click.Group that imports a sub-command's module only when that
+    sub-command is looked up to be run (or for its own --help); the group's
+    --help is rendered from the summaries in `lazy_subcommands` instead.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_subcommands: dict[str, tuple[str, str, str]] | None = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
 
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
 
-@click.group()
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_subcommands:
+            module_name, attribute, _ = self.lazy_subcommands[cmd_name]
+            return getattr(importlib.import_module(module_name), attribute)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.lazy_subcommands:
+                rows.append((name, self.lazy_subcommands[name][2]))
+            else:
+                command = super().get_command(ctx, name)
+                if command is not None and not command.hidden:
+                    rows.append((name, command.get_short_help_str()))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=LAZY_SUBCOMMANDS)
 def pynx_raman():
     """pynxtools-raman command-line tools.
 
     Use ``pynx-raman COMMAND --help`` for details on each sub-command.
     """
-
-
-pynx_raman.add_command(download_rod_files_cli, name="download")
-pynx_raman.add_command(build_rod_upload_batch, name="build-upload-batch")
-pynx_raman.add_command(analyze_rod_keys, name="analyze-keys")
@@ -0,0 +1,48 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Process-wide cache of the parsed reader config files.
+
+MultiFormatReader parses the config file (and flattens it) on every read().
+The config files don't change between files, so load_config_dict parses
+each one once per process, and again only once it was modified.
+RamanReader hands the result to MultiFormatReader as its config_dict,
+which fills the template from it as usual (see fill_from_config).
+"""
+
+from pathlib import Path
+from typing import Any
+
+from pynxtools.dataconverter.readers.utils import parse_flatten_json
+
+# (resolved path, mtime in ns) -> flattened config dict
+_CACHE: dict[tuple[str, int], dict[str, Any]] = {}
+
+
+def load_config_dict(config_file: str | Path) -> dict[str, Any]:
+    """
+    Return the flattened config dict of config_file, as parse_flatten_json
+    would, parsing the file only on first use (or once it was modified) in
+    this process. The returned dict is a copy the caller may modify.
+    """
+    path = Path(config_file).resolve()
+    cache_key = (str(path), path.stat().st_mtime_ns)
+    config_dict = _CACHE.get(cache_key)
+    if config_dict is None:
+        config_dict = parse_flatten_json(path, create_link_dict=False)
+        _CACHE[cache_key] = config_dict
+    return dict(config_dict)
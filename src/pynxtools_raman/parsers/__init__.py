@@ -15,8 +15,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import importlib
+
 from .base import _RamanParser
-from .rod import RodParser
-from .witec import WitecParser
 
 __all__ = ["RodParser", "WitecParser", "_RamanParser"]
+
+# Each parser module pulls in its own heavy dependency (gemmi for .rod,
+# numpy for WITec), so parsers are only imported on first access.
+_LAZY_PARSERS = {"RodParser": ".rod", "WitecParser": ".witec"}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PARSERS:
+        return getattr(importlib.import_module(_LAZY_PARSERS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
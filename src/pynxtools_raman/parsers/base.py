@@ -26,9 +26,13 @@ from pynxtools_raman.parsers.versioning import (
     VersionTuple,
     is_version_supported,
 )
+from pynxtools_raman.timing import timed
 
 __all__: list[str] = []
 
+# How much of a file matches_file() implementations get to look at.
+HEAD_SIZE = 8192
+
 
 class _RamanParser(ABC):
     """
@@ -56,12 +60,26 @@ class _RamanParser(ABC):
     supported_vendor: ClassVar[str | None] = None
     config_file: ClassVar[str] = ""  # filename under config/
     unused_attrs_group_name: ClassVar[str] = "unused_data"
+    # Set if the config file has "@eln" references or post_process reads
+    # eln_data; other parsers' entries are filled without the ELN data.
+    uses_eln_data: ClassVar[bool] = False
+    # Set if _parse() goes through read_content() anyway: read_head() then
+    # reads (and keeps) the whole file, so checking + parsing is one read.
+    parse_reads_whole_file: ClassVar[bool] = False
 
     def __init__(self) -> None:
         self.file: Path | None = None
         self.attrs: dict[str, Any] = {}
         self.data: dict[str, Any] = {}
         self.unused_attrs: dict[str, Any] = {}
+        # Raw content of the file currently being checked/parsed, and the
+        # file a successful _is_mainfile() check was last cached for, so
+        # that check + parse of one file costs a single read.
+        self._content: bytes | None = None
+        self._content_file: Path | None = None
+        self._head: bytes | None = None
+        self._head_file: Path | None = None
+        self._mainfile_verified: Path | None = None
 
     @classmethod
     def is_extension_supported(cls, file: Path) -> bool:
@@ -77,14 +95,65 @@ class _RamanParser(ABC):
         have one to detect; the default means "no version concept"."""
         return None
 
+    def read_content(self, file: Path) -> bytes:
+        """Return the raw bytes of `file`, read from disk only once per
+        parser instance no matter how often it's asked for. Raises OSError
+        like Path.read_bytes()."""
+        if self._content_file != file or self._content is None:
+            self._content = file.read_bytes()
+            self._content_file = file
+        return self._content
+
+    def read_head(self, file: Path) -> bytes:
+        """Return the first HEAD_SIZE bytes of `file`, for matches_file().
+        Served from a head handed over via offer_head() (see
+        parsers/registry.py) or from the content read_content() read, when
+        there is one, so sniffing a file costs no read of its own. Raises
+        OSError like open()."""
+        if self._head_file == file and self._head is not None:
+            return self._head
+        if self.parse_reads_whole_file or (
+            self._content_file == file and self._content is not None
+        ):
+            return self.read_content(file)[:HEAD_SIZE]
+        with open(file, "rb") as head_file:
+            self._head = head_file.read(HEAD_SIZE)
+        self._head_file = file
+        return self._head
+
+    def offer_head(self, file: Path, head: bytes) -> None:
+        """Hand over the first HEAD_SIZE bytes of `file`, already read by
+        the caller, for read_head() to serve."""
+        self._head = head
+        self._head_file = file
+
+    def offer_content(self, file: Path, content: bytes) -> None:
+        """Hand over the raw bytes of `file`, already read by the caller,
+        for read_content() (and read_head()) to serve."""
+        self._content = content
+        self._content_file = file
+
+    def offer_verdict(self, file: Path) -> None:
+        """Hand over an earlier verdict that `file` is supported by this
+        parser (see parsers/registry.py), for parse() to trust instead of
+        checking the file again."""
+        self._mainfile_verified = file
+
+    def _release_content(self) -> None:
+        self._content = None
+        self._content_file = None
+        self._head = None
+        self._head_file = None
+
     @abstractmethod
     def matches_file(self, file: Path) -> bool:
         """
         Return True if `file` structurally matches this parser's format.
 
         Implementations must perform positive identification - not just an
-        extension check. Keep it cheap (read at most a few KB), and always
-        catch exceptions internally and return False rather than raising.
+        extension check. Keep it cheap: only look at read_head(file), and
+        always catch exceptions internally and return False rather than
+        raising.
         """
 
     def _is_mainfile(self, file: Path) -> None:
@@ -112,6 +181,22 @@ class _RamanParser(ABC):
                 f"for {type(self).__name__}."
             )
 
+        self._mainfile_verified = file
+
+    def check_mainfile(self, file: str | Path) -> bool:
+        """
+        Instance-level counterpart of `is_mainfile`: same non-raising
+        check, but the verdict (and whatever content was read to reach it)
+        stays on this parser, so a following `parse()` of the same file
+        neither re-checks nor re-reads it.
+        """
+        try:
+            self._is_mainfile(Path(file))
+            return True
+        except ValueError:
+            self._release_content()
+            return False
+
     @classmethod
     def is_mainfile(cls, file: str | Path) -> bool:
         """
@@ -126,19 +211,30 @@ class _RamanParser(ABC):
         except ValueError:
             return False
 
-    def parse(self, file: str | Path, **kwargs) -> None:
+    def parse(self, file: str | Path, metadata_only: bool = False, **kwargs) -> None:
         """Parse `file`, populating self.attrs / self.data / self.unused_attrs
         in place. Raises ValueError if `file` doesn't match this parser -
-        callers should normally already have checked `is_mainfile()` first."""
+        callers should normally already have checked `is_mainfile()` first.
+
+        With `metadata_only`, only self.attrs / self.unused_attrs are needed:
+        parsers that can skip reading or converting the measured data do so
+        and leave self.data empty, so the result can't be post-processed or
+        converted."""
         file = Path(file)
         self.file = file
-        self._is_mainfile(file)
-        self._parse(file, **kwargs)
+        try:
+            with timed("parse", file):
+                if self._mainfile_verified != file:
+                    self._is_mainfile(file)
+                self._parse(file, metadata_only=metadata_only, **kwargs)
+        finally:
+            self._release_content()
 
     @abstractmethod
     def _parse(self, file: Path, **kwargs) -> None:
         """Populate self.attrs / self.data / self.unused_attrs. Implemented
-        by subclasses."""
+        by subclasses; `metadata_only` is passed on as a keyword argument,
+        which parsers without a faster path for it may ignore."""
 
     def post_process(self, eln_data: dict[str, Any]) -> None:
         """Derive fields that need config/ELN context, after all input
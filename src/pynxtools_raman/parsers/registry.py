@@ -0,0 +1,133 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Registry of all raman parsers, dispatching a file to the one whose
+matches_file() recognizes its content.
+
+A file's head (the first HEAD_SIZE bytes) is read once and offered to every
+registered parser supporting the file's extension, in registration order,
+so adding another vendor format doesn't cost another open of every file.
+If one of them reads the whole file to parse it anyway (see
+_RamanParser.parse_reads_whole_file), the whole file is read instead, and
+handed to those parsers as their content. The winning parser keeps its
+verdict and that content (see _RamanParser.check_mainfile), so parsing it
+afterwards neither checks nor reads the file again.
+
+Verdicts are also remembered per file path and modification time for the
+rest of the process, so dispatching an unchanged file again (e.g. when a
+whole directory is converted repeatedly) reads nothing until it's parsed.
+"""
+
+import importlib
+import logging
+from pathlib import Path
+
+from pynxtools_raman.parsers.base import HEAD_SIZE, _RamanParser
+
+logger = logging.getLogger("pynxtools")
+
+__all__ = [
+    "find_parser",
+    "register_parser",
+    "registered_parsers",
+    "supported_extensions",
+]
+
+# Built-in parsers, imported on first use; see parsers/__init__.py.
+_BUILTIN_PARSERS = ("RodParser", "WitecParser")
+_EXTRA_PARSERS: list[type[_RamanParser]] = []
+# (resolved path, st_mtime_ns, st_size) -> the parser class that
+# recognized the file, or None if none did
+_VERDICTS: dict[tuple[str, int, int], type[_RamanParser] | None] = {}
+
+
+def register_parser(parser_class: type[_RamanParser]) -> type[_RamanParser]:
+    """Register an additional parser; usable as a class decorator."""
+    if parser_class not in _EXTRA_PARSERS:
+        _EXTRA_PARSERS.append(parser_class)
+        # files no parser recognized so far may be this one's
+        _VERDICTS.clear()
+    return parser_class
+
+
+def registered_parsers() -> list[type[_RamanParser]]:
+    """All registered parser classes, built-in ones first."""
+    parsers = importlib.import_module("pynxtools_raman.parsers")
+    return [getattr(parsers, name) for name in _BUILTIN_PARSERS] + _EXTRA_PARSERS
+
+
+def supported_extensions() -> list[str]:
+    """The (lower-case) file extensions any registered parser supports."""
+    extensions: dict[str, None] = {}
+    for parser_class in registered_parsers():
+        extensions.update(
+            (extension.lower(), None)
+            for extension in parser_class.supported_file_extensions
+        )
+    return list(extensions)
+
+
+def find_parser(file: str | Path) -> _RamanParser | None:
+    """
+    Return a parser instance that has recognized `file` (ready for
+    parse(file)), or None if no registered parser does.
+    """
+    file = Path(file)
+    candidates = [
+        parser_class
+        for parser_class in registered_parsers()
+        if parser_class.is_extension_supported(file)
+    ]
+    if not candidates:
+        return None
+
+    try:
+        stat = file.stat()
+    except OSError as exc:
+        logger.warning(f"Could not read '{file}': {exc}")
+        return None
+    verdict_key = (str(file.resolve()), stat.st_mtime_ns, stat.st_size)
+    if verdict_key in _VERDICTS:
+        known_class = _VERDICTS[verdict_key]
+        if known_class is None:
+            return None
+        parser = known_class()
+        parser.offer_verdict(file)
+        return parser
+
+    read_whole_file = any(
+        parser_class.parse_reads_whole_file for parser_class in candidates
+    )
+    try:
+        with open(file, "rb") as opened_file:
+            content = opened_file.read(-1 if read_whole_file else HEAD_SIZE)
+    except OSError as exc:
+        logger.warning(f"Could not read '{file}': {exc}")
+        return None
+
+    head = content[:HEAD_SIZE]
+    for parser_class in candidates:
+        parser = parser_class()
+        if parser_class.parse_reads_whole_file:
+            parser.offer_content(file, content)
+        else:
+            parser.offer_head(file, head)
+        if parser.check_mainfile(file):
+            _VERDICTS[verdict_key] = parser_class
+            return parser
+    _VERDICTS[verdict_key] = None
+    return None
@@ -19,16 +19,18 @@ import copy
 import datetime
 import logging
 import re
+from collections.abc import Collection
 from pathlib import Path
 from typing import Any
 
-import gemmi  # for cif file handling
+import numpy as np
 
 from pynxtools_raman.parsers.base import _RamanParser
+from pynxtools_raman.timing import timed
 
 logger = logging.getLogger("pynxtools")
 
-__all__ = ["RodParser", "build_citation_fields"]
+__all__ = ["RodParser", "build_citation_fields", "cif_float"]
 
 ROD_CITATION_DOI = "10.1107/S1600576719004229"
 ROD_CITATION_TEXT = (
@@ -48,6 +50,42 @@ ROD_RECORD_URL_TEMPLATE = "https://solsa.crystallography.net/rod/{code}.html"
 ROD_SPECTRUM_DATA_KEYS = ("_raman_spectrum.intensity", "_raman_spectrum.raman_shift")
 
 
+def cif_float(value: Any) -> float:
+    """
+    The number in a scalar CIF value, without its standard uncertainty
+    (e.g. "1.23(4)" -> 1.23), or NaN if it isn't one.
+    """
+    try:
+        return float(str(value).split("(")[0])
+    except ValueError:
+        return float("nan")
+
+
+def _loop_values_to_array(values: list[str]) -> np.ndarray:
+    """
+    Convert the string values of a CIF loop column into a float64 array,
+    stripping standard uncertainties (e.g. "1.23(4)" -> 1.23) on the whole
+    column at once.
+
+    Raises ValueError if any value is not numeric.
+    """
+    column = np.asarray(values, dtype=np.str_)
+    try:
+        return column.astype(np.float64)
+    except ValueError:
+        pass
+
+    head, bracket, tail = np.char.partition(column, "(").T
+    has_uncertainty = bracket != ""
+    uncertainty = np.char.rstrip(tail[has_uncertainty], ")")
+    if not (
+        np.char.endswith(tail[has_uncertainty], ")").all()
+        and np.char.isdigit(uncertainty).all()
+    ):
+        raise ValueError("loop column contains non-numeric values")
+    return head.astype(np.float64)
+
+
 class RodParser(_RamanParser):
     """
     Parses .rod files (CIF-formatted records from the Raman Open Database)
@@ -59,106 +97,53 @@ class RodParser(_RamanParser):
     supported_file_extensions = (".rod",)
     config_file = "config_file_rod.json"
     unused_attrs_group_name = "unused_rod_keys"
+    parse_reads_whole_file = True
 
     def __init__(self, *args, **kwargs):
         super().__init__()
         self.cif_doc = None
         self.cif_block = None
-        self.lines = []
 
     def matches_file(self, file: Path) -> bool:
         """A .rod file is a CIF file, and every CIF file must declare a
         single data block near the top via a `data_<name>` line."""
         try:
-            with open(file, encoding="utf-8") as rod_file:
-                for _, line in zip(range(50), rod_file):
-                    if line.startswith("data_"):
-                        return True
+            head = self.read_head(file).split(b"\n", 50)[:50]
         except OSError:
             return False
-        return False
-
-    def _read_lines(self, file: str | Path):
-        """
-        Read all lines from the input files.
-        """
-        with open(file, encoding="utf-8") as utf8_file:
-            lines = utf8_file.readlines()
-
-        return lines
+        return any(line.startswith(b"data_") for line in head)
 
     def get_cif_file_content(self, file_path):
-        doc = gemmi.cif.read_file(str(file_path))
+        import gemmi  # for cif file handling; only needed once a file is parsed
+
+        # The same buffer matches_file looked at (see parse_reads_whole_file),
+        # so checking and parsing a file reads it from disk only once.
+        content = self.read_content(Path(file_path)).decode("utf-8")
+        doc = gemmi.cif.read_string(content)
         block = doc.sole_block()  # extract main block of cif file
         self.cif_doc = doc
         self.cif_block = block
-        self.lines = self._read_lines(file_path)
-
-    def get_string_position(self, string_element: str, check_only_pos_zero=False):
-        line_positions_of_str_element = []
-
-        rod_lines = self.lines
-        if check_only_pos_zero:
-            for line_number, lines in enumerate(rod_lines):
-                if string_element in lines[0]:
-                    line_positions_of_str_element.append(line_number)
-        else:
-            if rod_lines is None:
-                logger.info(f"Problem during reading .rod file. 'rod_lines' is None.")
-            else:
-                for line_number, lines in enumerate(rod_lines):
-                    if string_element in lines:
-                        line_positions_of_str_element.append(line_number)
-        return line_positions_of_str_element
-
-    def get_keys_and_loop_boolean(self, key_positions, key_pos_in_loops):
-        cif_key_loop_boolean_dict = {}
-        for key_pos in key_positions:
-            # go through all key_positions (i.e. line number)
-            # and check two cases: These lines are part of a loop or
-            # they are not part of a loop
-            # If they are in a loop, assign the bool value required for read
-            # out of the value from the key (i.e set =True)
-            if key_pos in key_pos_in_loops:
-                # remove linebreaks to ensure right assignment in values for input keys
-                cif_key_loop_boolean_dict[self.lines[key_pos].replace("\n", "")] = True
-            if key_pos not in key_pos_in_loops:
-                # some keys have their values on the same line, some on other lines
-                # Extract only the key, as this is always available.
-                # Use the key later to get the respective values
-                if " " in self.lines[key_pos]:
-                    key, value = self.lines[key_pos].split(maxsplit=1)
-                    cif_key_loop_boolean_dict[key] = False
-                else:
-                    # If only the key is on the line, without its value, extract only the key,
-                    # Remove possible linebreaks for clarity with .replace()
-                    cif_key_loop_boolean_dict[self.lines[key_pos].replace("\n", "")] = (
-                        False
-                    )
-
-        if len(key_positions) == len(cif_key_loop_boolean_dict):
-            return cif_key_loop_boolean_dict
-        else:
-            logger.info(f".rod file parsing warning: Not all rod-keys were parsed.")
-            return cif_key_loop_boolean_dict
-
-    def key_pos_after_loop(self, loop_pos_lists, key_pos_list):
-        loop_key_positions = []
-        for loop_pos_list in loop_pos_lists:
-            counter = 1
-            while loop_pos_list + counter in key_pos_list:
-                if (
-                    counter >= 100
-                ):  # implemented to avoid infinite loop, how to do better?
-                    raise IndexError
-                loop_key_positions.append(loop_pos_list + counter)
-                counter += 1
-
-        return loop_key_positions
+
+    def get_keys_and_loop_boolean(self) -> dict[str, bool]:
+        """
+        Map every CIF key of the data block to whether it is part of a loop,
+        in file order, in a single pass over gemmi's block items.
+
+        A key outside a loop is a "_key value" pair; a key inside a loop
+        names a column whose values have to be read out via find_loop.
+        """
+        cif_key_loop_boolean_dict: dict[str, bool] = {}
+        for item in self.cif_block:
+            if item.pair is not None:
+                cif_key_loop_boolean_dict[item.pair[0]] = False
+            elif item.loop is not None:
+                for tag in item.loop.tags:
+                    cif_key_loop_boolean_dict[tag] = True
+        return cif_key_loop_boolean_dict
 
     def get_cif_value_from_key(
         self, value_key: str, is_cif_loop_value=False
-    ) -> str | list:
+    ) -> str | list | np.ndarray:
         """
         Parse the top-level Prodigy export settings into a dict.
 
@@ -173,8 +158,10 @@ class RodParser(_RamanParser):
 
         Returns
         -------
-        output_list : str, list or np.array
-            Values, list, or np.array which is assigned to the respective key in the cif file
+        output_list : str, list or np.ndarray
+            Value which is assigned to the respective key in the cif file;
+            numeric loop columns are returned as float64 arrays, other loop
+            columns as lists of strings
 
         """
 
@@ -193,30 +180,23 @@ class RodParser(_RamanParser):
                     return value.replace("'", "")
                 return value
         if is_cif_loop_value:  # if block like value via loop_ = [....]
-            output_list = []
-            for element in block.find_loop(value_key):
-                output_list.append(element)
-            # try: # try to convert to numpy array
-            #    output_list = np.array(output_list, dtype=float)
-            #    return output_list
+            output_list = list(block.find_loop(value_key))
             try:  # try to convert to numpy array
-                output_list_float = [float(item) for item in output_list]
-                return output_list_float
+                return _loop_values_to_array(output_list)
             except ValueError:  # default string output if not convertable to float
                 return output_list
         return None
 
-    def extract_keys_and_values_from_cif(self):
-        loop_positions = self.get_string_position("loop_\n")
-        key_pos_non_loop = self.get_string_position("_", check_only_pos_zero=True)
-        key_pos_in_loops = self.key_pos_after_loop(loop_positions, key_pos_non_loop)
-        cif_key_dict_with_loop_boolean = self.get_keys_and_loop_boolean(
-            key_pos_non_loop, key_pos_in_loops
-        )
+    def extract_keys_and_values_from_cif(self, skip_keys: Collection[str] = ()):
+        """Extract the value of every CIF key of the data block except
+        skip_keys, whose values aren't read out at all."""
+        cif_key_dict_with_loop_boolean = self.get_keys_and_loop_boolean()
 
         # create a dictionary, and extract all the values by using the keys in correct formatting
         cif_dict_key_value_pair_dict = {}
         for key in cif_key_dict_with_loop_boolean:
+            if key in skip_keys:
+                continue
             bool_loop_value = cif_key_dict_with_loop_boolean[key]
             cif_dict_key_value_pair_dict[key] = self.get_cif_value_from_key(
                 key, is_cif_loop_value=bool_loop_value
@@ -224,9 +204,15 @@ class RodParser(_RamanParser):
 
         return cif_dict_key_value_pair_dict
 
-    def _parse(self, file: Path, **kwargs) -> None:
-        self.get_cif_file_content(file)
-        cif_fields = self.extract_keys_and_values_from_cif()
+    def _parse(self, file: Path, metadata_only: bool = False, **kwargs) -> None:
+        with timed("parse.cif", file):
+            self.get_cif_file_content(file)
+        with timed("parse.keys", file):
+            # with metadata_only, the spectrum loop's values (by far the
+            # bulk of a record) are never converted
+            cif_fields = self.extract_keys_and_values_from_cif(
+                skip_keys=ROD_SPECTRUM_DATA_KEYS if metadata_only else ()
+            )
 
         # the measured spectrum itself -> self.data; everything else -> self.attrs
         self.data = {
@@ -15,12 +15,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import itertools
+import logging
+import mmap
+import warnings
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 import numpy as np
 
-from pynxtools_raman.parsers.base import _RamanParser
+from pynxtools_raman.parsers.base import HEAD_SIZE, _RamanParser
+
+logger = logging.getLogger("pynxtools")
 
 __all__ = ["WitecParser"]
 
@@ -31,6 +38,21 @@ _WITEC_ALIASES = {
     "DataUnit": ("CCD cts", "counts"),
 }
 
+# matches_file() looks for the [Header] and [Data] sections in this many
+# lines at the top of a file.
+MATCH_LINES = 50
+
+# Exports at least this large (e.g. long time series or line scans) are
+# parsed in streaming mode: the [Data] section is read STREAM_CHUNK_ROWS
+# rows at a time into a growable buffer instead of all at once.
+STREAMING_THRESHOLD_BYTES = 64 * 1024**2
+STREAM_CHUNK_ROWS = 65536
+# In memory-mapped mode, the [Data] section is copied out of the map and
+# parsed in pieces of about this many bytes (ending at a row boundary).
+MAPPED_CHUNK_BYTES = 16 * 1024**2
+
+_COMMA_TO_SPACE = bytes.maketrans(b",", b" ")
+
 
 class WitecParser(_RamanParser):
     """
@@ -42,59 +64,71 @@ class WitecParser(_RamanParser):
     supported_file_extensions = (".txt",)
     config_file = "config_file_witec.json"
     unused_attrs_group_name = "unused_witec_keys"
+    uses_eln_data = True
 
     def matches_file(self, file: Path) -> bool:
         """A WITec Alpha .txt export declares both a [Header] and a [Data]
-        section near the top of the file."""
+        section within its first MATCH_LINES lines. Those usually fit into
+        read_head(); only a header running past it is read on, line by
+        line, until its [Data] section or the MATCH_LINES-th line."""
         try:
-            with open(file, encoding="utf-8") as witec_file:
-                head = "".join(line for _, line in zip(range(50), witec_file))
+            head = self.read_head(file)
+            head_lines = head.splitlines(keepends=True)[: MATCH_LINES + 1]
+            if (
+                len(head) == HEAD_SIZE
+                and len(head_lines) <= MATCH_LINES
+                and b"[Data]" not in head
+            ):
+                # the last line may be cut off: read it again, in full
+                partial_line = head_lines.pop() if head_lines else b""
+                with open(file, "rb") as witec_file:
+                    witec_file.seek(len(head) - len(partial_line))
+                    for line in witec_file:
+                        head_lines.append(line)
+                        if b"[Data]" in line or len(head_lines) == MATCH_LINES:
+                            break
         except OSError:
             return False
-        return "[Header]" in head and "[Data]" in head
+        head = b"".join(head_lines[:MATCH_LINES])
+        return b"[Header]" in head and b"[Data]" in head
 
-    def _parse(self, file: Path, **kwargs) -> None:
-        with open(file) as witec_file:
-            lines = witec_file.readlines()
-
-        header_dict: dict[str, str] = {}
-        data: list[list[float]] = []
-        line_count = 0
-        data_mini_header_length = None
-
-        # Track current section
-        current_section = None
-
-        for line in lines:
-            line_count += 1
-            # Remove any leading/trailing whitespace
-            line = line.strip()
-            # Go through the lines and define two different regions "Header" and
-            # "Data", as these need different methods to extract the data.
-            if line.startswith("[Header]"):
-                current_section = "header"
-                continue
-            elif line.startswith("[Data]"):
-                data_mini_header_length = line_count + 2
-                current_section = "data"
-                continue
-
-            # Parse the header section
-            if current_section == "header" and "=" in line:
-                key, value = line.split("=", 1)
-                header_dict[key.strip()] = value.strip()
-
-            # Parse the data section
-            elif current_section == "data" and "," in line:
-                # The header is set exactly until the float-like column data starts
-                if line_count > data_mini_header_length:
-                    values = line.split(",")
-                    data.append([float(values[0].strip()), float(values[1].strip())])
-
-        # Transform: [[A, B], [C, D], [E, F]] into [[A, C, E], [B, D, F]]
-        transposed = [list(item) for item in zip(*data)]
-
-        self.data = {"data/x_values": transposed[0], "data/y_values": transposed[1]}
+    def _parse(
+        self,
+        file: Path,
+        streaming: bool | None = None,
+        use_mmap: bool = False,
+        metadata_only: bool = False,
+        **kwargs,
+    ) -> None:
+        """
+        Parse the export at `file`. With `streaming` (default: only for
+        files of at least STREAMING_THRESHOLD_BYTES), the [Data] section is
+        read in chunks of STREAM_CHUNK_ROWS rows, so peak memory stays close
+        to the size of the final arrays. With `use_mmap`, the file is
+        memory-mapped instead and the [Data] section parsed straight from
+        the mapped bytes (see _read_mapped_export). With `metadata_only`,
+        reading stops at the [Data] section.
+        """
+        if metadata_only:
+            with open(file) as witec_file:
+                header_dict = _read_header(witec_file)
+            self.data = {}
+        else:
+            if use_mmap:
+                header_dict, x_values, y_values = _read_mapped_export(file)
+            else:
+                if streaming is None:
+                    streaming = file.stat().st_size >= STREAMING_THRESHOLD_BYTES
+
+                with open(file) as witec_file:
+                    header_dict = _read_header(witec_file)
+                    x_values, y_values = _read_data_block(
+                        witec_file,
+                        chunk_rows=STREAM_CHUNK_ROWS if streaming else None,
+                        file_name=file.name,
+                    )
+
+            self.data = {"data/x_values": x_values, "data/y_values": y_values}
 
         # Convert values to a normalized representation.
         for key, (old, new) in _WITEC_ALIASES.items():
@@ -140,3 +174,214 @@ class WitecParser(_RamanParser):
 
         # update the data dictionary
         self.data["data/x_values_raman"] = x_values_raman
+
+
+def _read_mapped_export(file: Path) -> tuple[dict[str, str], np.ndarray, np.ndarray]:
+    """
+    Parse the export at `file` through a read-only memory map: only the
+    [Header] lines are decoded to str; the [Data] section is located by
+    byte offset and parsed from the mapped bytes by _load_mapped_data_block,
+    without ever being split into str lines. Falls back to chunked
+    line-based parsing if that fails, or if the file is empty (which can't
+    be mapped).
+    """
+    if file.stat().st_size == 0:
+        with open(file) as witec_file:
+            header_dict = _read_header(witec_file)
+            x_values, y_values = _read_data_block(
+                witec_file, chunk_rows=STREAM_CHUNK_ROWS, file_name=file.name
+            )
+        return header_dict, x_values, y_values
+
+    with (
+        open(file, "rb") as raw_file,
+        mmap.mmap(raw_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        header_dict = _read_header(
+            line.decode("utf-8") for line in iter(mapped.readline, b"")
+        )
+        data_offset = mapped.tell()
+        try:
+            x_values, y_values = _load_mapped_data_block(mapped, data_offset)
+        except ValueError as exc:
+            logger.warning(
+                f"Parsing the memory-mapped [Data] section of '{file.name}' "
+                f"failed ({exc}); falling back to line-by-line parsing."
+            )
+            mapped.seek(data_offset)
+            x_values, y_values = _read_data_block(
+                (line.decode("utf-8") for line in iter(mapped.readline, b"")),
+                chunk_rows=STREAM_CHUNK_ROWS,
+                file_name=file.name,
+            )
+    return header_dict, x_values, y_values
+
+
+def _load_mapped_data_block(
+    mapped: mmap.mmap, offset: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the comma-separated rows starting at byte `offset` of `mapped`,
+    MAPPED_CHUNK_BYTES at a time: each piece is copied out of the map,
+    its commas turned into whitespace, and parsed in a single np.fromstring
+    call. Only the pieces are copied, never the whole [Data] section at
+    once, so the memory needed on top of the final arrays stays bounded.
+
+    Raises ValueError if the rows aren't all comma-separated floats, or
+    don't all have as many columns as the first one.
+    """
+    first_row_end = mapped.find(b"\n", offset)
+    first_row = mapped[offset : first_row_end if first_row_end != -1 else None]
+    n_columns = first_row.count(b",") + 1
+    if n_columns < 2:
+        raise ValueError("expected at least two comma-separated columns")
+
+    blocks = []
+    start, size = offset, len(mapped)
+    while start < size:
+        end = mapped.find(b"\n", start + MAPPED_CHUNK_BYTES)
+        end = size if end == -1 else end + 1
+        blocks.append(_parse_mapped_rows(mapped[start:end], n_columns))
+        start = end
+
+    block = np.concatenate(blocks) if blocks else np.empty((0, n_columns))
+    return np.ascontiguousarray(block[:, 0]), np.ascontiguousarray(block[:, 1])
+
+
+def _parse_mapped_rows(rows: bytes, n_columns: int) -> np.ndarray:
+    """
+    Parse whole comma-separated rows into an (n, n_columns) array. As
+    commas and line breaks are both just separators to np.fromstring, the
+    commas are counted too: rows with fewer of them (e.g. separated by
+    spaces), which _parse_data_lines would skip, must not be parsed here.
+    """
+    with warnings.catch_warnings():
+        # np.fromstring only warns (for now) when it stops at unparsable data
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(
+                rows.translate(_COMMA_TO_SPACE), dtype=np.float64, sep=" "
+            )
+        except DeprecationWarning as exc:
+            raise ValueError(str(exc)) from exc
+    if values.size % n_columns or rows.count(b",") != (values.size // n_columns) * (
+        n_columns - 1
+    ):
+        raise ValueError(f"not every row has {n_columns} comma-separated columns")
+    return values.reshape(-1, n_columns)
+
+
+def _read_header(witec_file: Iterator[str] | TextIO) -> dict[str, str]:
+    """
+    Read the [Header] section's "key = value" lines from `witec_file`,
+    leaving the file positioned at the first row of float-like column data
+    after [Data] (i.e. past the column-name and unit lines following it).
+    """
+    header_dict: dict[str, str] = {}
+
+    # Track current section
+    current_section = None
+
+    for line in witec_file:
+        # Remove any leading/trailing whitespace
+        line = line.strip()
+        if line.startswith("[Header]"):
+            current_section = "header"
+            continue
+        elif line.startswith("[Data]"):
+            # The column names and units take up the two lines after
+            # [Data]; the float-like column data starts right after them.
+            for _ in itertools.islice(witec_file, 2):
+                pass
+            break
+
+        # Parse the header section
+        if current_section == "header" and "=" in line:
+            key, value = line.split("=", 1)
+            header_dict[key.strip()] = value.strip()
+
+    return header_dict
+
+
+def _read_data_block(
+    lines: Iterator[str] | TextIO,
+    chunk_rows: int | None = None,
+    file_name: str = "",
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the float-like column data of a [Data] section into contiguous
+    float64 x/y arrays.
+
+    With `chunk_rows`, `lines` is consumed that many rows at a time, each
+    chunk parsed by _load_data_block and appended to growable x/y buffers;
+    otherwise all of `lines` is parsed as a single chunk. A chunk that can't
+    be parsed in one vectorized call falls back to _parse_data_lines.
+    """
+    x_buffer = np.empty(0, dtype=np.float64)
+    y_buffer = np.empty(0, dtype=np.float64)
+    n_rows = 0
+    warned = False
+
+    while True:
+        chunk_lines = (
+            list(itertools.islice(lines, chunk_rows)) if chunk_rows else list(lines)
+        )
+        if not chunk_lines:
+            break
+        try:
+            chunk = _load_data_block(chunk_lines)
+        except ValueError as exc:
+            if not warned:
+                logger.warning(
+                    f"Vectorized parsing of the [Data] section of '{file_name}' "
+                    f"failed ({exc}); falling back to line-by-line parsing."
+                )
+                warned = True
+            chunk = _parse_data_lines(chunk_lines)
+
+        if not chunk_rows:
+            return np.ascontiguousarray(chunk[:, 0]), np.ascontiguousarray(chunk[:, 1])
+
+        needed = n_rows + len(chunk)
+        if needed > len(x_buffer):
+            capacity = max(needed, 2 * len(x_buffer))
+            x_buffer.resize(capacity, refcheck=False)
+            y_buffer.resize(capacity, refcheck=False)
+        x_buffer[n_rows:needed] = chunk[:, 0]
+        y_buffer[n_rows:needed] = chunk[:, 1]
+        n_rows = needed
+
+    x_buffer.resize(n_rows, refcheck=False)
+    y_buffer.resize(n_rows, refcheck=False)
+    return x_buffer, y_buffer
+
+
+def _load_data_block(data_lines: list[str]) -> np.ndarray:
+    """
+    Parse rows of float-like column data in one vectorized call, returning
+    the first two columns as an (n, 2) float64 array.
+
+    Raises ValueError if any row is not a comma-separated row of floats.
+    """
+    return np.loadtxt(
+        data_lines,
+        delimiter=",",
+        usecols=(0, 1),
+        dtype=np.float64,
+        ndmin=2,
+    ).reshape(-1, 2)
+
+
+def _parse_data_lines(data_lines: list[str]) -> np.ndarray:
+    """
+    Line-by-line fallback for _load_data_block: skips rows without a comma
+    instead of failing on them, as malformed exports sometimes contain.
+    """
+    data: list[list[float]] = []
+    for line in data_lines:
+        line = line.strip()
+        if "," in line:
+            values = line.split(",")
+            data.append([float(values[0].strip()), float(values[1].strip())])
+
+    return np.array(data, dtype=np.float64).reshape(-1, 2)
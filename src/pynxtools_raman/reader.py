@@ -17,21 +17,65 @@
 #
 """An example reader implementation based on the MultiFormatReader."""
 
+import functools
 import logging
+import re
 from pathlib import Path
 from typing import Any
 
-from pynxtools.dataconverter.readers.multi.reader import MultiFormatReader
+import numpy as np
+from pynxtools.dataconverter.readers.multi.reader import (
+    MultiFormatReader,
+    fill_from_config,
+)
 from pynxtools.dataconverter.readers.utils import parse_yml
 
-from pynxtools_raman.parsers import RodParser, WitecParser, _RamanParser
+from pynxtools_raman.config_cache import load_config_dict
+from pynxtools_raman.parsers import _RamanParser
+from pynxtools_raman.parsers.registry import find_parser, supported_extensions
+from pynxtools_raman.timing import timed
 
 logger = logging.getLogger("pynxtools")
 
+CONFIG_DIR = Path(__file__).parent / "config"
+
 CONVERT_DICT: dict[str, str] = {}
 
 REPLACE_NESTED: dict[str, str] = {}
 
+# NeXus concepts which use mixed notation of upper and lowercase, to ensure
+# correct NXclass labeling.
+UPPER_AND_LOWER_MIXED_NEXUS_CONCEPTS = (
+    "/detector_TYPE[",
+    "/beam_TYPE[",
+    "/source_TYPE[",
+    "/polfilter_TYPE[",
+    "/spectral_filter_TYPE[",
+    "/temp_control_TYPE[",
+    "/software_TYPE[",
+    "/OPTICAL_LENS[",
+    "/identifierNAME[",
+)
+
+
+@functools.cache
+def _normalize_eln_key(key: str, entry_name: str) -> str:
+    """
+    Map a template key to the form of the keys parsed from an ELN file, e.g.
+    "/ENTRY[entry]/INSTRUMENT[instrument]/beam_incident/wavelength" to
+    "/ENTRY[entry]/instrument/beam_incident/wavelength".
+
+    Template keys come from the (few) config files, so each one is only
+    normalized once per process.
+    """
+    # filter for mixed concept names
+    for string in UPPER_AND_LOWER_MIXED_NEXUS_CONCEPTS:
+        key = key.replace(string, "/[")
+    # add only characters, if they are lower case and if they are not "[" or "]"
+    result = "".join([char for char in key if not (char.isupper() or char in "[]")])
+    # Filter as well for
+    return result.replace("entry", f"ENTRY[{entry_name}]")
+
 
 class RamanReader(MultiFormatReader):
     """MyDataReader implementation for the DataConverter to convert mydata to NeXus."""
@@ -44,21 +88,27 @@ class RamanReader(MultiFormatReader):
         self.attrs: dict[str, Any] = {}
         self.data: dict[str, Any] = {}
         self.eln_data: dict[str, Any] = {}
-        self.config_file: Path
+        # Never set from a parser: post_process hands the parser's own config
+        # file to MultiFormatReader as config_dict, taking precedence.
+        self.config_file: str | None = None
 
         self.missing_meta_data: dict[str, Any] | None = None
         self._active_parser: _RamanParser | None = None
         self._unused_attrs_group_name: str | None = None
+        # (entry name, parser) for every successfully parsed spectrum file
+        self._entries: list[tuple[str, _RamanParser]] = []
+        # ELN keys already reported missing during the current conversion
+        self._missing_eln_keys: set[str] = set()
 
         self.extensions = {
             ".yml": self.handle_eln_file,
             ".yaml": self.handle_eln_file,
-            ".txt": self.handle_txt_file,
             ".json": self.set_config_file,
-            ".rod": self.handle_rod_file,
         }
+        for extension in supported_extensions():
+            self.extensions.setdefault(extension, self.handle_data_file)
 
-    def set_config_file(self, file_path: Path) -> dict[str, Any]:
+    def set_config_file(self, file_path: str) -> dict[str, Any]:
         if self.config_file is not None:
             logger.info(
                 f"Config file already set. Replaced by the new file {file_path}."
@@ -77,52 +127,58 @@ class RamanReader(MultiFormatReader):
 
     def _set_parser_data(self, parser) -> None:
         """Populate reader state from a parsed file."""
-        reader_dir = Path(__file__).parent
-        self.config_file = reader_dir.joinpath("config", parser.config_file)  # pylint: disable=invalid-type-comment
         self._active_parser = parser
         self._unused_attrs_group_name = parser.unused_attrs_group_name
         self.attrs = parser.attrs
         self.data = parser.data
         self.missing_meta_data = parser.unused_attrs
 
-    def handle_rod_file(self, filepath) -> dict[str, Any]:
+    def _add_entry(self, parser: _RamanParser, filepath) -> None:
         """
-        Read a .rod file (Raman Open Database) via RodParser.
+        Register a parsed spectrum file as an NXentry of the output. A
+        single file keeps the plain "entry" name; with several, each one
+        becomes "entry_<file stem>" (see _fill_entries).
         """
-        if not RodParser.is_mainfile(filepath):
-            logger.warning(f"{filepath} does not look like a ROD .rod file; skipping.")
-            return {}
-
-        parser = RodParser()
-        parser.parse(filepath)
-
-        if parser.attrs.get("_raman_theoretical_spectrum.intensity"):
-            logger.warning(
-                "Theoretical Raman data .rod file found. File parsing aborted."
-            )
-            # Prevent file parsing from setting an invalid config file name.
-            self.config_file = Path()
-            return {}
-
+        entry_id = re.sub(r"\W", "_", Path(filepath).stem)
+        entry_name = f"entry_{entry_id}"
+        taken = {name for name, _ in self._entries}
+        suffix = 2
+        while entry_name in taken:
+            entry_name = f"entry_{entry_id}_{suffix}"
+            suffix += 1
+
+        self._entries.append((entry_name, parser))
         self._set_parser_data(parser)
-        return {}
 
-    def handle_txt_file(self, filepath) -> dict[str, Any]:
+    def handle_data_file(self, filepath) -> dict[str, Any]:
         """
-        Read a .txt file from a WITec Alpha Raman spectrometer via WitecParser.
+        Read a spectrum file (.rod from the Raman Open Database, .txt from a
+        WITec Alpha Raman spectrometer, ...) via whichever registered parser
+        recognizes its content - see parsers/registry.py.
         """
-        if not WitecParser.is_mainfile(filepath):
+        parser = find_parser(filepath)
+        if parser is None:
             logger.warning(
-                f"{filepath} does not look like a WITec .txt export; skipping."
+                f"{filepath} does not match any supported Raman file format; skipping."
             )
             return {}
 
-        parser = WitecParser()
         parser.parse(filepath)
 
-        self._set_parser_data(parser)
+        # a numeric loop column (see RodParser), so not truth-tested
+        if parser.attrs.get("_raman_theoretical_spectrum.intensity") is not None:
+            logger.warning(
+                "Theoretical Raman data .rod file found. File parsing aborted."
+            )
+            return {}
+
+        self._add_entry(parser, filepath)
         return {}
 
+    # Dispatch is by content, not by extension, so these are the same.
+    handle_rod_file = handle_data_file
+    handle_txt_file = handle_data_file
+
     def get_eln_data(self, key: str, path: str) -> Any:
         """
         Returns data from the eln file. This is done via the file: "config_file.json".
@@ -135,6 +191,8 @@ class RamanReader(MultiFormatReader):
         """
         if self.eln_data is None:
             return None
+        if self._active_parser is not None and not self._active_parser.uses_eln_data:
+            return None
 
         # Use the path to get the eln_data (this refers to the 2. case)
         if len(path) > 0:
@@ -143,35 +201,14 @@ class RamanReader(MultiFormatReader):
         # If no path is assigned, use directly the given key to extract
         # the eln data/value (this refers to the 1. case)
 
-        # Filtering list, for NeXus concepts which use mixed notation of
-        # upper and lowercase to ensure correct NXclass labeling.
-        upper_and_lower_mixed_nexus_concepts = [
-            "/detector_TYPE[",
-            "/beam_TYPE[",
-            "/source_TYPE[",
-            "/polfilter_TYPE[",
-            "/spectral_filter_TYPE[",
-            "/temp_control_TYPE[",
-            "/software_TYPE[",
-            "/OPTICAL_LENS[",
-            "/identifierNAME[",
-        ]
         if self.eln_data.get(key) is None:
-            # filter for mixed concept names
-            for string in upper_and_lower_mixed_nexus_concepts:
-                key = key.replace(string, "/[")
-            # add only characters, if they are lower case and if they are not "[" or "]"
-            result = "".join(
-                [char for char in key if not (char.isupper() or char in "[]")]
-            )
-            # Filter as well for
-            result = result.replace("entry", f"ENTRY[{self.callbacks.entry_name}]")
-
+            result = _normalize_eln_key(key, self.callbacks.entry_name)
             if self.eln_data.get(result) is not None:
                 return self.eln_data.get(result)
-            else:
+            elif key not in self._missing_eln_keys:
+                self._missing_eln_keys.add(key)
                 logger.warning(
-                    f"No key found during eln_data processing for key '{key}' after it's modification to '{result}'."
+                    f"No key found during eln_data processing for key '{key}' after its modification to '{result}'."
                 )
         return self.eln_data.get(key)
 
@@ -199,6 +236,9 @@ class RamanReader(MultiFormatReader):
                 # NXchar, even if space group numbers are used
                 if "/space_group" in key and "/SAMPLE" in key:
                     return value
+                # numeric loop values (see RodParser) are already arrays
+                if isinstance(value, np.ndarray):
+                    return value
                 return float(value)
             except (ValueError, TypeError):
                 return self.attrs.get(path)
@@ -213,14 +253,78 @@ class RamanReader(MultiFormatReader):
         """
         return self.data.get(path or key)
 
-    def post_process(self) -> None:
+    def post_process(self) -> dict[str, Any] | None:
         """
         Runs once, after ALL input files (including the ELN) have been
         processed, regardless of file order - see MultiFormatReader.read().
-        It runs the `post_process` hook of the active parser.
+        It runs the `post_process` hook of the active parser and hands its
+        config file to MultiFormatReader as config_dict, to fill the
+        template from. If several spectrum files were read, it fills all of
+        their entries itself, each from its own parser's config file.
         """
+        if len(self._entries) > 1:
+            return self._fill_entries()
         if self._active_parser is not None:
-            self._active_parser.post_process(self.eln_data)
+            with timed("post_process", self._active_parser.file):
+                self._active_parser.post_process(
+                    self._eln_data_for(self._active_parser)
+                )
+            self.config_dict = load_config_dict(
+                CONFIG_DIR / self._active_parser.config_file
+            )
+        return None
+
+    def _eln_data_for(self, parser: _RamanParser) -> dict[str, Any]:
+        """The ELN data, if parser's entry takes it (see uses_eln_data)."""
+        return self.eln_data if parser.uses_eln_data else {}
+
+    def _fill_entries(self) -> dict[str, Any]:
+        """
+        Fill one NXentry per parsed spectrum file (see _fill_entry). With
+        all entries filled here, MultiFormatReader is left no config_dict
+        to fill a further "entry" from.
+        """
+        entries: dict[str, Any] = {}
+        for entry_name, parser in self._entries:
+            entries.update(self._fill_entry(entry_name, parser))
+        self.config_dict = {}
+        return entries
+
+    def _fill_entry(self, entry_name: str, parser: _RamanParser) -> dict[str, Any]:
+        """
+        Resolve parser's own config file against its attrs/data (and the
+        ELN data, if it uses any) under "entry", then move the result to
+        the entry's own name.
+        """
+        self._set_parser_data(parser)
+        config_dict = load_config_dict(CONFIG_DIR / parser.config_file)
+        with timed("post_process", parser.file):
+            parser.post_process(self._eln_data_for(parser))
+        with timed("fill_template", parser.file):
+            entry = fill_from_config(
+                config_dict, ["entry"], self.callbacks, suppress_warning=True
+            )
+        entry.update(self._unused_attrs_collection())
+
+        renamed: dict[str, Any] = {}
+        for key, value in entry.items():
+            if isinstance(value, dict) and "link" in value:
+                value = {"link": value["link"].replace("/entry/", f"/{entry_name}/")}
+            renamed[key.replace("/ENTRY[entry]/", f"/ENTRY[{entry_name}]/", 1)] = value
+        return renamed
+
+    def _unused_attrs_collection(self) -> dict[str, str]:
+        """The parser keys not consumed by the config file, as a COLLECTION."""
+        if not self.missing_meta_data:
+            return {}
+        group = self._unused_attrs_group_name or "unused_data"
+        # numpy's str() of an array is abbreviated ("...") and has no commas
+        return {
+            f"/ENTRY[{self.callbacks.entry_name}]/COLLECTION[{group}]/{key}": (
+                f"{value.tolist() if isinstance(value, np.ndarray) else value}"
+            )
+            for key, value in self.missing_meta_data.items()
+        }
 
     def read(
         self,
@@ -229,16 +333,19 @@ class RamanReader(MultiFormatReader):
         objects: tuple[Any] = None,
         **kwargs,
     ) -> dict:
-        template = super().read(template, file_paths, objects, suppress_warning=True)
+        self._entries = []
+        self._missing_eln_keys = set()
+        with timed("read", *(file_paths or ())):
+            template = super().read(
+                template, file_paths, objects, suppress_warning=True
+            )
         # set default data
 
-        if self.missing_meta_data:
-            group = self._unused_attrs_group_name or "unused_data"
-            for key in self.missing_meta_data:
-                template[
-                    f"/ENTRY[{self.callbacks.entry_name}]/COLLECTION[{group}]/{key}"
-                ] = f"{self.missing_meta_data[key]}"
+        if len(self._entries) > 1:
+            template["/@default"] = self._entries[0][0]
+            return template
 
+        template.update(self._unused_attrs_collection())
         template["/@default"] = "entry"
 
         return template
@@ -0,0 +1,121 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Persistent per-ID state of a build-upload-batch run, so an interrupted
+run can be resumed where it stopped (build-upload-batch --resume).
+
+Every state change is appended to JOURNAL_FILENAME in the batch directory
+as one JSON line and flushed right away, so the journal is consistent up to
+the last completed step even if the process is killed. Loading replays the
+lines in order; the last state recorded for an ID wins.
+"""
+
+import json
+import logging
+from collections import Counter
+from pathlib import Path
+from types import TracebackType
+
+logger = logging.getLogger(__file__)
+
+JOURNAL_FILENAME = ".batch_journal.jsonl"
+
+DOWNLOADED = "downloaded"
+CONVERTED = "converted"
+FAILED = "failed"
+
+
+class BatchJournal:
+    """
+    Per-ROD-ID state (DOWNLOADED, CONVERTED or FAILED, the latter with the
+    stage that failed and why) of the batch in output_dir.
+
+    Without resume, the journal of a previous run is discarded and the
+    batch starts over.
+    """
+
+    def __init__(self, output_dir: Path, resume: bool = False):
+        self.path = output_dir / JOURNAL_FILENAME
+        self.states: dict[int, dict[str, str]] = {}
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if resume:
+            self._replay()
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def _replay(self) -> None:
+        try:
+            content = self.path.read_bytes()
+        except FileNotFoundError:
+            return
+        if content and not content.endswith(b"\n"):
+            # Cut off the last line of a run killed while writing it, so the
+            # next record isn't appended onto it (it's still reported below).
+            with open(self.path, "r+b") as file:
+                file.truncate(content.rfind(b"\n") + 1)
+        lines = content.decode("utf-8", errors="replace").splitlines()
+        for line_number, line in enumerate(lines, start=1):
+            try:
+                entry = json.loads(line)
+                self.states[int(entry.pop("rod_id"))] = entry
+            except (ValueError, KeyError, TypeError):
+                # most likely the last line of a run killed while writing it
+                logger.warning(
+                    f"Ignoring unreadable line {line_number} of '{self.path}'."
+                )
+
+    def _append(self, rod_id: int, entry: dict[str, str]) -> None:
+        self.states[rod_id] = entry
+        self._file.write(json.dumps({"rod_id": rod_id, **entry}) + "\n")
+        self._file.flush()
+
+    def state(self, rod_id: int) -> str | None:
+        entry = self.states.get(rod_id)
+        return entry["state"] if entry is not None else None
+
+    def mark_downloaded(self, rod_id: int) -> None:
+        self._append(rod_id, {"state": DOWNLOADED})
+
+    def mark_converted(self, rod_id: int) -> None:
+        self._append(rod_id, {"state": CONVERTED})
+
+    def mark_failed(self, rod_id: int, stage: str, reason: str) -> None:
+        self._append(rod_id, {"state": FAILED, "stage": stage, "reason": reason})
+
+    def summary(self, rod_ids: list[int]) -> Counter[str]:
+        """How many of rod_ids are in which state ("pending" if none)."""
+        return Counter(self.state(rod_id) or "pending" for rod_id in rod_ids)
+
+    def failures(self, rod_ids: list[int]) -> dict[int, dict[str, str]]:
+        return {
+            rod_id: self.states[rod_id]
+            for rod_id in rod_ids
+            if self.state(rod_id) == FAILED
+        }
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "BatchJournal":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
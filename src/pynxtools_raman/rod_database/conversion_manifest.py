@@ -0,0 +1,118 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tracks which .nxs files in a batch directory are up to date with their
+.rod inputs, for incremental (make-style) batch conversion.
+
+An output counts as up to date if it exists and was built from a .rod file
+with the same content hash, using the same config_file_rod.json and the
+same pynxtools-raman version. Anything else -- a new or edited .rod file, a
+changed config file, a package upgrade, a deleted .nxs -- is rebuilt.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from pynxtools_raman import get_pynxtools_raman_version
+
+logger = logging.getLogger(__file__)
+
+MANIFEST_FILENAME = ".conversion_manifest.json"
+ROD_CONFIG_FILE = Path(__file__).parents[1] / "config" / "config_file_rod.json"
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 digest of the file at path."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def conversion_fingerprint() -> dict[str, str]:
+    """Everything besides the .rod file itself that a conversion's output
+    depends on; a change here invalidates every recorded output."""
+    return {
+        "config_sha256": file_sha256(ROD_CONFIG_FILE),
+        "version": get_pynxtools_raman_version(),
+    }
+
+
+class ConversionManifest:
+    """
+    Per-directory record of the input hash each .nxs file was built from,
+    stored as MANIFEST_FILENAME in the output directory.
+
+    Entries are keyed by the .rod file name. A manifest written under a
+    different fingerprint (config file or package version) is discarded on
+    load, so everything gets rebuilt once after such a change.
+    """
+
+    def __init__(self, path: Path, fingerprint: dict[str, str]):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries: dict[str, str] = {}
+
+    @classmethod
+    def load(cls, output_dir: Path) -> "ConversionManifest":
+        manifest = cls(output_dir / MANIFEST_FILENAME, conversion_fingerprint())
+        try:
+            stored = json.loads(manifest.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable manifest '{manifest.path}'.")
+            return manifest
+
+        if stored.get("fingerprint") == manifest.fingerprint:
+            manifest.entries = dict(stored.get("entries", {}))
+        else:
+            logger.info(
+                "Config file or package version changed since the last "
+                "conversion; rebuilding all outputs."
+            )
+        return manifest
+
+    def is_up_to_date(self, rod_file: Path, output_file: Path, input_hash: str) -> bool:
+        return self.entries.get(rod_file.name) == input_hash and output_file.is_file()
+
+    def record(self, rod_file: Path, input_hash: str) -> None:
+        self.entries[rod_file.name] = input_hash
+
+    def forget(self, rod_file: Path) -> None:
+        self.entries.pop(rod_file.name, None)
+
+    def prune(self, rod_files: list[Path]) -> None:
+        """Drop entries of .rod files that no longer exist in the batch."""
+        present = {rod_file.name for rod_file in rod_files}
+        self.entries = {
+            name: digest for name, digest in self.entries.items() if name in present
+        }
+
+    def save(self) -> None:
+        self.path.write_text(
+            json.dumps(
+                {"fingerprint": self.fingerprint, "entries": self.entries},
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
@@ -0,0 +1,325 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""SQLite index of the metadata of every .rod file in a batch directory,
+for selecting records by their measurement conditions or crystallography
+without parsing any file again.
+
+Each record's RodParser.attrs are reduced to the columns of RECORD_COLUMNS
+(one row per ROD ID in the "records" table). The "files" table holds the
+modification time and size of every indexed file, including those that
+couldn't be parsed, so updating the index after downloading more records
+only parses the new or changed files.
+"""
+
+import logging
+import math
+import sqlite3
+from collections.abc import Sequence
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+import click
+import numpy as np
+
+from pynxtools_raman.parsers.rod import RodParser, cif_float
+from pynxtools_raman.rod_database import DEFAULT_ROD_BATCH_DIR
+from pynxtools_raman.rod_database.rod_files import map_rod_files
+from pynxtools_raman.rod_database.spectral_archive import rod_id_of
+
+logger = logging.getLogger(__file__)
+
+METADATA_INDEX_FILENAME = "rod_metadata.sqlite"
+METADATA_INDEX_VERSION = 1
+
+# column -> (SQLite type, RodParser attrs keys, the first one present wins)
+RECORD_COLUMNS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "laser_wavelength": (
+        "REAL",
+        ("_raman_measurement_device.excitation_laser_wavelength",),
+    ),
+    "resolution": ("REAL", ("_raman_measurement_device.resolution",)),
+    "environment": ("TEXT", ("_raman_measurement.environment",)),
+    "optics_type": ("TEXT", ("_raman_measurement_device.optics_type",)),
+    "space_group": (
+        "TEXT",
+        ("_space_group_name_H-M_alt", "_symmetry_space_group_name_H-M"),
+    ),
+    "space_group_number": (
+        "INTEGER",
+        ("_space_group_IT_number", "_symmetry_Int_Tables_number"),
+    ),
+    "cell_length_a": ("REAL", ("_cell_length_a",)),
+    "cell_length_b": ("REAL", ("_cell_length_b",)),
+    "cell_length_c": ("REAL", ("_cell_length_c",)),
+    "formula": (
+        "TEXT",
+        ("_chemical_formula_sum", "_cod_original_formula_sum"),
+    ),
+    "mineral_name": ("TEXT", ("_chemical_name_mineral",)),
+}
+
+# How far (nm) a record's laser wavelength may be from --laser-wavelength.
+LASER_WAVELENGTH_TOLERANCE = 0.5
+
+
+def _column_value(sql_type: str, value: Any) -> Any:
+    if isinstance(value, (list, np.ndarray)):
+        # a loop column, not a single value - nothing to index
+        return None
+    if value is None or sql_type == "TEXT":
+        return None if value in (None, "", "?", ".") else str(value)
+    number = cif_float(value)
+    if math.isnan(number):
+        return None
+    return int(number) if sql_type == "INTEGER" else number
+
+
+def _read_rod_metadata(rod_file: Path) -> dict[str, Any] | str:
+    """The RECORD_COLUMNS values of rod_file, as stored in the records
+    table, from a metadata-only parse; or the parser's error, if any."""
+    parser = RodParser()
+    try:
+        parser.parse(rod_file, metadata_only=True)
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}"
+    return {
+        column: _column_value(
+            sql_type,
+            next((parser.attrs[key] for key in keys if key in parser.attrs), None),
+        )
+        for column, (sql_type, keys) in RECORD_COLUMNS.items()
+    }
+
+
+def _create_tables(connection: sqlite3.Connection) -> None:
+    columns = ", ".join(
+        f"{column} {sql_type}" for column, (sql_type, _) in RECORD_COLUMNS.items()
+    )
+    connection.executescript(
+        f"""
+        CREATE TABLE IF NOT EXISTS files (
+            rod_id INTEGER PRIMARY KEY, mtime_ns INTEGER, size INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS records (rod_id INTEGER PRIMARY KEY, {columns});
+        """
+    )
+    connection.execute(f"PRAGMA user_version = {METADATA_INDEX_VERSION}")
+
+
+def update_metadata_index(
+    rod_dir: Path, index_path: Path | None = None, jobs: int = 1
+) -> tuple[Path, int]:
+    """Bring the metadata index of rod_dir (default:
+    rod_dir/METADATA_INDEX_FILENAME) up to date with the .rod files in it:
+    new or changed files are parsed (by up to jobs worker processes),
+    removed ones dropped. Files that can't be parsed are logged and left out
+    of the records, but not parsed again until they change.
+
+    Returns:
+        tuple[Path, int]: The index's path and how many files were parsed
+            for it.
+    """
+    index_path = index_path or rod_dir / METADATA_INDEX_FILENAME
+    with closing(sqlite3.connect(index_path)) as connection, connection:
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version != METADATA_INDEX_VERSION:
+            if version:
+                logger.warning(f"Rebuilding outdated metadata index '{index_path}'.")
+            connection.executescript(
+                "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS records;"
+            )
+            _create_tables(connection)
+        indexed = {
+            rod_id: (mtime_ns, size)
+            for rod_id, mtime_ns, size in connection.execute(
+                "SELECT rod_id, mtime_ns, size FROM files"
+            )
+        }
+
+        to_parse: list[tuple[int, Path, tuple[int, int]]] = []
+        present = set()
+        for rod_file in sorted(rod_dir.glob("*.rod")):
+            rod_id = rod_id_of(rod_file)
+            if rod_id is None:
+                logger.warning(f"Skipping {rod_file}: not named after a ROD ID.")
+                continue
+            present.add(rod_id)
+            stat = rod_file.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if indexed.get(rod_id) != stamp:
+                to_parse.append((rod_id, rod_file, stamp))
+
+        removed = [(rod_id,) for rod_id in indexed.keys() - present]
+        connection.executemany("DELETE FROM files WHERE rod_id = ?", removed)
+        connection.executemany("DELETE FROM records WHERE rod_id = ?", removed)
+
+        rod_files = [rod_file for _, rod_file, _ in to_parse]
+        parsed = map_rod_files(_read_rod_metadata, rod_files, jobs)
+
+        insert_record = (
+            f"INSERT OR REPLACE INTO records (rod_id, {', '.join(RECORD_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * (len(RECORD_COLUMNS) + 1))})"
+        )
+        for (rod_id, rod_file, stamp), metadata in zip(to_parse, parsed):
+            connection.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (rod_id, *stamp)
+            )
+            if isinstance(metadata, str):
+                logger.warning(f"Leaving {rod_file} out of the index: {metadata}")
+                connection.execute("DELETE FROM records WHERE rod_id = ?", (rod_id,))
+            else:
+                connection.execute(insert_record, (rod_id, *metadata.values()))
+    return index_path, len(to_parse)
+
+
+def query_metadata_index(
+    index_path: Path, where: str = "", parameters: Sequence[Any] = ()
+) -> list[int]:
+    """The ascending ROD IDs of the records matching the SQL condition where
+    (all records if empty), with parameters bound to its "?" placeholders.
+    The index is opened read-only, so where can't modify it.
+
+    Raises:
+        sqlite3.Error: If where isn't a valid condition on RECORD_COLUMNS.
+    """
+    query = "SELECT rod_id FROM records"
+    if where:
+        query += f" WHERE {where}"
+    with closing(
+        sqlite3.connect(f"{index_path.resolve().as_uri()}?mode=ro", uri=True)
+    ) as connection:
+        return [
+            rod_id
+            for (rod_id,) in connection.execute(f"{query} ORDER BY rod_id", parameters)
+        ]
+
+
+@click.command("query")
+@click.argument(
+    "rod_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=DEFAULT_ROD_BATCH_DIR,
+)
+@click.option(
+    "--laser-wavelength",
+    type=float,
+    default=None,
+    help=f"Excitation laser wavelength in nm (within ±{LASER_WAVELENGTH_TOLERANCE} nm).",
+)
+@click.option(
+    "--max-resolution",
+    type=float,
+    default=None,
+    help="Largest spectral resolution in cm^-1 (exclusive).",
+)
+@click.option(
+    "--environment",
+    default=None,
+    help="Sample environment, e.g. air (case-insensitive).",
+)
+@click.option(
+    "--optics-type",
+    default=None,
+    help="Optics type, e.g. objective (case-insensitive).",
+)
+@click.option(
+    "--space-group",
+    default=None,
+    help="Space group number, or Hermann-Mauguin symbol, e.g. 'P 21/c'.",
+)
+@click.option(
+    "--mineral",
+    default=None,
+    help="Mineral name (case-insensitive).",
+)
+@click.option(
+    "--where",
+    default=None,
+    help=(
+        "Additional SQL condition on the index columns "
+        f'({", ".join(RECORD_COLUMNS)}), e.g. "cell_length_a > 10".'
+    ),
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes parsing new .rod files.",
+)
+def query_rod_metadata(  # noqa: PLR0917
+    rod_dir: Path,
+    laser_wavelength: float | None,
+    max_resolution: float | None,
+    environment: str | None,
+    optics_type: str | None,
+    space_group: str | None,
+    mineral: str | None,
+    where: str | None,
+    jobs: int,
+):
+    """List the ROD IDs of all records in ROD_DIR matching every condition.
+
+    The IDs are printed one per line.
+
+    The metadata index in ROD_DIR (rod_metadata.sqlite) is updated
+    first, which only parses .rod files added or changed since the last
+    update. The output can be passed to build-upload-batch --ids-file.
+
+    ROD_DIR: directory containing .rod files (default: rod_batch).
+    """
+    conditions: list[str] = []
+    parameters: list[Any] = []
+    if laser_wavelength is not None:
+        conditions.append("ABS(laser_wavelength - ?) <= ?")
+        parameters += [laser_wavelength, LASER_WAVELENGTH_TOLERANCE]
+    if max_resolution is not None:
+        conditions.append("resolution < ?")
+        parameters.append(max_resolution)
+    for column, value in (
+        ("environment", environment),
+        ("optics_type", optics_type),
+        ("mineral_name", mineral),
+    ):
+        if value is not None:
+            conditions.append(f"{column} = ? COLLATE NOCASE")
+            parameters.append(value)
+    if space_group is not None:
+        if space_group.isdigit():
+            conditions.append("space_group_number = ?")
+            parameters.append(int(space_group))
+        else:
+            conditions.append("REPLACE(space_group, ' ', '') = ? COLLATE NOCASE")
+            parameters.append(space_group.replace(" ", ""))
+    if where:
+        conditions.append(f"({where})")
+
+    index_path, n_parsed = update_metadata_index(rod_dir, jobs=jobs)
+    try:
+        matches = query_metadata_index(index_path, " AND ".join(conditions), parameters)
+    except sqlite3.Error as exc:
+        raise click.BadParameter(str(exc), param_hint="--where") from exc
+    for rod_id in matches:
+        click.echo(rod_id)
+    click.echo(
+        f"{len(matches)} of {len(query_metadata_index(index_path))} indexed record(s) "
+        f"match ({n_parsed} file(s) newly indexed).",
+        err=True,
+    )
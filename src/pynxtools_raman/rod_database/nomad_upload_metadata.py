@@ -55,12 +55,16 @@ UPLOAD_METADATA: dict = {
 }
 
 
+def render_nomad_json() -> str:
+    """Return the content of nomad.json (the ROD-wide citation/license
+    upload metadata)."""
+    return json.dumps(UPLOAD_METADATA, indent=2) + "\n"
+
+
 def write_nomad_json(output_dir: Path) -> Path:
     """Write nomad.json (the ROD-wide citation/license upload metadata) into
     output_dir, returning the path written.
     """
     output_path = output_dir / "nomad.json"
-    output_path.write_text(
-        json.dumps(UPLOAD_METADATA, indent=2) + "\n", encoding="utf-8"
-    )
+    output_path.write_text(render_nomad_json(), encoding="utf-8")
     return output_path
@@ -0,0 +1,303 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Index of the peak positions of every spectrum in a directory of .rod
+files, for matching peak lists against the whole corpus without a scan.
+
+The peaks found in each record (see find_peaks) are stored per ROD ID
+(positions[offsets[i]:offsets[i + 1]] belong to rod_ids[i]), and once more
+as one sorted array of all positions with the record each belongs to. "All
+references with a peak within 3 cm^-1 of 520, 965 and 1086" is then a
+binary search per queried position and an intersection of the results.
+
+The index is saved in the batch directory (PEAK_INDEX_FILENAME) together
+with each indexed file's modification time and size, so updating it after
+downloading more records only parses the new or changed files.
+"""
+
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+
+import click
+import numpy as np
+
+from pynxtools_raman.rod_database import DEFAULT_ROD_BATCH_DIR
+from pynxtools_raman.rod_database.rod_files import atomic_write, map_rod_files
+from pynxtools_raman.rod_database.spectral_archive import read_rod_record, rod_id_of
+
+logger = logging.getLogger(__file__)
+
+PEAK_INDEX_FILENAME = "rod_peak_index.npz"
+PEAK_INDEX_VERSION = 1
+
+# A peak must rise at least this fraction of the spectrum's intensity range
+# above the lowest intensity within PEAK_WINDOW cm^-1 on either side of it.
+DEFAULT_MIN_PROMINENCE = 0.05
+PEAK_WINDOW = 25.0
+
+DEFAULT_TOLERANCE = 3.0
+
+
+def find_peaks(
+    raman_shift: np.ndarray,
+    intensity: np.ndarray,
+    min_prominence: float = DEFAULT_MIN_PROMINENCE,
+    window: float = PEAK_WINDOW,
+) -> np.ndarray:
+    """The (ascending) Raman shifts of the local intensity maxima that are
+    at least min_prominence (a fraction of the intensity range) higher than
+    both the lowest intensity up to window below and up to window above it.
+    """
+    finite = np.isfinite(raman_shift) & np.isfinite(intensity)
+    order = np.argsort(raman_shift[finite], kind="stable")
+    x, y = raman_shift[finite][order], intensity[finite][order]
+    if len(x) < 3 or y.max() <= y.min():
+        return np.empty(0, dtype=np.float64)
+
+    candidates = np.flatnonzero((y[1:-1] > y[:-2]) & (y[1:-1] >= y[2:])) + 1
+    starts = np.searchsorted(x, x[candidates] - window, side="left")
+    ends = np.searchsorted(x, x[candidates] + window, side="right")
+    threshold = min_prominence * (y.max() - y.min())
+    peaks = [
+        x[i]
+        for i, start, end in zip(candidates, starts, ends)
+        if y[i] - max(y[start : i + 1].min(), y[i:end].min()) >= threshold
+    ]
+    return np.array(peaks, dtype=np.float64)
+
+
+def _extract_rod_peaks(rod_file: Path) -> np.ndarray | str:
+    """The peak positions (see find_peaks) of rod_file's measured
+    spectrum, or read_rod_record's reason why it has none."""
+    record = read_rod_record(rod_file)
+    if isinstance(record, str):
+        return record
+    raman_shift, intensity, _ = record
+    return find_peaks(raman_shift, intensity)
+
+
+class PeakIndex:
+    """
+    Peak positions per ROD ID, searchable by position. stamps holds the
+    (modification time in ns, size) of the file each record was read from.
+    """
+
+    def __init__(
+        self,
+        rod_ids: np.ndarray,
+        offsets: np.ndarray,
+        positions: np.ndarray,
+        stamps: np.ndarray,
+    ):
+        self.rod_ids = rod_ids
+        self.offsets = offsets
+        self.positions = positions
+        self.stamps = stamps
+        owners = np.repeat(np.arange(len(rod_ids)), np.diff(offsets))
+        order = np.argsort(positions, kind="stable")
+        self._sorted_positions = positions[order]
+        self._sorted_owners = owners[order]
+        self._index = {int(rod_id): i for i, rod_id in enumerate(rod_ids)}
+
+    @classmethod
+    def from_records(
+        cls, records: dict[int, tuple[tuple[int, int], np.ndarray]]
+    ) -> "PeakIndex":
+        """The index of records, rod_id -> (stamp, peak positions)."""
+        rod_ids = sorted(records)
+        lengths = [len(records[rod_id][1]) for rod_id in rod_ids]
+        return cls(
+            np.array(rod_ids, dtype=np.int64),
+            np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+            np.concatenate(
+                [np.empty(0)] + [records[rod_id][1] for rod_id in rod_ids]
+            ).astype(np.float64),
+            np.array(
+                [records[rod_id][0] for rod_id in rod_ids], dtype=np.int64
+            ).reshape(-1, 2),
+        )
+
+    def records(self) -> dict[int, tuple[tuple[int, int], np.ndarray]]:
+        """rod_id -> (stamp, peak positions) of every indexed record."""
+        return {
+            int(rod_id): (
+                (int(self.stamps[i, 0]), int(self.stamps[i, 1])),
+                self.positions[self.offsets[i] : self.offsets[i + 1]],
+            )
+            for i, rod_id in enumerate(self.rod_ids)
+        }
+
+    @classmethod
+    def load(cls, path: Path) -> "PeakIndex":
+        """The index saved at path; empty if there is none (or it can't be
+        used)."""
+        try:
+            with np.load(path) as saved:
+                if int(saved["version"]) == PEAK_INDEX_VERSION:
+                    return cls(
+                        saved["rod_ids"],
+                        saved["offsets"],
+                        saved["positions"],
+                        saved["stamps"],
+                    )
+                logger.warning(f"Ignoring outdated peak index '{path}'.")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError):
+            logger.warning(f"Ignoring unreadable peak index '{path}'.")
+        return cls.from_records({})
+
+    def save(self, path: Path) -> None:
+        with (
+            atomic_write(path) as partial_path,
+            open(partial_path, "wb") as partial_file,
+        ):
+            np.savez(
+                partial_file,
+                version=PEAK_INDEX_VERSION,
+                rod_ids=self.rod_ids,
+                offsets=self.offsets,
+                positions=self.positions,
+                stamps=self.stamps,
+            )
+
+    def __len__(self) -> int:
+        return len(self.rod_ids)
+
+    def __contains__(self, rod_id: object) -> bool:
+        return rod_id in self._index
+
+    def peaks(self, rod_id: int) -> np.ndarray:
+        """The peak positions of rod_id, ascending."""
+        try:
+            i = self._index[rod_id]
+        except KeyError:
+            raise KeyError(f"ROD ID {rod_id} is not in the peak index.") from None
+        return self.positions[self.offsets[i] : self.offsets[i + 1]]
+
+    def with_peak_near(
+        self, position: float, tolerance: float = DEFAULT_TOLERANCE
+    ) -> np.ndarray:
+        """The (ascending) ROD IDs with a peak within tolerance of position."""
+        start = np.searchsorted(self._sorted_positions, position - tolerance, "left")
+        end = np.searchsorted(self._sorted_positions, position + tolerance, "right")
+        return self.rod_ids[np.unique(self._sorted_owners[start:end])]
+
+    def match(
+        self, positions: Iterable[float], tolerance: float = DEFAULT_TOLERANCE
+    ) -> list[int]:
+        """The ROD IDs with a peak within tolerance of every one of
+        positions, ascending."""
+        matches: np.ndarray | None = None
+        for position in positions:
+            near = self.with_peak_near(position, tolerance)
+            matches = near if matches is None else np.intersect1d(matches, near)
+            if not len(matches):
+                break
+        return [] if matches is None else matches.tolist()
+
+
+def update_peak_index(
+    rod_dir: Path, index_path: Path | None = None, jobs: int = 1
+) -> tuple[PeakIndex, int]:
+    """Bring the peak index of rod_dir (default: rod_dir/PEAK_INDEX_FILENAME)
+    up to date with the .rod files in it: new or changed files are parsed
+    (by up to jobs worker processes), removed ones dropped. Files that
+    can't be parsed are logged and indexed without peaks, so they aren't
+    parsed again until they change.
+
+    Returns:
+        tuple[PeakIndex, int]: The updated (and saved) index, and how many
+            files were parsed for it.
+    """
+    index_path = index_path or rod_dir / PEAK_INDEX_FILENAME
+    indexed = PeakIndex.load(index_path).records()
+
+    records: dict[int, tuple[tuple[int, int], np.ndarray]] = {}
+    to_parse: list[tuple[int, Path, tuple[int, int]]] = []
+    for rod_file in sorted(rod_dir.glob("*.rod")):
+        rod_id = rod_id_of(rod_file)
+        if rod_id is None:
+            logger.warning(f"Skipping {rod_file}: not named after a ROD ID.")
+            continue
+        stat = rod_file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if rod_id in indexed and indexed[rod_id][0] == stamp:
+            records[rod_id] = indexed[rod_id]
+        else:
+            to_parse.append((rod_id, rod_file, stamp))
+
+    rod_files = [rod_file for _, rod_file, _ in to_parse]
+    extracted = map_rod_files(_extract_rod_peaks, rod_files, jobs)
+    for (rod_id, rod_file, stamp), peaks in zip(to_parse, extracted):
+        if isinstance(peaks, str):
+            logger.warning(f"Indexing {rod_file} without peaks: {peaks}")
+            peaks = np.empty(0, dtype=np.float64)
+        records[rod_id] = (stamp, peaks)
+
+    index = PeakIndex.from_records(records)
+    if to_parse or len(records) != len(indexed):
+        index.save(index_path)
+    return index, len(to_parse)
+
+
+@click.command("match-peaks")
+@click.argument("positions", nargs=-1, required=True, type=float)
+@click.option(
+    "--rod-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=DEFAULT_ROD_BATCH_DIR,
+    show_default=True,
+    help=f"Directory of .rod files, and of their peak index ({PEAK_INDEX_FILENAME}).",
+)
+@click.option(
+    "--tolerance",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_TOLERANCE,
+    show_default=True,
+    help="Maximum distance (cm^-1) between a queried and a matching peak.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes parsing new .rod files.",
+)
+def match_peaks_cli(
+    positions: tuple[float, ...], rod_dir: Path, tolerance: float, jobs: int
+):
+    """List the ROD IDs of all records with a peak near each of POSITIONS.
+
+    POSITIONS are Raman shifts in cm^-1. The records are those in the
+    --rod-dir directory, and their IDs are printed one per line.
+
+    The peak index in that directory is updated first, which only parses .rod files
+    added or changed since the last update. The output can be passed to
+    build-upload-batch --ids-file.
+    """
+    index, n_parsed = update_peak_index(rod_dir, jobs=jobs)
+    matches = index.match(positions, tolerance)
+    for rod_id in matches:
+        click.echo(rod_id)
+    click.echo(
+        f"{len(matches)} of {len(index)} indexed record(s) match "
+        f"({n_parsed} file(s) newly indexed).",
+        err=True,
+    )
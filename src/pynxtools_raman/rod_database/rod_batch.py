@@ -25,22 +25,63 @@ across each command.
 """
 
 import logging
-from collections.abc import Callable
+import queue
+import threading
+import traceback
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 
 import click
-from pynxtools.dataconverter.convert import convert
 
-from pynxtools_raman.parsers.rod import RodParser
 from pynxtools_raman.rod_database import DEFAULT_ROD_BATCH_DIR
-from pynxtools_raman.rod_database.nomad_upload_metadata import write_nomad_json
-from pynxtools_raman.rod_database.rod_get_file import save_rod_file_from_ROD_via_API
+from pynxtools_raman.rod_database.batch_journal import CONVERTED, FAILED, BatchJournal
+from pynxtools_raman.rod_database.conversion_manifest import (
+    ConversionManifest,
+    file_sha256,
+)
+from pynxtools_raman.rod_database.nomad_upload_metadata import (
+    render_nomad_json,
+    write_nomad_json,
+)
+from pynxtools_raman.rod_database.peak_index import (
+    PEAK_INDEX_FILENAME,
+    update_peak_index,
+)
+from pynxtools_raman.rod_database.rod_get_file import (
+    ROD_BASE_URL,
+    RateLimiter,
+    create_session,
+    save_rod_file_from_ROD_via_API,
+)
+from pynxtools_raman.rod_database.upload_zip import (
+    NOMAD_UPLOAD_SIZE_LIMIT,
+    ShardedUploadZip,
+)
+from pynxtools_raman.timing import (
+    JsonLinesSink,
+    StageTimings,
+    collecting_timings,
+    emit_timing,
+    recording_timings,
+    timed,
+    timing_enabled,
+)
 
 logger = logging.getLogger(__file__)
 
 DATA_DIR = Path(__file__).parent / "data"
 ALL_KNOWN_ROD_IDS_FILE = DATA_DIR / "ROD-numbers.txt"
 
+# Requests per second sent to the ROD server, across all download workers.
+DEFAULT_RATE_LIMIT = 5.0
+
+# How many downloaded files may wait for conversion in build-upload-batch
+# before the downloads pause.
+DEFAULT_PIPELINE_BUFFER = 64
+
 
 def _missing_rod_ids(rod_ids: list[int], output_dir: Path) -> list[int]:
     """Return the subset of rod_ids that don't already have a .rod file in
@@ -51,7 +92,85 @@ def _missing_rod_ids(rod_ids: list[int], output_dir: Path) -> list[int]:
     ]
 
 
-def download_rod_files(rod_ids: list[int], output_dir: Path) -> list[Path]:
+def iter_rod_downloads(
+    rod_ids: list[int],
+    output_dir: Path,
+    *,
+    workers: int = 1,
+    rate_limit: float | None = DEFAULT_RATE_LIMIT,
+    base_url: str = ROD_BASE_URL,
+    buffer_size: int = DEFAULT_PIPELINE_BUFFER,
+) -> Iterator[tuple[int, Path | None]]:
+    """Download a batch of .rod files by ROD ID into output_dir, yielding
+    (rod_id, path) for every unique ID as soon as its file is there -- or
+    (rod_id, None) if its download failed (see download_rod_files).
+
+    IDs that already have a .rod file in output_dir come first. The others
+    are downloaded by a pool of `workers` threads in the background, in
+    completion order: a worker that finds buffer_size results waiting for
+    the consumer blocks, so the downloads never run more than that far
+    ahead of whatever consumes them (e.g. a conversion).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    to_download = []
+    for rod_id in dict.fromkeys(rod_ids):
+        existing = output_dir / f"{rod_id}.rod"
+        if existing.is_file():
+            logger.info(f"'{existing}' already exists, skipping download.")
+            yield rod_id, existing
+        else:
+            to_download.append(rod_id)
+    if not to_download:
+        return
+
+    results: queue.Queue[tuple[int, Path | None]] = queue.Queue(maxsize=buffer_size)
+    stop = threading.Event()
+    rate_limiter = RateLimiter(rate_limit)
+
+    with (
+        create_session(pool_size=workers) as session,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+    ):
+
+        def fetch(rod_id: int) -> None:
+            if stop.is_set():
+                return
+            path = None
+            try:
+                with timed("download", output_dir / f"{rod_id}.rod"):
+                    path = save_rod_file_from_ROD_via_API(
+                        rod_id,
+                        output_dir=output_dir,
+                        session=session,
+                        rate_limiter=rate_limiter,
+                        base_url=base_url,
+                    )
+            except Exception:
+                logger.exception(f"Download of .rod file with ID '{rod_id}' failed.")
+            while not stop.is_set():
+                try:
+                    results.put((rod_id, path), timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        for rod_id in to_download:
+            executor.submit(fetch, rod_id)
+        try:
+            for _ in to_download:
+                yield results.get()
+        finally:
+            # consumer done or gone: let blocked and queued workers finish
+            stop.set()
+
+
+def download_rod_files(
+    rod_ids: list[int],
+    output_dir: Path,
+    workers: int = 1,
+    rate_limit: float | None = DEFAULT_RATE_LIMIT,
+    base_url: str = ROD_BASE_URL,
+) -> list[Path]:
     """Download a batch of .rod files by ROD ID into output_dir.
 
     IDs whose .rod file already exists in output_dir are skipped without
@@ -59,56 +178,218 @@ def download_rod_files(rod_ids: list[int], output_dir: Path) -> list[Path]:
     save_rod_file_from_ROD_via_API) and skipped rather than raised, so one
     bad ID doesn't abort the batch.
 
+    All requests share one keep-alive session and one rate limiter; with
+    workers > 1 they are spread over a bounded thread pool.
+
     Args:
         rod_ids (list[int]): ROD record IDs to download.
         output_dir (Path): Directory to write the .rod files into.
+        workers (int): Number of concurrent downloads.
+        rate_limit (float, optional): Maximum requests per second across
+            all workers; None disables the limit.
+        base_url (str): Server to download from.
 
     Returns:
         list[Path]: Paths of all .rod files present in output_dir
-            afterwards (both newly downloaded and already-existing).
+            afterwards (both newly downloaded and already-existing), in
+            the order of rod_ids.
     """
-    output_dir.mkdir(parents=True, exist_ok=True)
-    paths = []
-    for rod_id in rod_ids:
-        existing = output_dir / f"{rod_id}.rod"
-        if existing.is_file():
-            logger.info(f"'{existing}' already exists, skipping download.")
-            paths.append(existing)
-            continue
-        path = save_rod_file_from_ROD_via_API(rod_id, output_dir=output_dir)
-        if path is not None:
-            paths.append(path)
-    return paths
+    paths = dict(
+        iter_rod_downloads(
+            rod_ids,
+            output_dir,
+            workers=workers,
+            rate_limit=rate_limit,
+            base_url=base_url,
+            buffer_size=max(1, len(rod_ids)),
+        )
+    )
+    return [path for path in (paths[rod_id] for rod_id in rod_ids) if path is not None]
 
 
-def convert_rod_files(input_dir: Path, output_dir: Path | None = None) -> list[Path]:
-    """Convert all ``.rod`` files in ``input_dir`` to ``.nxs`` files.
+def _convert_rod_file(rod_file: Path, output_file: Path) -> str | None:
+    """Convert a single .rod file to output_file. Returns None on success,
+    or the formatted traceback on failure -- returned rather than logged,
+    so it reaches the parent's log handlers from a worker process too.
+
+    Does what pynxtools' convert() does, step by step, so that reading,
+    validation and writing can be timed separately (see timing.py).
+    """
+    # Mirrors convert() of pynxtools 0.16 (with skip_verify=True in
+    # transfer_data_into_template, and validating here instead), the lowest
+    # version pyproject.toml allows; test_output_matches_pynxtools_convert
+    # catches the two drifting apart.
+    # Only needed once something is actually converted, and expensive to
+    # import; see cli.py.
+    from pynxtools.dataconverter import helpers
+    from pynxtools.dataconverter.convert import transfer_data_into_template
+    from pynxtools.dataconverter.validation import validate_dict_against
+    from pynxtools.dataconverter.writer import Writer
+
+    try:
+        with timed("convert", rod_file, output_file):
+            nxdl_root, nxdl_file_path = helpers.get_nxdl_root_and_path("NXraman")
+            data = transfer_data_into_template(
+                input_file=(str(rod_file),),
+                reader="raman",
+                nxdl_name="NXraman",
+                nxdl_root=nxdl_root,
+                skip_verify=True,
+            )
+            # The reader skips (with a warning) files no parser recognizes;
+            # checked here rather than by sniffing rod_file up front, which
+            # would read it a second time.
+            if data.get("/ENTRY[entry]/DATA[data]/DATA[y_values]") is None:
+                raise ValueError(f"{rod_file} does not look like a ROD .rod file.")
+            with timed("validate", rod_file):
+                validate_dict_against("NXraman", data)
+            with timed("write", output_file):
+                helpers.add_default_root_attributes(
+                    data=data, filename=output_file.name
+                )
+                Writer(
+                    data=data, nxdl_f_path=nxdl_file_path, output_path=str(output_file)
+                ).write()
+            logger.info(f"The output file generated: {output_file}.")
+    except Exception:
+        return traceback.format_exc()
+    return None
+
+
+def _convert_rod_file_timed(
+    rod_file: Path, output_file: Path
+) -> tuple[str | None, list[dict]]:
+    """_convert_rod_file, for a worker process: its timing records are
+    returned (for the parent to emit) along with the result."""
+    with collecting_timings() as records:
+        error = _convert_rod_file(rod_file, output_file)
+    return error, records
+
+
+def convert_rod_files(
+    input_dir: Path,
+    output_dir: Path | None = None,
+    *,
+    jobs: int = 1,
+    incremental: bool = False,
+    on_output: Callable[[Path, Path], None] | None = None,
+    on_failure: Callable[[Path, str], None] | None = None,
+    rod_files: Iterable[Path] | None = None,
+) -> list[Path]:
+    """Convert all ``.rod`` files in ``input_dir`` (or only ``rod_files``
+    among them) to ``.nxs`` files.
 
     The converted files are written to ``output_dir`` (default: ``input_dir``)
     using the Raman reader. Output files have the same stem as their
     corresponding input files.
 
-    Files that fail to convert are logged and skipped.
+    ``rod_files`` may be any iterable, e.g. a generator yielding files while
+    they are being downloaded: each file is submitted for conversion as soon
+    as it is taken from there. With ``jobs > 1`` the files are converted by a
+    pool of that many worker processes, with at most twice as many files in
+    flight at once, so a slow conversion holds back taking further files.
+    Either way the returned paths are in sorted input order.
+
+    With ``incremental``, outputs that are up to date according to the
+    ConversionManifest in ``output_dir`` are not rebuilt; they are still
+    part of the returned paths.
+
+    ``on_output(rod_file, output_file)`` is called in this process for every
+    returned path as soon as it is available: right away for up-to-date
+    outputs, otherwise as each conversion finishes.
+
+    Files that fail to convert are logged and skipped, and passed to
+    ``on_failure(rod_file, error)`` along with the formatted traceback.
     """
     output_dir = output_dir or input_dir
     output_dir.mkdir(parents=True, exist_ok=True)
+    if rod_files is None:
+        rod_files = sorted(input_dir.glob("*.rod"))
+
+    manifest = ConversionManifest.load(output_dir) if incremental else None
+    input_hashes: dict[Path, str] = {}
+    converted: list[Path] = []
+    n_up_to_date = 0
+
+    def output_file_of(rod_file: Path) -> Path:
+        return output_dir / f"{rod_file.stem}.nxs"
+
+    def to_convert() -> Iterator[Path]:
+        """rod_files, minus the up-to-date ones, which are reported here."""
+        nonlocal n_up_to_date
+        for rod_file in rod_files:
+            if manifest is not None:
+                input_hashes[rod_file] = file_sha256(rod_file)
+                if manifest.is_up_to_date(
+                    rod_file, output_file_of(rod_file), input_hashes[rod_file]
+                ):
+                    n_up_to_date += 1
+                    converted.append(rod_file)
+                    if on_output is not None:
+                        on_output(rod_file, output_file_of(rod_file))
+                    continue
+            yield rod_file
+
+    def finish(rod_file: Path, error: str | None) -> None:
+        if error is not None:
+            logger.error(f"Failed to convert {rod_file} to NeXus.\n{error}")
+            if on_failure is not None:
+                on_failure(rod_file, error)
+            if manifest is not None:
+                manifest.forget(rod_file)
+            return
+        converted.append(rod_file)
+        if manifest is not None:
+            manifest.record(rod_file, input_hashes[rod_file])
+        if on_output is not None:
+            on_output(rod_file, output_file_of(rod_file))
+
+    if jobs > 1:
+        # worker processes can't reach this process's timing sinks; their
+        # records come back with the result instead
+        collect_timings = timing_enabled()
+        in_flight: deque[tuple[Path, Future]] = deque()
+
+        def finish_oldest() -> None:
+            rod_file, future = in_flight.popleft()
+            if collect_timings:
+                error, records = future.result()
+                for record in records:
+                    emit_timing(record)
+            else:
+                error = future.result()
+            finish(rod_file, error)
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for rod_file in to_convert():
+                in_flight.append(
+                    (
+                        rod_file,
+                        executor.submit(
+                            _convert_rod_file_timed
+                            if collect_timings
+                            else _convert_rod_file,
+                            rod_file,
+                            output_file_of(rod_file),
+                        ),
+                    )
+                )
+                if len(in_flight) >= 2 * jobs:
+                    finish_oldest()
+            while in_flight:
+                finish_oldest()
+    else:
+        for rod_file in to_convert():
+            finish(rod_file, _convert_rod_file(rod_file, output_file_of(rod_file)))
+
+    if manifest is not None:
+        logger.info(
+            f"{n_up_to_date} NeXus file(s) were up to date, skipped rebuilding them."
+        )
+        manifest.prune(sorted(input_dir.glob("*.rod")))
+        manifest.save()
 
-    converted = []
-    for rod_file in sorted(input_dir.glob("*.rod")):
-        output_file = output_dir / f"{rod_file.stem}.nxs"
-        try:
-            if not RodParser.is_mainfile(rod_file):
-                raise ValueError(f"{rod_file} does not look like a ROD .rod file.")
-            convert(
-                input_file=(str(rod_file),),
-                reader="raman",
-                nxdl="NXraman",
-                output=str(output_file),
-            )
-            converted.append(output_file)
-        except Exception:
-            logger.exception(f"Failed to convert {rod_file} to NeXus.")
-    return converted
+    return [output_file_of(rod_file) for rod_file in sorted(converted)]
 
 
 def collect_rod_ids(rod_ids: list[str], ids_file: Path | None) -> list[int]:
@@ -166,7 +447,8 @@ def _confirm_download(rod_id_list: list[int], output_dir: Path, yes: bool) -> bo
 
 def _rod_batch_options(command: Callable) -> Callable:
     """Shared CLI surface for commands operating on a batch of ROD IDs:
-    positional IDs, --ids-file, --all, --output-dir, --yes.
+    positional IDs, --ids-file, --all, --output-dir, --yes, --workers,
+    --rate-limit, --peak-index/--no-peak-index.
     """
     command = click.argument("rod_ids", nargs=-1)(command)
     command = click.option(
@@ -198,17 +480,50 @@ def _rod_batch_options(command: Callable) -> Callable:
         is_flag=True,
         help="Do not ask for confirmation before downloading.",
     )(command)
+    command = click.option(
+        "--workers",
+        type=click.IntRange(min=1),
+        default=1,
+        show_default=True,
+        help="Number of concurrent downloads.",
+    )(command)
+    command = click.option(
+        "--rate-limit",
+        type=click.FloatRange(min=0),
+        default=DEFAULT_RATE_LIMIT,
+        show_default=True,
+        help="Maximum requests per second sent to the ROD server (0 for no limit).",
+    )(command)
+    command = click.option(
+        "--peak-index/--no-peak-index",
+        default=True,
+        show_default=True,
+        help=(
+            f"Update the peak index ({PEAK_INDEX_FILENAME}) in --output-dir "
+            "with the new .rod files, for match-peaks."
+        ),
+    )(command)
     return command
 
 
+def _update_peak_index(output_dir: Path, jobs: int = 1) -> None:
+    """Add the .rod files just downloaded into output_dir to its peak index,
+    so that match-peaks finds them without parsing them first."""
+    _, n_parsed = update_peak_index(output_dir, jobs=jobs)
+    click.echo(f"Peak index updated with {n_parsed} new or changed .rod file(s).")
+
+
 @click.command("download-rod-files")
 @_rod_batch_options
-def download_rod_files_cli(
+def download_rod_files_cli(  # noqa: PLR0917
     rod_ids: tuple[str, ...],
     ids_file: Path | None,
     all_known: bool,
     output_dir: Path,
     yes: bool,
+    workers: int,
+    rate_limit: float,
+    peak_index: bool,
 ):
     """Download a batch of .rod files from the Raman Open Database.
 
@@ -219,23 +534,108 @@ def download_rod_files_cli(
     if not _confirm_download(rod_id_list, output_dir, yes):
         return
 
-    downloaded = download_rod_files(rod_id_list, output_dir)
+    downloaded = download_rod_files(
+        rod_id_list, output_dir, workers=workers, rate_limit=rate_limit or None
+    )
     click.echo(
         f"{len(downloaded)}/{len(rod_id_list)} .rod file(s) present in {output_dir}."
     )
+    if peak_index:
+        _update_peak_index(output_dir)
 
 
 @click.command("build-rod-upload-batch")
 @_rod_batch_options
-def build_rod_upload_batch(
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes converting .rod files to NeXus.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help=(
+        "Only convert .rod files whose NeXus output is missing or out of date "
+        "(changed input, config file, or package version)."
+    ),
+)
+@click.option(
+    "--zip",
+    "zip_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help=(
+        "Also pack the batch into ZIP archive(s) ready for upload, named "
+        "after this path with a shard number (e.g. upload.zip -> "
+        "upload-001.zip, ...), each with nomad.json at its root."
+    ),
+)
+@click.option(
+    "--zip-max-size",
+    type=click.FloatRange(min=0, min_open=True),
+    default=NOMAD_UPLOAD_SIZE_LIMIT / 1024**3,
+    show_default=True,
+    help="Maximum size of each ZIP archive, in GiB.",
+)
+@click.option(
+    "--zip-include-sources",
+    is_flag=True,
+    help="Pack the .rod source files next to their .nxs files.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help=(
+        "Continue an interrupted run: skip IDs the batch journal in "
+        "--output-dir already records as converted (or as failed, unless "
+        "--retry-failed is given)."
+    ),
+)
+@click.option(
+    "--retry-failed",
+    is_flag=True,
+    help="With --resume, retry the IDs that failed in a previous run.",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    help=(
+        "Time every stage of every file (download, parse, validate, write, "
+        "...) and print a summary per stage at the end."
+    ),
+)
+@click.option(
+    "--timings-log",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Append the timing of every stage of every file to this JSON-lines file.",
+)
+def build_rod_upload_batch(  # noqa: PLR0917
     rod_ids: tuple[str, ...],
     ids_file: Path | None,
     all_known: bool,
     output_dir: Path,
     yes: bool,
+    workers: int,
+    rate_limit: float,
+    peak_index: bool,
+    jobs: int,
+    incremental: bool,
+    zip_path: Path | None,
+    zip_max_size: float,
+    zip_include_sources: bool,
+    resume: bool,
+    retry_failed: bool,
+    timings: bool,
+    timings_log: Path | None,
 ):
-    """Download, convert, and add nomad.json upload metadata for a batch of
-    ROD records -- the full pipeline for one NOMAD upload, ready to zip.
+    """Download and convert a batch of ROD records into a NOMAD upload.
+
+    Also adds the nomad.json upload metadata -- the full pipeline for one
+    NOMAD upload, ready to zip.
 
     ROD_IDS: ROD IDs to include, in addition to any given via --ids-file
     and/or --all.
@@ -244,15 +644,160 @@ def build_rod_upload_batch(
     if not _confirm_download(rod_id_list, output_dir, yes):
         return
 
-    downloaded = download_rod_files(rod_id_list, output_dir)
-    click.echo(
-        f"{len(downloaded)}/{len(rod_id_list)} .rod file(s) present in {output_dir}."
-    )
+    stage_timings = StageTimings()
+    with ExitStack() as stack:
+        if timings:
+            stack.enter_context(recording_timings(stage_timings))
+        if timings_log is not None:
+            log_sink = stack.enter_context(JsonLinesSink(timings_log))
+            stack.enter_context(recording_timings(log_sink))
+        _build_upload_batch(
+            rod_id_list,
+            output_dir,
+            workers=workers,
+            rate_limit=rate_limit,
+            peak_index=peak_index,
+            jobs=jobs,
+            incremental=incremental,
+            zip_path=zip_path,
+            zip_max_size=zip_max_size,
+            zip_include_sources=zip_include_sources,
+            resume=resume,
+            retry_failed=retry_failed,
+        )
+    if timings:
+        click.echo(stage_timings.format_table())
+
+
+def _build_upload_batch(
+    rod_id_list: list[int],
+    output_dir: Path,
+    *,
+    workers: int,
+    rate_limit: float,
+    peak_index: bool,
+    jobs: int,
+    incremental: bool,
+    zip_path: Path | None,
+    zip_max_size: float,
+    zip_include_sources: bool,
+    resume: bool,
+    retry_failed: bool,
+) -> None:
+    """The pipeline behind build_rod_upload_batch, once the IDs are known:
+    downloads feed straight into conversion (see iter_rod_downloads and
+    convert_rod_files), and every step's outcome is recorded per ID in the
+    BatchJournal."""
+    with ExitStack() as stack:
+        journal = stack.enter_context(BatchJournal(output_dir, resume=resume))
+        done = [
+            rod_id
+            for rod_id in rod_id_list
+            if journal.state(rod_id) == CONVERTED
+            and (output_dir / f"{rod_id}.nxs").is_file()
+        ]
+        skipped = set(done)
+        if not retry_failed:
+            skipped.update(journal.failures(rod_id_list))
+        pending = [rod_id for rod_id in rod_id_list if rod_id not in skipped]
+        if resume:
+            click.echo(
+                f"Resuming: {len(done)} ID(s) already converted, "
+                f"{len(skipped) - len(done)} failed ID(s) skipped, "
+                f"{len(pending)} to go."
+            )
+
+        upload_zip = None
+        if zip_path is not None:
+            upload_zip = stack.enter_context(
+                ShardedUploadZip(
+                    zip_path,
+                    max_shard_bytes=int(zip_max_size * 1024**3),
+                    root_files={"nomad.json": render_nomad_json()},
+                )
+            )
 
-    converted = convert_rod_files(output_dir)
-    click.echo(f"Converted {len(converted)} .rod file(s) to NeXus.")
+        def pack(rod_file: Path, output_file: Path) -> None:
+            if upload_zip is None:
+                return
+            if zip_include_sources:
+                upload_zip.add(output_file, rod_file)
+            else:
+                upload_zip.add(output_file)
+
+        for rod_id in done:
+            pack(output_dir / f"{rod_id}.rod", output_dir / f"{rod_id}.nxs")
+
+        def converted(rod_file: Path, output_file: Path) -> None:
+            journal.mark_converted(int(rod_file.stem))
+            pack(rod_file, output_file)
+
+        def failed(rod_file: Path, error: str) -> None:
+            journal.mark_failed(int(rod_file.stem), "convert", error.splitlines()[-1])
+
+        n_present = len(done)
+
+        def downloaded() -> Iterator[Path]:
+            nonlocal n_present
+            for rod_id, rod_file in iter_rod_downloads(
+                pending,
+                output_dir,
+                workers=workers,
+                rate_limit=rate_limit or None,
+                buffer_size=max(DEFAULT_PIPELINE_BUFFER, 2 * jobs),
+            ):
+                if rod_file is None:
+                    journal.mark_failed(rod_id, "download", "download failed")
+                    continue
+                journal.mark_downloaded(rod_id)
+                n_present += 1
+                yield rod_file
+
+        # Each file is converted as soon as it is downloaded, while the
+        # downloads go on in the background.
+        convert_rod_files(
+            output_dir,
+            jobs=jobs,
+            incremental=incremental,
+            on_output=converted,
+            on_failure=failed,
+            rod_files=downloaded(),
+        )
+        click.echo(
+            f"{n_present}/{len(rod_id_list)} .rod file(s) present in {output_dir}."
+        )
+        if peak_index:
+            _update_peak_index(output_dir, jobs=jobs)
+
+        metadata_path = write_nomad_json(output_dir)
+        click.echo(f"Wrote {metadata_path}.")
+        _echo_journal_summary(journal, rod_id_list)
+
+    if upload_zip is None:
+        click.echo(f"Batch ready in {output_dir} -- zip it for upload.")
+        return
+    for shard in upload_zip.shards:
+        click.echo(f"Upload ready: {shard}")
 
-    metadata_path = write_nomad_json(output_dir)
+
+# Failures listed individually in the summary; the rest are only counted.
+MAX_LISTED_FAILURES = 10
+
+
+def _echo_journal_summary(journal: BatchJournal, rod_id_list: list[int]) -> None:
+    """Print how many of rod_id_list are in which state, and why the first
+    MAX_LISTED_FAILURES failed ones failed."""
+    counts = journal.summary(rod_id_list)
     click.echo(
-        f"Wrote {metadata_path}. Batch ready in {output_dir} -- zip it for upload."
+        f"{counts[CONVERTED]}/{len(rod_id_list)} ROD ID(s) converted to NeXus, "
+        f"{counts[FAILED]} failed."
     )
+    failures = journal.failures(rod_id_list)
+    for rod_id, entry in list(failures.items())[:MAX_LISTED_FAILURES]:
+        click.echo(f"  {rod_id}: {entry['stage']} failed: {entry['reason']}")
+    if len(failures) > MAX_LISTED_FAILURES:
+        click.echo(
+            f"  ... and {len(failures) - MAX_LISTED_FAILURES} more, see {journal.path}."
+        )
+    if failures:
+        click.echo("Re-run with --resume --retry-failed to retry them.")
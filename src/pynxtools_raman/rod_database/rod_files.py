@@ -0,0 +1,66 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Helpers shared by the commands that go over a whole directory of .rod
+files (analyze-keys, build-archive, match-peaks, query, ...): processing
+the files in worker processes, and replacing output files atomically."""
+
+import os
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def map_rod_files(
+    function: Callable[[Path], T], rod_files: Sequence[Path], jobs: int = 1
+) -> Iterator[T]:
+    """
+    Yield function(rod_file) for each of rod_files, in order. With jobs > 1,
+    the files are spread over that many worker processes, in chunks of
+    about a quarter of each worker's share.
+
+    function must then be a module-level function, and anything it wants
+    to log should be part of its result instead, as log records of the
+    worker processes don't reach this process's handlers.
+    """
+    if jobs > 1 and len(rod_files) > 1:
+        chunksize = max(1, len(rod_files) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from executor.map(function, rod_files, chunksize=chunksize)
+    else:
+        yield from map(function, rod_files)
+
+
+@contextmanager
+def atomic_write(path: Path) -> Iterator[Path]:
+    """
+    Yield a path next to `path` for the with-block to write to, and move it
+    onto `path` once the block completes, so that `path` never holds a
+    partly written file. If the block raises, the partial file is removed
+    and `path` is left as it was.
+    """
+    partial_path = path.with_name(f".{path.name}.partial")
+    try:
+        yield partial_path
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    os.replace(partial_path, path)
@@ -16,15 +16,75 @@
 # limitations under the License.
 #
 import logging
+import threading
+import time
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__file__)
 
+ROD_BASE_URL = "https://solsa.crystallography.net/rod"
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+
+
+class RateLimiter:
+    """Spaces out calls to `wait()` to at most `max_per_second`, shared
+    across all threads using the same instance. None or 0 disables it.
+    """
+
+    def __init__(self, max_per_second: float | None = None):
+        self._interval = 1.0 / max_per_second if max_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def create_session(pool_size: int = 1) -> requests.Session:
+    """Create a keep-alive HTTP session whose connection pool is large
+    enough for `pool_size` concurrent downloads.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _is_retryable(exc: requests.exceptions.RequestException) -> bool:
+    """Connection problems, timeouts and 5xx responses are worth retrying;
+    anything else (e.g. a 404 for an unknown ID) won't get better."""
+    if isinstance(
+        exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    ):
+        return True
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return exc.response.status_code >= 500
+    return False
+
 
 def save_rod_file_from_ROD_via_API(
-    rod_id: int, output_dir: Path | None = None
+    rod_id: int,
+    output_dir: Path | None = None,
+    *,
+    session: requests.Session | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    rate_limiter: RateLimiter | None = None,
+    base_url: str = ROD_BASE_URL,
 ) -> Path | None:
     """Download a .rod file from the Raman Open Database.
 
@@ -33,32 +93,56 @@ def save_rod_file_from_ROD_via_API(
         output_dir (Path, optional): Directory to write the .rod file
             into. Created if it doesn't exist yet. Defaults to the
             current directory.
+        session (requests.Session, optional): Session to reuse pooled
+            connections from. Defaults to a one-off request.
+        timeout (float): Per-request timeout in seconds.
+        retries (int): How often to retry after a connection error,
+            timeout, or 5xx response.
+        backoff (float): Delay before the first retry in seconds, doubled
+            for every further retry.
+        rate_limiter (RateLimiter, optional): Shared limiter every request
+            (including retries) waits on first.
+        base_url (str): Server to download from, without trailing slash.
 
     Returns:
         Optional[Path]: Path of the downloaded file, or None if the
             download failed (the error is logged, not raised).
     """
-    url = "https://solsa.crystallography.net/rod/" + str(rod_id) + ".rod"
+    url = f"{base_url}/{rod_id}.rod"
     output_dir = output_dir or Path()
     output_dir.mkdir(parents=True, exist_ok=True)
+    http = session if session is not None else requests
 
     logger.info(f"Initialized download of .rod file with ID '{rod_id}' from '{url}'.")
 
-    try:
-        response = requests.post(url)
-        response.raise_for_status()  # Raise HTTP error for bad
+    for attempt in range(retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        try:
+            response = http.post(url, timeout=timeout)
+            response.raise_for_status()  # Raise HTTP error for bad
 
-        logger.info(f"Successfully received .rod file with ID '{rod_id}'")
+            logger.info(f"Successfully received .rod file with ID '{rod_id}'")
 
-        file_path = output_dir / f"{rod_id}.rod"
-        file_path.write_text(response.text, encoding="utf-8")
-        logger.info(f"Saved .rod file with ID '{rod_id}' to file '{file_path}'")
-        return file_path
+            file_path = output_dir / f"{rod_id}.rod"
+            file_path.write_text(response.text, encoding="utf-8")
+            logger.info(f"Saved .rod file with ID '{rod_id}' to file '{file_path}'")
+            return file_path
 
-    except requests.exceptions.ConnectionError as con_err:
-        logger.error(f"ConnectionError occurred: {con_err}")
-    except requests.exceptions.HTTPError as http_err:
-        logger.error(f"CHTTPError occurred: {http_err}")
-    except requests.exceptions.RequestException as req_exc:
-        logger.error(f"RequestException occurred: {req_exc}")
+        except requests.exceptions.RequestException as req_exc:
+            if attempt < retries and _is_retryable(req_exc):
+                delay = backoff * 2**attempt
+                logger.warning(
+                    f"Download of .rod file with ID '{rod_id}' failed "
+                    f"({req_exc}); retrying in {delay:g} s."
+                )
+                time.sleep(delay)
+                continue
+            if isinstance(req_exc, requests.exceptions.ConnectionError):
+                logger.error(f"ConnectionError occurred: {req_exc}")
+            elif isinstance(req_exc, requests.exceptions.HTTPError):
+                logger.error(f"HTTPError occurred: {req_exc}")
+            else:
+                logger.error(f"RequestException occurred: {req_exc}")
+            return None
     return None
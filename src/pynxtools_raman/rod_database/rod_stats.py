@@ -22,25 +22,103 @@ common (worth mapping) versus rare across a corpus of downloaded ROD
 records.
 """
 
+import json
+import logging
 from pathlib import Path
 
 import click
 
 from pynxtools_raman.parsers.rod import RodParser
 from pynxtools_raman.rod_database import DEFAULT_ROD_BATCH_DIR
+from pynxtools_raman.rod_database.rod_files import atomic_write, map_rod_files
 
+logger = logging.getLogger(__file__)
 
-def count_rod_keys(rod_dir: Path) -> dict[str, int]:
-    """Count how many .rod files in rod_dir contain each CIF key, sorted by
-    descending frequency.
+KEY_CACHE_FILENAME = ".rod_key_cache.json"
+
+
+def _scan_rod_file_keys(rod_file: Path) -> list[str]:
+    """Return the CIF keys present in rod_file. Only the key -> loop map is
+    built; no values are extracted or converted."""
+    parser = RodParser()
+    parser.get_cif_file_content(rod_file)
+    return list(parser.get_keys_and_loop_boolean())
+
+
+def _load_key_cache(cache_file: Path) -> dict[str, dict]:
+    try:
+        return json.loads(cache_file.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        logger.warning(f"Ignoring unreadable key cache '{cache_file}'.")
+        return {}
+
+
+def scan_rod_keys(
+    rod_dir: Path, jobs: int = 1, cache_file: Path | None = None
+) -> tuple[dict[str, int], int]:
+    """Count how many .rod files in rod_dir contain each CIF key.
+
+    Files are scanned by up to ``jobs`` worker processes. If ``cache_file``
+    is given, each file's key list is cached there under its name, size and
+    modification time, so re-analysing a grown directory only scans new or
+    changed files.
+
+    Returns:
+        tuple[dict[str, int], int]: key counts sorted by descending
+            frequency, and the number of .rod files counted.
     """
+    rod_files = sorted(rod_dir.glob("*.rod"))
+    cache = _load_key_cache(cache_file) if cache_file is not None else {}
+
+    file_keys: dict[str, list[str]] = {}
+    stamps: dict[str, tuple[int, int]] = {}
+    to_scan = []
+    for rod_file in rod_files:
+        stat = rod_file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        stamps[rod_file.name] = stamp
+        cached = cache.get(rod_file.name)
+        if cached is not None and (cached["mtime_ns"], cached["size"]) == stamp:
+            file_keys[rod_file.name] = cached["keys"]
+        else:
+            to_scan.append(rod_file)
+
+    scanned = map_rod_files(_scan_rod_file_keys, to_scan, jobs)
+    file_keys.update((rod_file.name, keys) for rod_file, keys in zip(to_scan, scanned))
+
+    if cache_file is not None:
+        with atomic_write(cache_file) as partial_path:
+            partial_path.write_text(
+                json.dumps(
+                    {
+                        name: {
+                            "mtime_ns": stamps[name][0],
+                            "size": stamps[name][1],
+                            "keys": keys,
+                        }
+                        for name, keys in file_keys.items()
+                    }
+                ),
+                encoding="utf-8",
+            )
+
     key_counts: dict[str, int] = {}
-    for rod_file in sorted(rod_dir.glob("*.rod")):
-        parser = RodParser()
-        parser.get_cif_file_content(str(rod_file))
-        for key in parser.extract_keys_and_values_from_cif():
+    for rod_file in rod_files:
+        for key in file_keys[rod_file.name]:
             key_counts[key] = key_counts.get(key, 0) + 1
-    return dict(sorted(key_counts.items(), key=lambda item: item[1], reverse=True))
+    sorted_counts = dict(
+        sorted(key_counts.items(), key=lambda item: item[1], reverse=True)
+    )
+    return sorted_counts, len(rod_files)
+
+
+def count_rod_keys(rod_dir: Path, jobs: int = 1) -> dict[str, int]:
+    """Count how many .rod files in rod_dir contain each CIF key, sorted by
+    descending frequency.
+    """
+    return scan_rod_keys(rod_dir, jobs=jobs)[0]
 
 
 @click.command("analyze-rod-keys")
@@ -55,19 +133,33 @@ def count_rod_keys(rod_dir: Path) -> dict[str, int]:
     default=None,
     help="File to write the key/count report to (default: rod_key_statistics.txt inside ROD_DIR).",
 )
-def analyze_rod_keys(rod_dir: Path, output: Path | None):
-    """Count how often each CIF key occurs across every .rod file in ROD_DIR,
-    writing a sorted key/count report into ROD_DIR.
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes scanning .rod files.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help=f"Rescan every file instead of reusing per-file results cached in ROD_DIR/{KEY_CACHE_FILENAME}.",
+)
+def analyze_rod_keys(rod_dir: Path, output: Path | None, jobs: int, no_cache: bool):
+    """Count how often each CIF key occurs across the .rod files in ROD_DIR.
+
+    The sorted key/count report is written into ROD_DIR.
 
     ROD_DIR: directory containing .rod files (default: rod_batch).
     """
     output = output or (rod_dir / "rod_key_statistics.txt")
-    key_counts = count_rod_keys(rod_dir)
+    cache_file = None if no_cache else rod_dir / KEY_CACHE_FILENAME
+    key_counts, n_files = scan_rod_keys(rod_dir, jobs=jobs, cache_file=cache_file)
     output.write_text(
         "".join(f"{key}\t{count}\n" for key, count in key_counts.items()),
         encoding="utf-8",
     )
-    n_files = sum(1 for _ in rod_dir.glob("*.rod"))
     click.echo(
         f"Found {len(key_counts)} distinct keys across {n_files} file(s). "
         f"Wrote report to {output}."
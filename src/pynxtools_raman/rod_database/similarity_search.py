@@ -0,0 +1,307 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Similarity search of measured spectra (e.g. WITec exports) against the
+ROD reference spectra of a spectral archive (see spectral_archive.py).
+
+Every reference spectrum is resampled onto a common Raman shift grid once
+and normalized, giving a float32 (n_references, n_grid) matrix that is
+cached next to the archive. A query spectrum goes through the same
+resampling and normalization, so the scores of a whole batch of queries
+against all references are a single matrix product:
+
+    cosine   rows scaled to unit length; score = cosine similarity
+    pearson  rows mean-centered, then scaled to unit length; score =
+             Pearson correlation coefficient
+
+Outside of a spectrum's measured range its resampled intensity is 0.
+"""
+
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+
+import click
+import numpy as np
+
+from pynxtools_raman.parsers.witec import WitecParser
+from pynxtools_raman.rod_database import DEFAULT_ROD_BATCH_DIR
+from pynxtools_raman.rod_database.rod_files import atomic_write
+from pynxtools_raman.rod_database.spectral_archive import (
+    ARCHIVE_FILENAME,
+    SpectralArchive,
+)
+
+logger = logging.getLogger(__file__)
+
+METRICS = ("cosine", "pearson")
+
+# Raman shift grid (cm^-1) the spectra are compared on: start, stop, step.
+DEFAULT_GRID = (50.0, 4000.0, 2.0)
+
+DEFAULT_TOP_K = 10
+
+CACHE_VERSION = 1
+
+
+def make_grid(start: float, stop: float, step: float) -> np.ndarray:
+    """The Raman shift grid from start to stop (inclusive) in steps of step."""
+    return np.arange(start, stop + step / 2, step, dtype=np.float64)
+
+
+def resample(
+    raman_shift: np.ndarray, intensity: np.ndarray, grid: np.ndarray
+) -> np.ndarray:
+    """intensity, linearly interpolated onto grid; 0 outside raman_shift's
+    range. raman_shift doesn't need to be sorted, and non-finite points are
+    ignored."""
+    raman_shift = np.asarray(raman_shift, dtype=np.float64)
+    intensity = np.asarray(intensity, dtype=np.float64)
+    finite = np.isfinite(raman_shift) & np.isfinite(intensity)
+    raman_shift, intensity = raman_shift[finite], intensity[finite]
+    if raman_shift.size == 0:
+        return np.zeros_like(grid)
+    order = np.argsort(raman_shift, kind="stable")
+    return np.interp(grid, raman_shift[order], intensity[order], left=0.0, right=0.0)
+
+
+def normalize(rows: np.ndarray, metric: str) -> np.ndarray:
+    """rows (one resampled spectrum each), normalized for metric as float32.
+    All-zero (or constant, for pearson) rows stay all zero, i.e. score 0."""
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {METRICS}.")
+    rows = np.atleast_2d(np.array(rows, dtype=np.float64))
+    if metric == "pearson":
+        rows = rows - rows.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    np.divide(rows, norms, out=rows, where=norms > 0)
+    return rows.astype(np.float32)
+
+
+def cache_path_for(archive_path: Path, metric: str) -> Path:
+    """Where the reference matrix of archive_path for metric is cached."""
+    return archive_path.with_name(f"{archive_path.stem}.similarity-{metric}.npz")
+
+
+def _archive_stamp(archive_path: Path) -> np.ndarray:
+    stat = archive_path.stat()
+    return np.array([CACHE_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+class SimilaritySearch:
+    """
+    Top-k search of query spectra against a normalized reference matrix,
+    whose rows belong to rod_ids and are sampled on grid.
+    """
+
+    def __init__(
+        self, rod_ids: np.ndarray, grid: np.ndarray, matrix: np.ndarray, metric: str
+    ):
+        if matrix.shape != (len(rod_ids), len(grid)):
+            raise ValueError(
+                f"Reference matrix of shape {matrix.shape} doesn't match "
+                f"{len(rod_ids)} ROD IDs and a grid of {len(grid)} points."
+            )
+        self.rod_ids = rod_ids
+        self.grid = grid
+        self.matrix = matrix
+        self.metric = metric
+
+    def __len__(self) -> int:
+        return len(self.rod_ids)
+
+    @classmethod
+    def from_archive(
+        cls,
+        archive_path: Path,
+        metric: str = "cosine",
+        grid: np.ndarray | None = None,
+        use_cache: bool = True,
+    ) -> "SimilaritySearch":
+        """
+        The search over every spectrum of the archive at archive_path
+        (resampled onto grid, default: DEFAULT_GRID). With use_cache, the
+        reference matrix is read from cache_path_for(archive_path, metric)
+        if that was built from the same archive file and grid, and written
+        there otherwise.
+        """
+        grid = make_grid(*DEFAULT_GRID) if grid is None else grid
+        cache_path = cache_path_for(archive_path, metric)
+        stamp = _archive_stamp(archive_path)
+        if use_cache and cache_path.exists():
+            with np.load(cache_path) as cached:
+                if np.array_equal(cached["stamp"], stamp) and np.array_equal(
+                    cached["grid"], grid
+                ):
+                    return cls(cached["rod_ids"], grid, cached["matrix"], metric)
+            logger.info(f"{cache_path} is out of date, rebuilding it.")
+
+        with SpectralArchive(archive_path) as archive:
+            rod_ids = archive.rod_ids
+            resampled = np.zeros((len(rod_ids), len(grid)), dtype=np.float64)
+            for i, (_, raman_shift, intensity) in enumerate(archive.spectra()):
+                resampled[i] = resample(raman_shift, intensity, grid)
+        search = cls(rod_ids, grid, normalize(resampled, metric), metric)
+
+        if use_cache:
+            with (
+                atomic_write(cache_path) as partial_path,
+                open(partial_path, "wb") as partial_file,
+            ):
+                np.savez(
+                    partial_file,
+                    stamp=stamp,
+                    grid=grid,
+                    rod_ids=rod_ids,
+                    matrix=search.matrix,
+                )
+        return search
+
+    def vectorize(self, raman_shift: np.ndarray, intensity: np.ndarray) -> np.ndarray:
+        """A query spectrum, resampled and normalized like the references."""
+        return normalize(resample(raman_shift, intensity, self.grid), self.metric)[0]
+
+    def search_many(
+        self,
+        spectra: Sequence[tuple[np.ndarray, np.ndarray]],
+        top_k: int = DEFAULT_TOP_K,
+    ) -> list[list[tuple[int, float]]]:
+        """
+        The top_k best matching (rod_id, score) pairs, best first, for each
+        (raman_shift, intensity) query of spectra; all queries are scored
+        in one matrix product.
+        """
+        if not spectra:
+            return []
+        queries = np.stack(
+            [resample(shift, intensity, self.grid) for shift, intensity in spectra]
+        )
+        scores = normalize(queries, self.metric) @ self.matrix.T
+
+        top_k = min(top_k, len(self))
+        if top_k <= 0:
+            return [[] for _ in spectra]
+        best = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        return [
+            [(int(self.rod_ids[i]), float(score)) for i, score in zip(row, row_scores)]
+            for row, row_scores in zip(best, best_scores)
+        ]
+
+    def search(
+        self,
+        raman_shift: np.ndarray,
+        intensity: np.ndarray,
+        top_k: int = DEFAULT_TOP_K,
+    ) -> list[tuple[int, float]]:
+        """The top_k best matching (rod_id, score) pairs of one spectrum."""
+        return self.search_many([(raman_shift, intensity)], top_k)[0]
+
+    def search_parser(
+        self, parser: WitecParser, top_k: int = DEFAULT_TOP_K
+    ) -> list[tuple[int, float]]:
+        """Search with the spectrum of a parsed and post-processed
+        WitecParser (its data/x_values_raman and data/y_values)."""
+        return self.search(*_parser_spectrum(parser), top_k=top_k)
+
+
+def _parser_spectrum(parser: WitecParser) -> tuple[np.ndarray, np.ndarray]:
+    if "data/x_values_raman" not in parser.data:
+        raise ValueError(
+            "The parser's data has no Raman shift (data/x_values_raman); "
+            "call post_process() with the laser wavelength first."
+        )
+    return (
+        np.asarray(parser.data["data/x_values_raman"]),
+        np.asarray(parser.data["data/y_values"]),
+    )
+
+
+@click.command("search-spectra")
+@click.argument(
+    "witec_files",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--laser-wavelength",
+    type=click.FloatRange(min=0, min_open=True),
+    required=True,
+    help="Excitation laser wavelength (nm) the WITec files were measured with.",
+)
+@click.option(
+    "--archive",
+    "archive_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_ROD_BATCH_DIR / ARCHIVE_FILENAME,
+    show_default=True,
+    help="Spectral archive of the reference spectra (see build-archive).",
+)
+@click.option(
+    "--metric",
+    type=click.Choice(METRICS),
+    default="cosine",
+    show_default=True,
+    help="Similarity score to rank the references by.",
+)
+@click.option(
+    "--top-k",
+    type=click.IntRange(min=1),
+    default=DEFAULT_TOP_K,
+    show_default=True,
+    help="Number of best matching references to list per file.",
+)
+def search_spectra_cli(
+    witec_files: tuple[Path, ...],
+    laser_wavelength: float,
+    archive_path: Path,
+    metric: str,
+    top_k: int,
+):
+    """Rank the ROD reference spectra by their similarity to WITEC_FILES.
+
+    The best matches in the spectral archive are listed for each file.
+
+    The reference spectra are resampled and normalized once, and cached
+    next to the archive, so repeated searches only parse the WITEC_FILES.
+    """
+    spectra = []
+    for witec_file in witec_files:
+        parser = WitecParser()
+        if not parser.check_mainfile(witec_file):
+            raise click.BadParameter(
+                f"{witec_file} is not a WITec export.", param_hint="WITEC_FILES"
+            )
+        parser.parse(witec_file)
+        parser.post_process(
+            {"/ENTRY[entry]/instrument/beam_incident/wavelength": laser_wavelength}
+        )
+        spectra.append(_parser_spectrum(parser))
+
+    search = SimilaritySearch.from_archive(archive_path, metric)
+    with SpectralArchive(archive_path) as archive:
+        mineral_names = dict(
+            zip(archive.rod_ids.tolist(), archive.metadata_table()["mineral_name"])
+        )
+    for witec_file, matches in zip(witec_files, search.search_many(spectra, top_k)):
+        click.echo(f"{witec_file}:")
+        for rod_id, score in matches:
+            click.echo(f"  {rod_id}\t{score:.4f}\t{mineral_names[rod_id]}")
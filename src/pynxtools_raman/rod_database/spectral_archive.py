@@ -0,0 +1,311 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Columnar archive of the spectra (and a few metadata fields) of a whole
+directory of .rod files, in a single HDF5 file.
+
+Every .rod file is parsed by RodParser once, when the archive is built.
+Afterwards any spectrum can be read by ROD ID without parsing anything:
+
+    /rod_id          int64 (n,)       ROD IDs, ascending
+    /offsets         int64 (n + 1,)   spectrum i is [offsets[i]:offsets[i + 1]]
+    /raman_shift     float64 (total,) all spectra, concatenated
+    /intensity       float64 (total,)
+    /metadata/<col>  (n,)             one entry per ROD ID, see METADATA_COLUMNS
+
+The spectrum datasets are chunked and compressed, so reading one spectrum
+only decompresses the chunks it lies in.
+"""
+
+import logging
+import math
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import click
+import h5py
+import numpy as np
+
+from pynxtools_raman.parsers.rod import RodParser, cif_float
+from pynxtools_raman.rod_database import DEFAULT_ROD_BATCH_DIR
+from pynxtools_raman.rod_database.rod_files import atomic_write, map_rod_files
+
+logger = logging.getLogger(__file__)
+
+ARCHIVE_FILENAME = "rod_spectra.h5"
+ARCHIVE_FORMAT = "pynxtools-raman spectral archive"
+ARCHIVE_VERSION = 1
+
+# Elements per chunk of the concatenated spectrum datasets.
+CHUNK_SIZE = 65536
+
+# column -> RodParser attrs keys, the first one present wins
+METADATA_COLUMNS: dict[str, tuple[str, ...]] = {
+    "formula": (
+        "_cod_original_formula_sum",
+        "_chemical_formula_sum",
+        "_chemical_formula_structural",
+    ),
+    "mineral_name": ("_chemical_name_mineral", "_chemical_name_systematic"),
+    "cod_code": ("_cod_database_code",),
+    "laser_wavelength": ("_raman_measurement_device.excitation_laser_wavelength",),
+}
+# Numeric columns; NaN where a record doesn't have the value.
+FLOAT_COLUMNS = ("laser_wavelength",)
+
+
+def rod_id_of(rod_file: Path) -> int | None:
+    """The ROD ID a .rod file is named after, or None if it isn't."""
+    try:
+        return int(rod_file.stem)
+    except ValueError:
+        return None
+
+
+def read_rod_record(
+    rod_file: Path,
+) -> tuple[np.ndarray, np.ndarray, dict[str, Any]] | str:
+    """Parse rod_file into its measured spectrum (Raman shift and
+    intensity, as float64 arrays of the same length) and its
+    METADATA_COLUMNS. Returns a one-line reason instead if the file can't
+    be parsed or has no usable measured spectrum."""
+    parser = RodParser()
+    try:
+        parser.parse(rod_file)
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}"
+
+    raman_shift = parser.data.get("_raman_spectrum.raman_shift")
+    intensity = parser.data.get("_raman_spectrum.intensity")
+    if not isinstance(raman_shift, np.ndarray) or not isinstance(intensity, np.ndarray):
+        return "no numeric measured spectrum"
+    if raman_shift.shape != intensity.shape:
+        return "raman_shift and intensity differ in length"
+
+    metadata: dict[str, Any] = {}
+    for column, keys in METADATA_COLUMNS.items():
+        value = next((parser.attrs[key] for key in keys if key in parser.attrs), None)
+        if column in FLOAT_COLUMNS:
+            metadata[column] = math.nan if value is None else cif_float(value)
+        else:
+            metadata[column] = "" if value is None else str(value)
+    return raman_shift, intensity, metadata
+
+
+def _append(dataset: h5py.Dataset, values: np.ndarray) -> None:
+    start = dataset.shape[0]
+    dataset.resize((start + len(values),))
+    dataset[start:] = values
+
+
+def build_spectral_archive(
+    rod_dir: Path, archive_path: Path | None = None, jobs: int = 1
+) -> tuple[Path, int]:
+    """Parse every .rod file in rod_dir (named after its ROD ID) and write
+    their spectra and metadata into one archive (default:
+    rod_dir/ARCHIVE_FILENAME), replacing any existing one.
+
+    Files that can't be parsed, or have no numeric measured spectrum (e.g.
+    theoretical spectra), are logged and left out.
+
+    Returns:
+        tuple[Path, int]: The archive's path and how many records it holds.
+    """
+    archive_path = archive_path or rod_dir / ARCHIVE_FILENAME
+    rod_files = []
+    for rod_file in rod_dir.glob("*.rod"):
+        if rod_id_of(rod_file) is None:
+            logger.warning(f"Skipping {rod_file}: not named after a ROD ID.")
+        else:
+            rod_files.append(rod_file)
+    rod_files.sort(key=rod_id_of)
+
+    rod_ids: list[int] = []
+    offsets = [0]
+    metadata: dict[str, list] = {column: [] for column in METADATA_COLUMNS}
+    with (
+        atomic_write(archive_path) as partial_path,
+        h5py.File(partial_path, "w") as archive,
+    ):
+        archive.attrs["format"] = ARCHIVE_FORMAT
+        archive.attrs["version"] = ARCHIVE_VERSION
+        spectra = {
+            name: archive.create_dataset(
+                name,
+                shape=(0,),
+                maxshape=(None,),
+                dtype=np.float64,
+                chunks=(CHUNK_SIZE,),
+                compression="gzip",
+                compression_opts=4,
+                shuffle=True,
+            )
+            for name in ("raman_shift", "intensity")
+        }
+
+        for rod_file, record in zip(
+            rod_files, map_rod_files(read_rod_record, rod_files, jobs)
+        ):
+            if isinstance(record, str):
+                logger.warning(f"Leaving {rod_file} out of the archive: {record}")
+                continue
+            raman_shift, intensity, record_metadata = record
+            _append(spectra["raman_shift"], raman_shift)
+            _append(spectra["intensity"], intensity)
+            rod_ids.append(rod_id_of(rod_file))  # type: ignore[arg-type]
+            offsets.append(offsets[-1] + len(raman_shift))
+            for column, value in record_metadata.items():
+                metadata[column].append(value)
+
+        archive.create_dataset("rod_id", data=np.array(rod_ids, dtype=np.int64))
+        archive.create_dataset("offsets", data=np.array(offsets, dtype=np.int64))
+        group = archive.create_group("metadata")
+        for column, values in metadata.items():
+            if column in FLOAT_COLUMNS:
+                group.create_dataset(column, data=np.array(values, dtype=np.float64))
+            else:
+                group.create_dataset(
+                    column, data=values, dtype=h5py.string_dtype(), shape=(len(values),)
+                )
+    return archive_path, len(rod_ids)
+
+
+class SpectralArchive:
+    """
+    Read access to an archive written by build_spectral_archive. Only the
+    ID index and offsets are loaded on opening; spectra and metadata are
+    read on demand.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = h5py.File(path, "r")
+        if self._file.attrs.get("format") != ARCHIVE_FORMAT:
+            self._file.close()
+            raise ValueError(f"{path} is not a spectral archive.")
+        self.rod_ids: np.ndarray = self._file["rod_id"][()]
+        self._offsets: np.ndarray = self._file["offsets"][()]
+        self._index = {int(rod_id): i for i, rod_id in enumerate(self.rod_ids)}
+
+    def __len__(self) -> int:
+        return len(self.rod_ids)
+
+    def __contains__(self, rod_id: object) -> bool:
+        return rod_id in self._index
+
+    def _position(self, rod_id: int) -> int:
+        try:
+            return self._index[rod_id]
+        except KeyError:
+            raise KeyError(f"ROD ID {rod_id} is not in {self.path}.") from None
+
+    def spectrum(self, rod_id: int) -> tuple[np.ndarray, np.ndarray]:
+        """Raman shift and intensity of rod_id."""
+        i = self._position(rod_id)
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._file["raman_shift"][start:end], self._file["intensity"][start:end]
+
+    def spectra(
+        self, rod_ids: Iterable[int] | None = None
+    ) -> Iterator[tuple[int, np.ndarray, np.ndarray]]:
+        """(rod_id, raman_shift, intensity) of rod_ids (default: all), read
+        in bulk when iterating over the whole archive."""
+        if rod_ids is None:
+            raman_shift = self._file["raman_shift"][()]
+            intensity = self._file["intensity"][()]
+            for i, rod_id in enumerate(self.rod_ids):
+                start, end = self._offsets[i], self._offsets[i + 1]
+                yield int(rod_id), raman_shift[start:end], intensity[start:end]
+            return
+        for rod_id in rod_ids:
+            yield rod_id, *self.spectrum(rod_id)
+
+    def metadata(self, rod_id: int) -> dict[str, Any]:
+        i = self._position(rod_id)
+        return {
+            column: _from_hdf5(self._file["metadata"][column][i])
+            for column in self._file["metadata"]
+        }
+
+    def metadata_table(self) -> dict[str, np.ndarray]:
+        """Every metadata column, aligned with self.rod_ids."""
+        group = self._file["metadata"]
+        return {
+            column: (
+                group[column].asstr()[()]
+                if h5py.check_string_dtype(group[column].dtype)
+                else group[column][()]
+            )
+            for column in group
+        }
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "SpectralArchive":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def _from_hdf5(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if isinstance(value, np.floating):
+        return float(value)
+    return value
+
+
+@click.command("build-spectral-archive")
+@click.argument(
+    "rod_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=DEFAULT_ROD_BATCH_DIR,
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help=f"Archive file to write (default: {ARCHIVE_FILENAME} inside ROD_DIR).",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes parsing .rod files.",
+)
+def build_spectral_archive_cli(rod_dir: Path, output: Path | None, jobs: int):
+    """Store the spectra of all .rod files in ROD_DIR in one HDF5 archive.
+
+    Every file is parsed once; its spectrum, plus formula, mineral name,
+    laser wavelength and COD code, is stored compressed for fast access by
+    ROD ID.
+
+    ROD_DIR: directory containing .rod files (default: rod_batch).
+    """
+    archive_path, n_records = build_spectral_archive(rod_dir, output, jobs=jobs)
+    click.echo(f"Archived {n_records} spectra in {archive_path}.")
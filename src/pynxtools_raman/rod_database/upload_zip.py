@@ -0,0 +1,128 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Packs a batch's files into size-capped ZIP shards, ready for NOMAD upload.
+
+Files are added one at a time while the batch is being built, so each file
+is written into the archive right after it is produced instead of in a
+separate pass over the finished batch directory. Every shard gets the same
+root-level files (nomad.json), so each one is a complete upload on its own.
+"""
+
+import logging
+import zipfile
+from pathlib import Path
+from types import TracebackType
+
+logger = logging.getLogger(__file__)
+
+# NOMAD's default limit on the size of a single upload.
+NOMAD_UPLOAD_SIZE_LIMIT = 32 * 1024**3
+
+# Per-member bytes a ZIP archive spends on top of the (compressed) data: the
+# local file header and central directory record, including ZIP64 extras,
+# excluding the member name itself.
+_ZIP_MEMBER_OVERHEAD = 30 + 46 + 2 * 32
+
+
+class ShardedUploadZip:
+    """
+    Writes files into ZIP archives named "<stem>-001.zip", "<stem>-002.zip",
+    ... next to base_path, starting a new shard whenever the next group of
+    files could push the current one past max_shard_bytes.
+
+    Sizes are estimated from the uncompressed input, so a shard never
+    exceeds the cap unless a single group of files does on its own.
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        max_shard_bytes: int = NOMAD_UPLOAD_SIZE_LIMIT,
+        root_files: dict[str, str] | None = None,
+    ):
+        self.base_path = base_path
+        self.max_shard_bytes = max_shard_bytes
+        self.root_files = root_files or {}
+        self.shards: list[Path] = []
+        self._zip: zipfile.ZipFile | None = None
+        self._shard_bytes = 0
+        self._shard_members = 0
+
+    def __enter__(self) -> "ShardedUploadZip":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def add(self, *paths: Path) -> None:
+        """Add paths (by file name, at the archive root) to the same shard."""
+        group_bytes = sum(
+            _member_bytes(path.name, path.stat().st_size) for path in paths
+        )
+        zip_file = self._zip
+        if zip_file is None or (
+            self._shard_members
+            and self._shard_bytes + group_bytes > self.max_shard_bytes
+        ):
+            zip_file = self._open_next_shard()
+        if self._shard_bytes + group_bytes > self.max_shard_bytes:
+            logger.warning(
+                f"{', '.join(path.name for path in paths)} alone exceed(s) the "
+                f"maximum shard size of {self.max_shard_bytes} bytes."
+            )
+
+        for path in paths:
+            zip_file.write(path, arcname=path.name)
+        self._shard_bytes += group_bytes
+        self._shard_members += 1
+
+    def close(self) -> list[Path]:
+        """Finish the current shard; returns the paths of all shards."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        return self.shards
+
+    def _open_next_shard(self) -> zipfile.ZipFile:
+        self.close()
+        shard_path = self.base_path.with_name(
+            f"{self.base_path.stem}-{len(self.shards) + 1:03d}.zip"
+        )
+        shard_path.parent.mkdir(parents=True, exist_ok=True)
+        zip_file = zipfile.ZipFile(
+            shard_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+        )
+        self._zip = zip_file
+        self.shards.append(shard_path)
+        self._shard_bytes = 0
+        self._shard_members = 0
+        for name, text in self.root_files.items():
+            zip_file.writestr(name, text)
+            self._shard_bytes += _member_bytes(name, len(text.encode("utf-8")))
+        return zip_file
+
+
+def _member_bytes(name: str, size: int) -> int:
+    """Upper estimate of what a file of size bytes adds to an archive.
+    Deflate can grow incompressible data very slightly, hence the margin."""
+    return size + size // 1000 + _ZIP_MEMBER_OVERHEAD + 2 * len(name.encode("utf-8"))
@@ -0,0 +1,235 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Opt-in per-stage timing of conversions.
+
+Stages (parsing, post-processing, template filling, validation, writing,
+downloading, ...) are wrapped in timed(), which does nothing unless a sink
+is registered. With one registered, each stage emits a record such as
+
+    {"stage": "parse", "files": ["1000679.rod"], "bytes": 27411,
+     "seconds": 0.0123}
+
+to every sink: any callable taking the record, e.g. a JsonLinesSink writing
+one JSON object per line, or a StageTimings collecting them for a summary.
+Stages can be nested; a record is emitted when its stage ends. Sinks may be
+called from several threads at once (e.g. by concurrent downloads).
+"""
+
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+__all__ = [
+    "JsonLinesSink",
+    "StageTimings",
+    "add_timing_sink",
+    "collecting_timings",
+    "emit_timing",
+    "recording_timings",
+    "remove_timing_sink",
+    "timed",
+    "timing_enabled",
+]
+
+TimingSink = Callable[[dict[str, Any]], None]
+
+_SINKS: list[TimingSink] = []
+
+
+def add_timing_sink(sink: TimingSink) -> None:
+    """Send the records of all timed stages (in this process) to sink."""
+    _SINKS.append(sink)
+
+
+def remove_timing_sink(sink: TimingSink) -> None:
+    if sink in _SINKS:
+        _SINKS.remove(sink)
+
+
+def timing_enabled() -> bool:
+    return bool(_SINKS)
+
+
+@contextmanager
+def recording_timings(sink: TimingSink) -> Iterator[TimingSink]:
+    """Register sink for the duration of the with-block."""
+    add_timing_sink(sink)
+    try:
+        yield sink
+    finally:
+        remove_timing_sink(sink)
+
+
+@contextmanager
+def collecting_timings() -> Iterator[list[dict[str, Any]]]:
+    """
+    Collect the records of the with-block into a list instead of sending
+    them to the registered sinks - e.g. in a worker process, which inherits
+    (copies of) its parent's sinks but whose records the parent should
+    handle, via emit_timing.
+    """
+    records: list[dict[str, Any]] = []
+    saved = _SINKS[:]
+    _SINKS[:] = [records.append]
+    try:
+        yield records
+    finally:
+        _SINKS[:] = saved
+
+
+def emit_timing(record: dict[str, Any]) -> None:
+    """Send a record to all registered sinks."""
+    for sink in list(_SINKS):
+        sink(record)
+
+
+def _total_size(paths: list[Path]) -> int | None:
+    sizes = []
+    for path in paths:
+        try:
+            sizes.append(path.stat().st_size)
+        except OSError:
+            pass
+    return sum(sizes) if sizes else None
+
+
+@contextmanager
+def timed(stage: str, *files: str | Path | None) -> Iterator[dict[str, Any]]:
+    """
+    Time the with-block as `stage` of processing `files` (None entries are
+    ignored), whose total size is recorded as well - taken when the stage
+    ends, so files it writes count too.
+
+    Yields the record to be emitted, so the block can add to it; it is
+    emitted whether or not the block raises.
+    """
+    if not _SINKS:
+        yield {}
+        return
+
+    paths = [Path(file) for file in files if file is not None]
+    record: dict[str, Any] = {"stage": stage}
+    if paths:
+        record["files"] = [path.name for path in paths]
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        if paths and "bytes" not in record:
+            n_bytes = _total_size(paths)
+            if n_bytes is not None:
+                record["bytes"] = n_bytes
+        emit_timing(record)
+
+
+class JsonLinesSink:
+    """Appends every record to a file, as one JSON object per line."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "JsonLinesSink":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of a non-empty, sorted list."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class StageTimings:
+    """Collects records and summarizes them per stage."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, list[float]] = defaultdict(list)
+        self.bytes: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def __call__(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            self.seconds[record["stage"]].append(record["seconds"])
+            self.bytes[record["stage"]] += record.get("bytes", 0)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Count, total, p50 and p95 of the seconds per stage, and the
+        total bytes, in the order the stages first ended."""
+        summary = {}
+        for stage, seconds in self.seconds.items():
+            ordered = sorted(seconds)
+            summary[stage] = {
+                "count": len(ordered),
+                "total": sum(ordered),
+                "p50": _percentile(ordered, 50),
+                "p95": _percentile(ordered, 95),
+                "bytes": self.bytes[stage],
+            }
+        return summary
+
+    def format_table(self) -> str:
+        """The summary as a plain-text table."""
+        header = ("Stage", "Count", "Total [s]", "p50 [s]", "p95 [s]", "Bytes")
+        rows = [
+            (
+                stage,
+                f"{stats['count']}",
+                f"{stats['total']:.3f}",
+                f"{stats['p50']:.4f}",
+                f"{stats['p95']:.4f}",
+                f"{stats['bytes']}",
+            )
+            for stage, stats in self.summary().items()
+        ]
+        widths = [
+            max(len(row[column]) for row in (header, *rows))
+            for column in range(len(header))
+        ]
+        return "\n".join(
+            "  ".join(
+                [row[0].ljust(widths[0])]
+                + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+            )
+            for row in (header, *rows)
+        )
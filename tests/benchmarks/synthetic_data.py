@@ -0,0 +1,110 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Synthetic WITec exports and ROD records of configurable size, built from
+the files in examples/, and helpers recording extra benchmark metrics.
+
+The benchmarks need pytest-benchmark and only run when benchmarking is
+explicitly asked for (--benchmark-only or --benchmark-enable), so a plain
+`pytest tests` stays fast. See docs/tutorial/contributing.md.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# pytestmark of every benchmark module
+opt_in = pytest.mark.skipif(
+    "not (config.getoption('benchmark_only', False)"
+    " or config.getoption('benchmark_enable', False))",
+    reason="use --benchmark-only to run the benchmarks",
+)
+
+EXAMPLES_DIR = Path(__file__).parents[2] / "examples"
+WITEC_EXAMPLE = EXAMPLES_DIR / "witec" / "txt" / "Si-wafer-Raman-Spectrum-1.txt"
+WITEC_ELN = EXAMPLES_DIR / "witec" / "txt" / "eln_data.yaml"
+ROD_EXAMPLE = EXAMPLES_DIR / "database" / "rod" / "rod_file_1000679.rod"
+
+# The spectrum loop closes every ROD record; extra tags go right before it.
+_ROD_SPECTRUM_LOOP = "loop_\n_raman_spectrum.raman_shift\n_raman_spectrum.intensity\n"
+
+
+def _synthetic_spectrum(n_points: int) -> tuple[np.ndarray, np.ndarray]:
+    """A reproducible spectrum: a few Lorentzian peaks on a noisy baseline."""
+    rng = np.random.default_rng(n_points)
+    x = np.linspace(50.0, 1400.0, n_points)
+    y = 300.0 + rng.normal(0.0, 5.0, n_points)
+    for center in (464.0, 520.0, 980.0):
+        y += 1e4 / (1.0 + ((x - center) / 4.0) ** 2)
+    return x, y
+
+
+def write_witec_export(path: Path, n_points: int) -> Path:
+    """A WITec Alpha export with the example's header and n_points rows."""
+    header_lines = []
+    with open(WITEC_EXAMPLE, encoding="utf-8") as example:
+        for line in example:
+            header_lines.append(line)
+            if line.startswith("[Data]"):
+                # column names and units
+                header_lines += [next(example), next(example)]
+                break
+
+    x, y = _synthetic_spectrum(n_points)
+    with open(path, "w", encoding="utf-8") as export:
+        export.writelines(header_lines)
+        np.savetxt(export, np.column_stack((x, y)), fmt=" %.9E", delimiter=",")
+    return path
+
+
+def write_rod_record(path: Path, n_points: int, extra_tags: int = 0) -> Path:
+    """
+    A ROD record with the example's metadata, extra_tags additional
+    "_[local]_..." tags and a spectrum loop of n_points rows.
+    """
+    metadata = ROD_EXAMPLE.read_text(encoding="utf-8").split(_ROD_SPECTRUM_LOOP)[0]
+    x, y = _synthetic_spectrum(n_points)
+    with open(path, "w", encoding="utf-8") as record:
+        record.write(metadata)
+        record.writelines(
+            f"_[local]_benchmark_tag_{i:04d} 'value {i}'\n" for i in range(extra_tags)
+        )
+        record.write(_ROD_SPECTRUM_LOOP)
+        np.savetxt(record, np.column_stack((x, y)), fmt="%.3f %.1f")
+    return path
+
+
+def record_peak_memory(benchmark, function: Callable[[], object]) -> None:
+    """Run function once more under tracemalloc and store its peak memory
+    in the benchmark's extra_info (outside of the timed rounds)."""
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_memory_mib"] = round(peak / 1024**2, 2)
+
+
+def record_throughput(benchmark, n_files: int) -> None:
+    """Store end-to-end files/second (of the mean round) in extra_info."""
+    benchmark.extra_info["files_per_second"] = round(
+        n_files / benchmark.stats.stats.mean, 2
+    )
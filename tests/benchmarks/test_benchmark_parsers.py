@@ -0,0 +1,98 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Parse-time and peak-memory benchmarks for the WITec and ROD parsers."""
+
+import pytest
+from synthetic_data import (
+    opt_in,
+    record_peak_memory,
+    write_rod_record,
+    write_witec_export,
+)
+
+from pynxtools_raman.parsers.rod import RodParser
+from pynxtools_raman.parsers.witec import WitecParser
+
+pytestmark = opt_in
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("benchmark_data")
+
+
+@pytest.fixture(scope="module", params=[1_000, 100_000, 1_000_000])
+def witec_export(request, data_dir):
+    return write_witec_export(data_dir / f"witec_{request.param}.txt", request.param)
+
+
+@pytest.fixture(
+    scope="module",
+    params=[(1_000, 10), (10_000, 100), (100_000, 1000)],
+    ids=["1000pts-10tags", "10000pts-100tags", "100000pts-1000tags"],
+)
+def rod_record(request, data_dir):
+    n_points, extra_tags = request.param
+    return write_rod_record(
+        data_dir / f"rod_{n_points}_{extra_tags}.rod",
+        n_points,
+        extra_tags,
+    )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"use_mmap": True}, {"metadata_only": True}],
+    ids=["lines", "mmap", "metadata"],
+)
+def test_witec_parse(benchmark, witec_export, options):
+    benchmark.group = f"witec-parse-{witec_export.stem}"
+
+    def parse():
+        WitecParser().parse(witec_export, **options)
+
+    benchmark(parse)
+    record_peak_memory(benchmark, parse)
+
+
+def test_rod_extract_keys_and_values(benchmark, rod_record):
+    benchmark.group = f"rod-extract-{rod_record.stem}"
+
+    def loaded_parser():
+        parser = RodParser()
+        parser.get_cif_file_content(rod_record)
+        return (parser,), {}
+
+    benchmark.pedantic(
+        RodParser.extract_keys_and_values_from_cif,
+        setup=loaded_parser,
+        rounds=10,
+    )
+    parser = loaded_parser()[0][0]
+    record_peak_memory(benchmark, parser.extract_keys_and_values_from_cif)
+
+
+@pytest.mark.parametrize("metadata_only", [False, True], ids=["full", "metadata"])
+def test_rod_parse(benchmark, rod_record, metadata_only):
+    benchmark.group = f"rod-parse-{rod_record.stem}"
+
+    def parse():
+        RodParser().parse(rod_record, metadata_only=metadata_only)
+
+    benchmark(parse)
+    record_peak_memory(benchmark, parse)
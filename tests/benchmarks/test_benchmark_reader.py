@@ -0,0 +1,84 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""End-to-end benchmarks: RamanReader.read and convert_rod_files."""
+
+import shutil
+
+import pytest
+from synthetic_data import (
+    WITEC_ELN,
+    opt_in,
+    record_peak_memory,
+    record_throughput,
+    write_rod_record,
+    write_witec_export,
+)
+
+from pynxtools_raman.reader import RamanReader
+from pynxtools_raman.rod_database.rod_batch import convert_rod_files
+
+pytestmark = opt_in
+
+BATCH_SIZE = 8
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("benchmark_data")
+
+
+@pytest.mark.parametrize("n_points", [1_000, 100_000])
+def test_read_witec(benchmark, data_dir, n_points):
+    export = write_witec_export(data_dir / f"read_witec_{n_points}.txt", n_points)
+
+    def read():
+        RamanReader().read(file_paths=(str(export), str(WITEC_ELN)))
+
+    benchmark(read)
+    record_peak_memory(benchmark, read)
+    record_throughput(benchmark, 1)
+
+
+@pytest.mark.parametrize("n_points", [1_000, 100_000])
+def test_read_rod(benchmark, data_dir, n_points):
+    record = write_rod_record(data_dir / f"read_rod_{n_points}.rod", n_points)
+
+    def read():
+        RamanReader().read(file_paths=(str(record),))
+
+    benchmark(read)
+    record_peak_memory(benchmark, read)
+    record_throughput(benchmark, 1)
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_convert_rod_files(benchmark, tmp_path, jobs):
+    input_dir = tmp_path / "rod"
+    input_dir.mkdir()
+    for i in range(BATCH_SIZE):
+        write_rod_record(input_dir / f"{1000000 + i}.rod", 2_000, extra_tags=i)
+
+    def convert():
+        output_dir = tmp_path / "nxs"
+        shutil.rmtree(output_dir, ignore_errors=True)
+        return (input_dir, output_dir), {"jobs": jobs}
+
+    outputs = benchmark.pedantic(convert_rod_files, setup=convert, rounds=3)
+
+    assert len(outputs) == BATCH_SIZE
+    record_throughput(benchmark, BATCH_SIZE)
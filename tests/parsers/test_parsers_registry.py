@@ -0,0 +1,185 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the content-sniffing parser registry."""
+
+from pathlib import Path
+
+import pytest
+
+from pynxtools_raman.parsers import RodParser, WitecParser, registry
+from pynxtools_raman.parsers.base import _RamanParser
+from pynxtools_raman.parsers.registry import (
+    find_parser,
+    register_parser,
+    registered_parsers,
+    supported_extensions,
+)
+
+ROD_FIXTURE = Path(__file__).parents[1] / "data" / "rod" / "rod_file_1000679.rod"
+WITEC_FIXTURE = (
+    Path(__file__).parents[1] / "data" / "witec" / "Si-wafer-Raman-Spectrum-1.txt"
+)
+
+
+class _CsvParser(_RamanParser):
+    """Minimal extra parser: any .txt file starting with "x,y"."""
+
+    supported_file_extensions = (".txt",)
+    config_file = "config_file_csv.json"
+
+    def matches_file(self, file: Path) -> bool:
+        return self.read_head(file).startswith(b"x,y")
+
+    def _parse(self, file: Path, **kwargs) -> None:
+        self.data = {"data/x_values": [], "data/y_values": []}
+
+
+@pytest.fixture(autouse=True)
+def no_earlier_verdicts(monkeypatch):
+    monkeypatch.setattr(registry, "_VERDICTS", {})
+
+
+@pytest.fixture
+def csv_parser(monkeypatch):
+    monkeypatch.setattr(registry, "_EXTRA_PARSERS", [])
+    return register_parser(_CsvParser)
+
+
+class TestFindParser:
+    def test_dispatches_rod_fixture(self):
+        assert isinstance(find_parser(ROD_FIXTURE), RodParser)
+
+    def test_dispatches_witec_fixture(self):
+        assert isinstance(find_parser(WITEC_FIXTURE), WitecParser)
+
+    def test_dispatch_is_by_content_not_extension(self, tmp_path):
+        renamed = tmp_path / "export.txt"
+        renamed.write_bytes(ROD_FIXTURE.read_bytes())
+
+        assert find_parser(renamed) is None
+
+    def test_unsupported_extension(self, tmp_path):
+        other = tmp_path / "spectrum.csv"
+        other.write_text("[Header]\n[Data]\n")
+
+        assert find_parser(other) is None
+
+    def test_unreadable_file(self, tmp_path, caplog):
+        assert find_parser(tmp_path / "missing.txt") is None
+        assert "Could not read" in caplog.text
+
+    def test_found_parser_parses_without_checking_again(self, monkeypatch):
+        parser = find_parser(WITEC_FIXTURE)
+        assert parser is not None
+        monkeypatch.setattr(
+            WitecParser,
+            "matches_file",
+            lambda self, file: pytest.fail("matches_file called again"),
+        )
+
+        parser.parse(WITEC_FIXTURE)
+
+        assert len(parser.data["data/x_values"]) > 0
+
+    def test_head_is_read_once_for_all_candidates(
+        self, tmp_path, monkeypatch, csv_parser
+    ):
+        export = tmp_path / "export.txt"
+        export.write_text("x,y\n1,2\n")
+        opened: list[Path] = []
+        original_open = open
+
+        def counting_open(file, *args, **kwargs):
+            opened.append(Path(file))
+            return original_open(file, *args, **kwargs)
+
+        monkeypatch.setattr("builtins.open", counting_open)
+
+        # WitecParser is tried (and rejects it) first, from the same head.
+        assert isinstance(find_parser(export), _CsvParser)
+        assert opened == [export]
+
+    def test_rod_file_is_read_once_for_check_and_parse(self, monkeypatch):
+        reads: list[Path] = []
+        original_open = open
+        original_read_bytes = Path.read_bytes
+
+        def counting_open(file, *args, **kwargs):
+            reads.append(Path(file))
+            return original_open(file, *args, **kwargs)
+
+        def counting_read_bytes(path):
+            reads.append(path)
+            return original_read_bytes(path)
+
+        monkeypatch.setattr("builtins.open", counting_open)
+        monkeypatch.setattr(Path, "read_bytes", counting_read_bytes)
+
+        parser = find_parser(ROD_FIXTURE)
+        assert parser is not None
+        parser.parse(ROD_FIXTURE)
+
+        assert reads == [ROD_FIXTURE]
+        assert parser.data["_raman_spectrum.raman_shift"][0] == 50.0
+
+    def test_verdicts_are_remembered_per_modification(self, tmp_path, monkeypatch):
+        export = tmp_path / "export.txt"
+        export.write_bytes(WITEC_FIXTURE.read_bytes())
+        checked: list[Path] = []
+        original_matches_file = WitecParser.matches_file
+
+        def counting_matches_file(parser, file):
+            checked.append(file)
+            return original_matches_file(parser, file)
+
+        monkeypatch.setattr(WitecParser, "matches_file", counting_matches_file)
+
+        assert isinstance(find_parser(export), WitecParser)
+        parser = find_parser(export)
+        assert isinstance(parser, WitecParser)
+        parser.parse(export)
+        assert len(parser.data["data/x_values"]) > 0
+        assert checked == [export]
+
+        export.write_bytes(ROD_FIXTURE.read_bytes())
+
+        assert find_parser(export) is None
+        assert checked == [export, export]
+
+    def test_registering_a_parser_forgets_the_verdicts(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(registry, "_EXTRA_PARSERS", [])
+        export = tmp_path / "export.txt"
+        export.write_text("x,y\n1,2\n")
+        assert find_parser(export) is None
+
+        register_parser(_CsvParser)
+
+        assert isinstance(find_parser(export), _CsvParser)
+
+
+class TestRegisterParser:
+    def test_extra_parsers_come_after_builtins(self, csv_parser):
+        assert registered_parsers() == [RodParser, WitecParser, _CsvParser]
+
+    def test_registering_twice_is_a_no_op(self, csv_parser):
+        register_parser(_CsvParser)
+
+        assert registered_parsers().count(_CsvParser) == 1
+
+    def test_supported_extensions(self, csv_parser):
+        assert supported_extensions() == [".rod", ".txt"]
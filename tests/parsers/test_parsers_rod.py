@@ -17,15 +17,20 @@
 #
 """Tests for the ROD (.rod / CIF-based) parser."""
 
+import math
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from pynxtools_raman.parsers.rod import (
+    ROD_SPECTRUM_DATA_KEYS,
     RodParser,
     _join_authors,
+    _loop_values_to_array,
     _strip_cif_quotes,
     build_citation_fields,
+    cif_float,
 )
 
 ROD_FIXTURE = Path(__file__).parents[1] / "data" / "rod" / "rod_file_1000679.rod"
@@ -81,20 +86,96 @@ class TestRodParser:
             "'Zhang, Q.'",
         ]
 
-    def test_numeric_loop_is_parsed_as_floats(self, parsed_rod_data):
+    def test_numeric_loop_is_parsed_as_float_array(self, parsed_rod_data):
         shifts = parsed_rod_data["_raman_spectrum.raman_shift"]
         intensities = parsed_rod_data["_raman_spectrum.intensity"]
 
-        assert shifts[:3] == [50.0, 51.262, 52.523]
-        assert intensities[:3] == [429.0, 438.0, 441.0]
-        assert all(isinstance(value, float) for value in shifts)
+        assert isinstance(shifts, np.ndarray)
+        assert shifts.dtype == np.float64
+        assert shifts[:3].tolist() == [50.0, 51.262, 52.523]
+        assert intensities[:3].tolist() == [429.0, 438.0, 441.0]
         assert len(shifts) == len(intensities) == 1159
 
+
+class TestLoopValuesToArray:
+    """_loop_values_to_array: numeric CIF loop columns -> float64 arrays."""
+
+    def test_plain_numbers(self):
+        values = _loop_values_to_array(["1", "2.5", "-3e2"])
+        assert values.dtype == np.float64
+        assert values.tolist() == [1.0, 2.5, -300.0]
+
+    def test_uncertainties_are_stripped(self):
+        values = _loop_values_to_array(["1.23(4)", "5.6", "7(12)"])
+        assert values.tolist() == [1.23, 5.6, 7.0]
+
+    @pytest.mark.parametrize(
+        "values", [["1.0", "abc"], ["1.0", "?"], ["1.2(x)"], ["1.2(3"]]
+    )
+    def test_non_numeric_columns_raise(self, values):
+        with pytest.raises(ValueError):
+            _loop_values_to_array(values)
+
+    @pytest.mark.parametrize(
+        "value, expected", [("9.40(3)", 9.4), ("785", 785.0), (14, 14.0)]
+    )
+    def test_cif_float(self, value, expected):
+        assert cif_float(value) == expected
+
+    @pytest.mark.parametrize("value", ["?", ".", "P 1 21/c 1", None])
+    def test_cif_float_of_non_numbers_is_nan(self, value):
+        assert math.isnan(cif_float(value))
+
     def test_rod_and_publication_identifiers_are_parsed(self, parsed_rod_data):
         assert parsed_rod_data["_rod_database.code"] == "1000679"
         assert parsed_rod_data["_journal_paper_doi"] == "10.2465/jmps.111020i"
 
 
+class TestRodKeyScan:
+    """RodParser.get_keys_and_loop_boolean: the key -> is-in-a-loop map."""
+
+    def test_loop_and_pair_keys_of_real_fixture(self):
+        parser = RodParser()
+        parser.get_cif_file_content(str(ROD_FIXTURE))
+
+        keys = parser.get_keys_and_loop_boolean()
+
+        assert keys["_publ_author_name"] is True
+        assert keys["_raman_spectrum.raman_shift"] is True
+        assert keys["_raman_spectrum.intensity"] is True
+        assert keys["_journal_year"] is False
+        assert keys["_[local]_chemical_compound_color"] is False
+        assert keys["_publ_section_title"] is False
+
+    def test_keys_are_returned_in_file_order(self):
+        parser = RodParser()
+        parser.get_cif_file_content(str(ROD_FIXTURE))
+
+        keys = list(parser.get_keys_and_loop_boolean())
+
+        assert keys[0] == "_publ_author_name"
+        assert keys[-2:] == ["_raman_spectrum.raman_shift", "_raman_spectrum.intensity"]
+
+    def test_loop_with_more_than_100_columns(self, tmp_path):
+        tags = [f"_wide_loop.column_{index}" for index in range(150)]
+        rod_file = tmp_path / "wide.rod"
+        rod_file.write_text(
+            "data_wide\n_single_key value\nloop_\n"
+            + "".join(f"{tag}\n" for tag in tags)
+            + " ".join(str(index) for index in range(150))
+            + "\n",
+            encoding="utf-8",
+        )
+        parser = RodParser()
+        parser.get_cif_file_content(str(rod_file))
+
+        keys = parser.get_keys_and_loop_boolean()
+
+        assert keys["_single_key"] is False
+        assert all(keys[tag] is True for tag in tags)
+        assert parser.extract_keys_and_values_from_cif()[tags[120]] == [120.0]
+
+
 class TestCifQuoteHelpers:
     @pytest.mark.parametrize(
         "raw, expected",
@@ -231,6 +312,80 @@ class TestRodParserMatchesFile:
         assert RodParser.is_mainfile(tmp_path / "does_not_exist.rod") is False
 
 
+class TestRodParserMetadataOnly:
+    def test_attrs_match_a_full_parse(self):
+        full = RodParser()
+        full.parse(ROD_FIXTURE)
+        metadata_only = RodParser()
+        metadata_only.parse(ROD_FIXTURE, metadata_only=True)
+
+        assert metadata_only.attrs == full.attrs
+        assert metadata_only.unused_attrs == full.unused_attrs
+        assert metadata_only.data == {}
+
+    def test_spectrum_loop_is_not_extracted(self, monkeypatch):
+        extracted: list[str] = []
+        original = RodParser.get_cif_value_from_key
+
+        def recording_get_value(self, value_key, is_cif_loop_value=False):
+            extracted.append(value_key)
+            return original(self, value_key, is_cif_loop_value)
+
+        monkeypatch.setattr(RodParser, "get_cif_value_from_key", recording_get_value)
+
+        RodParser().parse(ROD_FIXTURE, metadata_only=True)
+
+        assert "_publ_author_name" in extracted
+        assert not set(extracted) & set(ROD_SPECTRUM_DATA_KEYS)
+
+
+class TestRodParserSingleRead:
+    """Checking and parsing a .rod file should read it from disk only once."""
+
+    def _count_reads(self, monkeypatch) -> list[Path]:
+        reads: list[Path] = []
+        original_read_bytes = Path.read_bytes
+
+        def counting_read_bytes(path):
+            reads.append(path)
+            return original_read_bytes(path)
+
+        monkeypatch.setattr(Path, "read_bytes", counting_read_bytes)
+        return reads
+
+    def test_check_then_parse_reads_file_once(self, monkeypatch):
+        reads = self._count_reads(monkeypatch)
+        parser = RodParser()
+
+        assert parser.check_mainfile(ROD_FIXTURE) is True
+        parser.parse(ROD_FIXTURE)
+
+        assert reads == [ROD_FIXTURE]
+        assert parser.data["_raman_spectrum.raman_shift"][0] == 50.0
+
+    def test_parse_without_check_reads_file_once(self, monkeypatch):
+        reads = self._count_reads(monkeypatch)
+
+        RodParser().parse(ROD_FIXTURE)
+
+        assert reads == [ROD_FIXTURE]
+
+    def test_content_is_released_after_parse(self):
+        parser = RodParser()
+        parser.parse(ROD_FIXTURE)
+
+        assert parser._content is None
+
+    def test_failed_check_is_not_cached(self, tmp_path):
+        bogus = tmp_path / "bogus.rod"
+        bogus.write_text("not a cif file\n", encoding="utf-8")
+        parser = RodParser()
+
+        assert parser.check_mainfile(bogus) is False
+        with pytest.raises(ValueError):
+            parser.parse(bogus)
+
+
 class TestPostProcessRod:
     """RodParser.post_process, exercised directly against a parser instance
     with attrs/unused_attrs set up by hand rather than via a real .rod file.
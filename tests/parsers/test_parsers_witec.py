@@ -19,8 +19,10 @@
 
 from pathlib import Path
 
+import numpy as np
 import pytest
 
+from pynxtools_raman.parsers import witec
 from pynxtools_raman.parsers.witec import WitecParser
 
 WITEC_FIXTURE = (
@@ -39,6 +41,25 @@ class TestWitecParserMatchesFile:
     def test_does_not_match_nonexistent_file(self, tmp_path):
         assert WitecParser.is_mainfile(tmp_path / "does_not_exist.txt") is False
 
+    @staticmethod
+    def _export_with_long_header(tmp_path, header_lines: int) -> Path:
+        header, data = WITEC_FIXTURE.read_text().split("[Data]")
+        comment = "// " + "x" * 400 + "\n"
+        export = tmp_path / "long_header.txt"
+        export.write_text(header + comment * header_lines + "[Data]" + data)
+        return export
+
+    def test_matches_a_header_longer_than_the_head(self, tmp_path):
+        export = self._export_with_long_header(tmp_path, 30)
+
+        assert export.read_bytes().index(b"[Data]") > witec.HEAD_SIZE
+        assert WitecParser.is_mainfile(export) is True
+
+    def test_data_section_must_start_within_match_lines(self, tmp_path):
+        export = self._export_with_long_header(tmp_path, witec.MATCH_LINES)
+
+        assert WitecParser.is_mainfile(export) is False
+
 
 class TestWitecParserParse:
     """WitecParser._parse against the real shipped fixture."""
@@ -69,6 +90,209 @@ class TestWitecParserParse:
         assert "data/x_values" not in parsed.unused_attrs
 
 
+class TestWitecParserMetadataOnly:
+    def test_attrs_match_a_full_parse(self):
+        full = WitecParser()
+        full.parse(WITEC_FIXTURE)
+        header_only = WitecParser()
+        header_only.parse(WITEC_FIXTURE, metadata_only=True)
+
+        assert header_only.attrs == full.attrs
+        assert header_only.unused_attrs == full.unused_attrs
+        assert header_only.data == {}
+
+    def test_data_section_is_not_read(self, tmp_path):
+        export = tmp_path / "export.txt"
+        export.write_text(
+            "[Header]\nXAxisUnit = nm\n\n[Data]\nX-Axis,Y\nnm,counts\nnot, numeric\n",
+            encoding="utf-8",
+        )
+        parser = WitecParser()
+
+        parser.parse(export, metadata_only=True)
+
+        assert parser.attrs == {"XAxisUnit": "nm"}
+
+
+class TestWitecParserDataEngine:
+    """The vectorized [Data] loader and its line-by-line fallback."""
+
+    def _write_export(self, tmp_path, data_rows: list[str]):
+        export = tmp_path / "export.txt"
+        export.write_text(
+            "//Exported ASCII-File\n"
+            "[Header]\n"
+            "XAxisUnit = nm\n"
+            "DataUnit = CCD cts\n"
+            "\n"
+            "[Data]\n"
+            "X-Axis,Spectrum\n"
+            "nm,CCD cts\n" + "".join(f"{row}\n" for row in data_rows),
+            encoding="utf-8",
+        )
+        return export
+
+    def test_data_arrays_are_contiguous_float64(self):
+        parser = WitecParser()
+        parser.parse(WITEC_FIXTURE)
+
+        for key in ("data/x_values", "data/y_values"):
+            values = parser.data[key]
+            assert isinstance(values, np.ndarray)
+            assert values.dtype == np.float64
+            assert values.flags["C_CONTIGUOUS"]
+
+    def test_values_match_the_export(self, tmp_path):
+        export = self._write_export(tmp_path, [" 1.5E+02, 3.0", " 2.5E+02, 4.0"])
+        parser = WitecParser()
+        parser.parse(export)
+
+        assert parser.data["data/x_values"].tolist() == [150.0, 250.0]
+        assert parser.data["data/y_values"].tolist() == [3.0, 4.0]
+
+    def test_malformed_rows_fall_back_to_line_parsing(self, tmp_path, caplog):
+        export = self._write_export(
+            tmp_path, [" 1.0, 3.0", "-- interrupted --", " 2.0, 4.0"]
+        )
+        parser = WitecParser()
+        parser.parse(export)
+
+        assert parser.data["data/x_values"].tolist() == [1.0, 2.0]
+        assert parser.data["data/y_values"].tolist() == [3.0, 4.0]
+        assert "falling back to line-by-line parsing" in caplog.text
+
+
+class TestWitecParserStreaming:
+    """Streaming mode: the [Data] section read in fixed-size row chunks."""
+
+    def test_streaming_matches_full_read(self, monkeypatch):
+        monkeypatch.setattr(witec, "STREAM_CHUNK_ROWS", 7)
+        full = WitecParser()
+        full.parse(WITEC_FIXTURE, streaming=False)
+        streamed = WitecParser()
+        streamed.parse(WITEC_FIXTURE, streaming=True)
+
+        for key in ("data/x_values", "data/y_values"):
+            np.testing.assert_array_equal(streamed.data[key], full.data[key])
+            assert streamed.data[key].flags["C_CONTIGUOUS"]
+        assert streamed.attrs == full.attrs
+
+    def test_large_files_stream_by_default(self, monkeypatch):
+        chunks = []
+        real_load = witec._load_data_block
+
+        def recording_load(data_lines):
+            chunks.append(len(data_lines))
+            return real_load(data_lines)
+
+        monkeypatch.setattr(witec, "_load_data_block", recording_load)
+        monkeypatch.setattr(witec, "STREAMING_THRESHOLD_BYTES", 1)
+        monkeypatch.setattr(witec, "STREAM_CHUNK_ROWS", 500)
+
+        WitecParser().parse(WITEC_FIXTURE)
+
+        assert len(chunks) > 1
+        assert max(chunks) == 500
+
+    def test_malformed_chunk_falls_back_in_streaming_mode(
+        self, tmp_path, monkeypatch, caplog
+    ):
+        monkeypatch.setattr(witec, "STREAM_CHUNK_ROWS", 2)
+        export = tmp_path / "export.txt"
+        export.write_text(
+            "[Header]\nXAxisUnit = nm\n[Data]\nX-Axis,Spectrum\nnm,CCD cts\n"
+            " 1.0, 5.0\n 2.0, 6.0\n-- interrupted --\n 3.0, 7.0\n 4.0, 8.0\n",
+            encoding="utf-8",
+        )
+        parser = WitecParser()
+        parser.parse(export, streaming=True)
+
+        assert parser.data["data/x_values"].tolist() == [1.0, 2.0, 3.0, 4.0]
+        assert parser.data["data/y_values"].tolist() == [5.0, 6.0, 7.0, 8.0]
+        assert "falling back to line-by-line parsing" in caplog.text
+
+
+class TestWitecParserMemoryMapped:
+    """use_mmap: the [Data] section parsed from a read-only memory map."""
+
+    def test_mmap_matches_regular_read(self):
+        regular = WitecParser()
+        regular.parse(WITEC_FIXTURE)
+        mapped = WitecParser()
+        mapped.parse(WITEC_FIXTURE, use_mmap=True)
+
+        for key in ("data/x_values", "data/y_values"):
+            np.testing.assert_array_equal(mapped.data[key], regular.data[key])
+            assert mapped.data[key].dtype == np.float64
+            assert mapped.data[key].flags["C_CONTIGUOUS"]
+        assert mapped.attrs == regular.attrs
+
+    def test_mmap_handles_crlf_and_extra_columns(self, tmp_path):
+        export = tmp_path / "export.txt"
+        export.write_bytes(
+            b"[Header]\r\nXAxisUnit = nm\r\n[Data]\r\nX-Axis,Spectrum,Extra\r\n"
+            b"nm,CCD cts,a.u.\r\n 1.0, 5.0, 9.0\r\n 2.0, 6.0, 9.0\r\n"
+        )
+        parser = WitecParser()
+        parser.parse(export, use_mmap=True)
+
+        assert parser.data["data/x_values"].tolist() == [1.0, 2.0]
+        assert parser.data["data/y_values"].tolist() == [5.0, 6.0]
+        assert parser.attrs == {"XAxisUnit": "nm"}
+
+    def test_block_is_parsed_in_row_aligned_pieces(self, monkeypatch):
+        regular = WitecParser()
+        regular.parse(WITEC_FIXTURE)
+        monkeypatch.setattr(witec, "MAPPED_CHUNK_BYTES", 100)
+        mapped = WitecParser()
+        mapped.parse(WITEC_FIXTURE, use_mmap=True)
+
+        for key in ("data/x_values", "data/y_values"):
+            np.testing.assert_array_equal(mapped.data[key], regular.data[key])
+
+    def test_empty_file_is_not_mapped(self, tmp_path):
+        empty = tmp_path / "empty.txt"
+        empty.write_bytes(b"")
+
+        header_dict, x_values, y_values = witec._read_mapped_export(empty)
+
+        assert header_dict == {}
+        assert x_values.size == y_values.size == 0
+
+    def test_malformed_mapped_block_falls_back(self, tmp_path, caplog):
+        export = tmp_path / "export.txt"
+        export.write_text(
+            "[Header]\nXAxisUnit = nm\n[Data]\nX-Axis,Spectrum\nnm,CCD cts\n"
+            " 1.0, 5.0\n-- interrupted --\n 2.0, 6.0\n",
+            encoding="utf-8",
+        )
+        parser = WitecParser()
+        parser.parse(export, use_mmap=True)
+
+        assert parser.data["data/x_values"].tolist() == [1.0, 2.0]
+        assert parser.data["data/y_values"].tolist() == [5.0, 6.0]
+        assert "memory-mapped [Data] section" in caplog.text
+
+    @pytest.mark.parametrize(
+        "rows",
+        [" 1.0, 5.0\n 2.0 6.0\n 3.0, 7.0\n", " 1.0, 5.0\n 2.0\n 6.0\n 3.0, 7.0\n"],
+    )
+    def test_rows_without_a_comma_are_skipped_like_line_parsing(self, tmp_path, rows):
+        export = tmp_path / "export.txt"
+        export.write_text(
+            "[Header]\nXAxisUnit = nm\n[Data]\nX-Axis,Spectrum\nnm,CCD cts\n" + rows,
+            encoding="utf-8",
+        )
+        regular = WitecParser()
+        regular.parse(export)
+        mapped = WitecParser()
+        mapped.parse(export, use_mmap=True)
+
+        assert regular.data["data/x_values"].tolist() == [1.0, 3.0]
+        for key in ("data/x_values", "data/y_values"):
+            np.testing.assert_array_equal(mapped.data[key], regular.data[key])
+
+
 class TestWitecParserPostProcess:
     def test_zero_shift_when_measured_equals_laser_wavelength(self):
         parser = WitecParser()
@@ -0,0 +1,92 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Shared fixtures for the ROD database tests."""
+
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROD_FIXTURE = Path(__file__).parents[1] / "data" / "rod" / "rod_file_1000679.rod"
+
+
+class _RodStubHandler(BaseHTTPRequestHandler):
+    """Answers POST /<rod_id>.rod like the ROD server, with configurable
+    5xx failures (server.failures) and unknown IDs (server.missing)."""
+
+    def do_POST(self):  # noqa: N802
+        server = self.server
+        rod_id = int(self.path.rsplit("/", 1)[-1].removesuffix(".rod"))
+        with server.lock:
+            server.requests.append(rod_id)
+            failures_left = server.failures.get(rod_id, 0)
+            if failures_left:
+                server.failures[rod_id] = failures_left - 1
+
+        if rod_id in server.missing:
+            self.send_response(404)
+            body = b""
+        elif failures_left:
+            self.send_response(503)
+            body = b""
+        else:
+            self.send_response(200)
+            body = f"data_{rod_id}\n".encode()
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture()
+def rod_stub_server():
+    """A local stand-in for the ROD download API, running in a thread."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RodStubHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.failures = {}
+    server.missing = set()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def write_synthetic_rod() -> Callable[[Path, np.ndarray, np.ndarray], None]:
+    """Writes the fixture's CIF tags with a synthetic spectrum to a path."""
+    head = ROD_FIXTURE.read_text(encoding="utf-8").split("_raman_spectrum.intensity\n")[
+        0
+    ]
+
+    def write(path: Path, raman_shift: np.ndarray, intensity: np.ndarray) -> None:
+        rows = "\n".join(
+            f"{shift:.3f} {value:.2f}" for shift, value in zip(raman_shift, intensity)
+        )
+        path.write_text(
+            head + "_raman_spectrum.intensity\n" + rows + "\n", encoding="utf-8"
+        )
+
+    return write
@@ -0,0 +1,100 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the build-upload-batch state journal."""
+
+from pynxtools_raman.rod_database.batch_journal import (
+    CONVERTED,
+    DOWNLOADED,
+    FAILED,
+    JOURNAL_FILENAME,
+    BatchJournal,
+)
+
+
+class TestBatchJournal:
+    def test_states_survive_a_resume(self, tmp_path):
+        with BatchJournal(tmp_path) as journal:
+            journal.mark_downloaded(1)
+            journal.mark_downloaded(2)
+            journal.mark_converted(1)
+            journal.mark_failed(2, "convert", "ValueError: broken")
+
+        with BatchJournal(tmp_path, resume=True) as journal:
+            assert journal.state(1) == CONVERTED
+            assert journal.state(2) == FAILED
+            assert journal.state(3) is None
+            assert journal.failures([1, 2, 3]) == {
+                2: {"state": FAILED, "stage": "convert", "reason": "ValueError: broken"}
+            }
+
+    def test_without_resume_the_previous_run_is_discarded(self, tmp_path):
+        with BatchJournal(tmp_path) as journal:
+            journal.mark_converted(1)
+
+        with BatchJournal(tmp_path) as journal:
+            assert journal.state(1) is None
+
+        with BatchJournal(tmp_path, resume=True) as journal:
+            assert journal.state(1) is None
+
+    def test_resumed_journal_keeps_appending(self, tmp_path):
+        with BatchJournal(tmp_path) as journal:
+            journal.mark_downloaded(1)
+        with BatchJournal(tmp_path, resume=True) as journal:
+            journal.mark_converted(1)
+
+        with BatchJournal(tmp_path, resume=True) as journal:
+            assert journal.state(1) == CONVERTED
+
+    def test_truncated_last_line_is_ignored(self, tmp_path, caplog):
+        with BatchJournal(tmp_path) as journal:
+            journal.mark_downloaded(1)
+        with open(tmp_path / JOURNAL_FILENAME, "a", encoding="utf-8") as file:
+            file.write('{"rod_id": 1, "sta')
+
+        with BatchJournal(tmp_path, resume=True) as journal:
+            assert journal.state(1) == DOWNLOADED
+        assert "Ignoring unreadable line 2" in caplog.text
+
+    def test_records_after_a_half_written_line_survive(self, tmp_path):
+        with BatchJournal(tmp_path) as journal:
+            journal.mark_downloaded(1)
+            journal.mark_downloaded(2)
+        journal_file = tmp_path / JOURNAL_FILENAME
+        content = journal_file.read_bytes()
+        journal_file.write_bytes(content[: len(content) - 10])
+
+        with BatchJournal(tmp_path, resume=True) as journal:
+            assert journal.state(2) is None
+            journal.mark_converted(2)
+
+        with BatchJournal(tmp_path, resume=True) as journal:
+            assert journal.state(1) == DOWNLOADED
+            assert journal.state(2) == CONVERTED
+        assert len(journal_file.read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_summary_counts_pending_ids(self, tmp_path):
+        with BatchJournal(tmp_path) as journal:
+            journal.mark_converted(1)
+            journal.mark_failed(2, "download", "download failed")
+
+            assert journal.summary([1, 2, 3]) == {
+                CONVERTED: 1,
+                FAILED: 1,
+                "pending": 1,
+            }
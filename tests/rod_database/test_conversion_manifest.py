@@ -0,0 +1,89 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the incremental-conversion manifest (conversion_manifest.py)."""
+
+import hashlib
+
+from pynxtools_raman.rod_database import conversion_manifest
+from pynxtools_raman.rod_database.conversion_manifest import (
+    MANIFEST_FILENAME,
+    ConversionManifest,
+    file_sha256,
+)
+
+
+def test_file_sha256_matches_hashlib(tmp_path):
+    path = tmp_path / "a.rod"
+    path.write_bytes(b"data_1\n")
+
+    assert file_sha256(path) == hashlib.sha256(b"data_1\n").hexdigest()
+
+
+def test_missing_manifest_loads_empty(tmp_path):
+    manifest = ConversionManifest.load(tmp_path)
+
+    assert manifest.entries == {}
+
+
+def test_recorded_entries_survive_a_round_trip(tmp_path):
+    rod_file = tmp_path / "a.rod"
+    output_file = tmp_path / "a.nxs"
+    output_file.write_bytes(b"")
+    manifest = ConversionManifest.load(tmp_path)
+    manifest.record(rod_file, "abc")
+    manifest.save()
+
+    reloaded = ConversionManifest.load(tmp_path)
+
+    assert (tmp_path / MANIFEST_FILENAME).is_file()
+    assert reloaded.is_up_to_date(rod_file, output_file, "abc")
+    assert not reloaded.is_up_to_date(rod_file, output_file, "def")
+
+
+def test_missing_output_is_not_up_to_date(tmp_path):
+    manifest = ConversionManifest.load(tmp_path)
+    manifest.record(tmp_path / "a.rod", "abc")
+
+    assert not manifest.is_up_to_date(tmp_path / "a.rod", tmp_path / "a.nxs", "abc")
+
+
+def test_changed_fingerprint_discards_entries(tmp_path, monkeypatch):
+    manifest = ConversionManifest.load(tmp_path)
+    manifest.record(tmp_path / "a.rod", "abc")
+    manifest.save()
+    monkeypatch.setattr(
+        conversion_manifest, "get_pynxtools_raman_version", lambda: "99.0"
+    )
+
+    assert ConversionManifest.load(tmp_path).entries == {}
+
+
+def test_unreadable_manifest_is_ignored(tmp_path):
+    (tmp_path / MANIFEST_FILENAME).write_text("{not json", encoding="utf-8")
+
+    assert ConversionManifest.load(tmp_path).entries == {}
+
+
+def test_prune_drops_entries_of_removed_files(tmp_path):
+    manifest = ConversionManifest.load(tmp_path)
+    manifest.record(tmp_path / "a.rod", "abc")
+    manifest.record(tmp_path / "b.rod", "def")
+
+    manifest.prune([tmp_path / "b.rod"])
+
+    assert manifest.entries == {"b.rod": "def"}
@@ -0,0 +1,225 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the ROD metadata index (metadata_index.py)."""
+
+import logging
+import shutil
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from pynxtools_raman.rod_database.metadata_index import (
+    METADATA_INDEX_FILENAME,
+    _column_value,
+    query_metadata_index,
+    query_rod_metadata,
+    update_metadata_index,
+)
+
+ROD_FIXTURE = Path(__file__).parents[1] / "data" / "rod" / "rod_file_1000679.rod"
+
+CRYSTAL_TAGS = """\
+_symmetry_space_group_name_H-M   'P 1 21/c 1'
+_space_group_IT_number           14
+_cell_length_a                   9.40(3)
+_cell_length_b                   5.12(1)
+_cell_length_c                   7.0
+_cell_angle_alpha                90
+_cell_angle_beta                 101.2(2)
+_cell_angle_gamma                90
+"""
+
+
+def _write_variant(path: Path, laser_wavelength: str, resolution: str) -> None:
+    """The fixture with another laser wavelength and resolution, and a
+    crystal structure."""
+    text = ROD_FIXTURE.read_text(encoding="utf-8")
+    text = text.replace(
+        "excitation_laser_wavelength 488",
+        f"excitation_laser_wavelength {laser_wavelength}",
+    ).replace(
+        "_raman_measurement_device.resolution 1",
+        f"_raman_measurement_device.resolution {resolution}",
+    )
+    text = text.replace("_rod_database.code", CRYSTAL_TAGS + "_rod_database.code")
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture()
+def rod_dir(tmp_path) -> Path:
+    shutil.copy(ROD_FIXTURE, tmp_path / "1000679.rod")
+    _write_variant(tmp_path / "1000001.rod", "532", "1.5")
+    _write_variant(tmp_path / "1000002.rod", "532.1", "4")
+    _write_variant(tmp_path / "1000003.rod", "785", "1")
+    return tmp_path
+
+
+def _index_rows(index_path: Path) -> dict[int, dict]:
+    with sqlite3.connect(index_path) as connection:
+        connection.row_factory = sqlite3.Row
+        return {
+            row["rod_id"]: dict(row)
+            for row in connection.execute("SELECT * FROM records")
+        }
+
+
+class TestColumnValue:
+    @pytest.mark.parametrize(
+        "sql_type, value, expected",
+        [
+            ("REAL", "9.40(3)", 9.4),
+            ("INTEGER", "14", 14),
+            ("REAL", "?", None),
+            ("TEXT", "?", None),
+            ("TEXT", "air", "air"),
+            ("REAL", None, None),
+        ],
+    )
+    def test_scalar_values(self, sql_type, value, expected):
+        assert _column_value(sql_type, value) == expected
+
+    @pytest.mark.parametrize("value", [np.array([532.0, 785.0]), ["air", "vacuum"]])
+    def test_loop_values_are_not_indexed(self, value):
+        assert _column_value("REAL", value) is None
+        assert _column_value("TEXT", value) is None
+
+
+class TestUpdateMetadataIndex:
+    def test_columns_from_parser_attrs(self, rod_dir):
+        index_path, n_parsed = update_metadata_index(rod_dir)
+
+        assert index_path == rod_dir / METADATA_INDEX_FILENAME
+        assert n_parsed == 4
+        rows = _index_rows(index_path)
+        assert rows[1000679] == {
+            "rod_id": 1000679,
+            "laser_wavelength": 488.0,
+            "resolution": 1.0,
+            "environment": "air",
+            "optics_type": "other",
+            "space_group": None,
+            "space_group_number": None,
+            "cell_length_a": None,
+            "cell_length_b": None,
+            "cell_length_c": None,
+            "formula": "Al H2 K O9 Si3",
+            "mineral_name": "K-cymrite",
+        }
+        assert rows[1000001]["space_group"] == "P 1 21/c 1"
+        assert rows[1000001]["space_group_number"] == 14
+        assert (
+            rows[1000001]["cell_length_a"],
+            rows[1000001]["cell_length_b"],
+            rows[1000001]["cell_length_c"],
+        ) == (9.40, 5.12, 7.0)
+
+    def test_only_new_and_changed_files_are_parsed(self, rod_dir):
+        update_metadata_index(rod_dir)
+        _write_variant(rod_dir / "1000004.rod", "633", "2")
+        _write_variant(rod_dir / "1000003.rod", "780", "1.0")
+
+        index_path, n_parsed = update_metadata_index(rod_dir)
+
+        assert n_parsed == 2
+        rows = _index_rows(index_path)
+        assert rows[1000004]["laser_wavelength"] == 633.0
+        assert rows[1000003]["laser_wavelength"] == 780.0
+
+    def test_removed_files_are_dropped(self, rod_dir):
+        update_metadata_index(rod_dir)
+        (rod_dir / "1000002.rod").unlink()
+
+        index_path, n_parsed = update_metadata_index(rod_dir)
+
+        assert n_parsed == 0
+        assert query_metadata_index(index_path) == [1000001, 1000003, 1000679]
+
+    def test_unparsable_files_are_left_out_once(self, rod_dir, caplog):
+        (rod_dir / "1000100.rod").write_text("not a CIF file\n", encoding="utf-8")
+        shutil.copy(ROD_FIXTURE, rod_dir / "not-an-id.rod")
+
+        with caplog.at_level(logging.WARNING):
+            update_metadata_index(rod_dir)
+            index_path, n_parsed = update_metadata_index(rod_dir)
+
+        assert n_parsed == 0
+        assert 1000100 not in query_metadata_index(index_path)
+        assert "Leaving" in caplog.text and "1000100.rod" in caplog.text
+        assert "not-an-id.rod: not named after a ROD ID" in caplog.text
+
+    def test_jobs(self, rod_dir):
+        index_path, n_parsed = update_metadata_index(rod_dir, jobs=2)
+
+        assert n_parsed == 4
+        assert len(query_metadata_index(index_path)) == 4
+
+
+class TestQueryMetadataIndex:
+    def test_where_with_parameters(self, rod_dir):
+        index_path, _ = update_metadata_index(rod_dir)
+
+        assert query_metadata_index(
+            index_path,
+            "laser_wavelength BETWEEN ? AND ? AND resolution < ?",
+            (531, 533, 2),
+        ) == [1000001]
+
+    def test_index_is_read_only(self, rod_dir):
+        index_path, _ = update_metadata_index(rod_dir)
+
+        with pytest.raises(sqlite3.Error):
+            query_metadata_index(index_path, "1; DELETE FROM records")
+        assert len(query_metadata_index(index_path)) == 4
+
+
+class TestQueryCli:
+    @pytest.mark.parametrize(
+        ("options", "expected"),
+        [
+            ([], ["1000001", "1000002", "1000003", "1000679"]),
+            (["--laser-wavelength", "532"], ["1000001", "1000002"]),
+            (["--laser-wavelength", "532", "--max-resolution", "2"], ["1000001"]),
+            (
+                ["--environment", "AIR", "--optics-type", "other"],
+                ["1000001", "1000002", "1000003", "1000679"],
+            ),
+            (["--space-group", "14"], ["1000001", "1000002", "1000003"]),
+            (["--space-group", "p121/c1"], ["1000001", "1000002", "1000003"]),
+            (
+                ["--mineral", "k-cymrite", "--where", "cell_length_a IS NULL"],
+                ["1000679"],
+            ),
+        ],
+    )
+    def test_filters(self, rod_dir, options, expected):
+        result = CliRunner().invoke(query_rod_metadata, [str(rod_dir), *options])
+
+        assert result.exit_code == 0, result.output
+        assert result.stdout.splitlines() == expected
+        assert f"{len(expected)} of 4 indexed record(s) match" in result.stderr
+
+    def test_invalid_where(self, rod_dir):
+        result = CliRunner().invoke(
+            query_rod_metadata, [str(rod_dir), "--where", "no_such_column = 1"]
+        )
+
+        assert result.exit_code != 0
+        assert "no such column" in result.output
@@ -0,0 +1,178 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the ROD peak index (peak_index.py)."""
+
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from pynxtools_raman.rod_database.peak_index import (
+    PEAK_INDEX_FILENAME,
+    PeakIndex,
+    find_peaks,
+    match_peaks_cli,
+    update_peak_index,
+)
+
+ROD_FIXTURE = Path(__file__).parents[1] / "data" / "rod" / "rod_file_1000679.rod"
+
+
+def _spectrum(centers: tuple[float, ...]) -> tuple[np.ndarray, np.ndarray]:
+    raman_shift = np.arange(100.0, 1800.0, 0.5)
+    intensity = np.full_like(raman_shift, 10.0)
+    for center in centers:
+        intensity += 1000 * np.exp(-(((raman_shift - center) / 3) ** 2))
+    return raman_shift, intensity
+
+
+@pytest.fixture()
+def rod_dir(tmp_path, write_synthetic_rod) -> Path:
+    write_synthetic_rod(tmp_path / "1000001.rod", *_spectrum((520.0,)))
+    write_synthetic_rod(tmp_path / "1000002.rod", *_spectrum((521.5, 964.0, 1087.0)))
+    write_synthetic_rod(tmp_path / "1000003.rod", *_spectrum((520.0, 965.0, 1200.0)))
+    return tmp_path
+
+
+class TestFindPeaks:
+    def test_finds_synthetic_peaks(self):
+        peaks = find_peaks(*_spectrum((1087.0, 300.0, 965.0)))
+
+        np.testing.assert_allclose(peaks, [300.0, 965.0, 1087.0])
+
+    def test_ignores_noise_and_unsorted_input(self):
+        raman_shift, intensity = _spectrum((700.0,))
+        noise = np.random.default_rng(0).normal(scale=5.0, size=intensity.shape)
+
+        peaks = find_peaks(raman_shift[::-1], (intensity + noise)[::-1])
+
+        assert peaks == pytest.approx([700.0], abs=1.0)
+
+    def test_flat_spectrum_has_no_peaks(self):
+        assert find_peaks(np.arange(10.0), np.ones(10)).size == 0
+
+    def test_real_record(self):
+        from pynxtools_raman.parsers.rod import RodParser
+
+        parser = RodParser()
+        parser.parse(ROD_FIXTURE)
+
+        peaks = find_peaks(
+            parser.data["_raman_spectrum.raman_shift"],
+            parser.data["_raman_spectrum.intensity"],
+        )
+
+        assert len(peaks)
+        assert np.all(np.diff(peaks) > 0)
+
+
+class TestPeakIndex:
+    def test_match_requires_every_position(self, rod_dir):
+        index, _ = update_peak_index(rod_dir)
+
+        assert index.match([520.0]) == [1000001, 1000002, 1000003]
+        assert index.match([520.0, 965.0]) == [1000002, 1000003]
+        assert index.match([520.0, 965.0, 1086.0]) == [1000002]
+        assert index.match([520.0, 965.0, 1086.0], tolerance=0.5) == []
+        assert index.match([]) == []
+
+    def test_peaks_by_rod_id(self, rod_dir):
+        index, _ = update_peak_index(rod_dir)
+
+        np.testing.assert_allclose(index.peaks(1000003), [520.0, 965.0, 1200.0])
+        with pytest.raises(KeyError, match="1000004"):
+            index.peaks(1000004)
+
+    def test_save_and_load(self, rod_dir, tmp_path):
+        index, _ = update_peak_index(rod_dir)
+
+        loaded = PeakIndex.load(rod_dir / PEAK_INDEX_FILENAME)
+
+        assert loaded.rod_ids.tolist() == index.rod_ids.tolist()
+        assert loaded.records().keys() == index.records().keys()
+        assert loaded.match([1200.0]) == [1000003]
+
+    def test_missing_or_unreadable_index_is_empty(self, tmp_path, caplog):
+        assert len(PeakIndex.load(tmp_path / "missing.npz")) == 0
+
+        (tmp_path / "broken.npz").write_text("not an index")
+        assert len(PeakIndex.load(tmp_path / "broken.npz")) == 0
+        assert "unreadable peak index" in caplog.text
+
+
+class TestUpdatePeakIndex:
+    def test_only_new_and_changed_files_are_parsed(self, rod_dir, write_synthetic_rod):
+        _, n_parsed = update_peak_index(rod_dir)
+        assert n_parsed == 3
+
+        write_synthetic_rod(rod_dir / "1000004.rod", *_spectrum((1086.0,)))
+        index, n_parsed = update_peak_index(rod_dir)
+        assert n_parsed == 1
+        assert index.match([1086.0]) == [1000002, 1000004]
+
+        write_synthetic_rod(rod_dir / "1000001.rod", *_spectrum((1600.0,)))
+        stat = (rod_dir / "1000001.rod").stat()
+        os.utime(rod_dir / "1000001.rod", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        index, n_parsed = update_peak_index(rod_dir)
+        assert n_parsed == 1
+        assert index.match([1600.0]) == [1000001]
+
+    def test_removed_files_are_dropped(self, rod_dir):
+        update_peak_index(rod_dir)
+        (rod_dir / "1000002.rod").unlink()
+
+        index, n_parsed = update_peak_index(rod_dir)
+
+        assert n_parsed == 0
+        assert 1000002 not in index
+        assert index.match([965.0]) == [1000003]
+        assert 1000002 not in PeakIndex.load(rod_dir / PEAK_INDEX_FILENAME)
+
+    def test_unparsable_files_are_indexed_without_peaks(self, rod_dir, caplog):
+        (rod_dir / "1000100.rod").write_text("not a CIF file\n", encoding="utf-8")
+        shutil.copy(ROD_FIXTURE, rod_dir / "not-an-id.rod")
+
+        with caplog.at_level(logging.WARNING):
+            index, _ = update_peak_index(rod_dir)
+            _, n_parsed = update_peak_index(rod_dir)
+
+        assert 1000100 in index
+        assert index.peaks(1000100).size == 0
+        assert n_parsed == 0
+        assert "Indexing" in caplog.text and "1000100.rod" in caplog.text
+        assert "not-an-id.rod: not named after a ROD ID" in caplog.text
+
+    def test_jobs(self, rod_dir):
+        index, n_parsed = update_peak_index(rod_dir, jobs=2)
+
+        assert n_parsed == 3
+        assert index.match([1087.0]) == [1000002]
+
+
+def test_cli_prints_one_rod_id_per_line(rod_dir):
+    result = CliRunner().invoke(
+        match_peaks_cli, ["520", "965", "--rod-dir", str(rod_dir)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.stdout.splitlines() == ["1000002", "1000003"]
+    assert "2 of 3 indexed record(s) match (3 file(s) newly indexed)" in result.stderr
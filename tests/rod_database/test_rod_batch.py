@@ -19,19 +19,40 @@
 
 import json
 import shutil
+import threading
+import time
+import zipfile
 from pathlib import Path
 
+import h5py
+import numpy as np
 import pytest
 from click.testing import CliRunner
 
 from pynxtools_raman.rod_database import DEFAULT_ROD_BATCH_DIR, rod_batch
+from pynxtools_raman.rod_database.peak_index import PEAK_INDEX_FILENAME, PeakIndex
 from pynxtools_raman.rod_database.rod_batch import (
     build_rod_upload_batch,
     download_rod_files_cli,
 )
+from pynxtools_raman.timing import recording_timings
 
 ROD_FIXTURE = Path(__file__).parents[1] / "data" / "rod" / "rod_file_1000679.rod"
 
+# Options of build-upload-batch that concern its conversion step, which the
+# download-only command has no use for.
+BATCH_ONLY_OPTIONS = {
+    "jobs",
+    "incremental",
+    "zip_path",
+    "zip_max_size",
+    "zip_include_sources",
+    "resume",
+    "retry_failed",
+    "timings",
+    "timings_log",
+}
+
 
 @pytest.fixture()
 def runner():
@@ -42,10 +63,11 @@ def test_download_and_build_upload_batch_share_the_same_option_surface():
     # Both commands are built with the same rod_batch_options decorator, so
     # they must expose (and default) the same options -- a plain download
     # followed by a batch run must not silently split files across two
-    # locations or diverge in supported flags.
+    # locations or diverge in supported flags. build-upload-batch only adds
+    # options for its own conversion step on top.
     download_options = {p.name for p in download_rod_files_cli.params}
     batch_options = {p.name for p in build_rod_upload_batch.params}
-    assert download_options == batch_options
+    assert download_options == batch_options - BATCH_ONLY_OPTIONS
 
     def default_of(command, option_name):
         return next(p for p in command.params if p.name == option_name).default
@@ -56,7 +78,7 @@ def test_download_and_build_upload_batch_share_the_same_option_surface():
 
 class TestDownloadRodFiles:
     def test_downloads_are_written_to_output_dir(self, tmp_path, monkeypatch):
-        def fake_save(rod_id, output_dir=None):
+        def fake_save(rod_id, output_dir=None, **kwargs):
             path = output_dir / f"{rod_id}.rod"
             path.write_text("fake content", encoding="utf-8")
             return path
@@ -73,7 +95,7 @@ class TestDownloadRodFiles:
         assert all(path.is_file() for path in downloaded)
 
     def test_failed_downloads_are_skipped_not_raised(self, tmp_path, monkeypatch):
-        def fake_save(rod_id, output_dir=None):
+        def fake_save(rod_id, output_dir=None, **kwargs):
             if rod_id == 2:
                 return None
             path = output_dir / f"{rod_id}.rod"
@@ -90,7 +112,7 @@ class TestDownloadRodFiles:
         monkeypatch.setattr(
             rod_batch,
             "save_rod_file_from_ROD_via_API",
-            lambda rod_id, output_dir=None: None,
+            lambda rod_id, output_dir=None, **kwargs: None,
         )
         missing_dir = tmp_path / "nested" / "dir"
 
@@ -104,7 +126,7 @@ class TestDownloadRodFiles:
         monkeypatch.setattr(
             rod_batch,
             "save_rod_file_from_ROD_via_API",
-            lambda rod_id, output_dir=None: calls.append(rod_id),
+            lambda rod_id, output_dir=None, **kwargs: calls.append(rod_id),
         )
 
         downloaded = rod_batch.download_rod_files([1], tmp_path)
@@ -113,6 +135,83 @@ class TestDownloadRodFiles:
         assert downloaded == [tmp_path / "1.rod"]
         assert (tmp_path / "1.rod").read_text(encoding="utf-8") == "already here"
 
+    def test_concurrent_downloads_against_stub_server(self, rod_stub_server, tmp_path):
+        (tmp_path / "2.rod").write_text("already here", encoding="utf-8")
+
+        downloaded = rod_batch.download_rod_files(
+            [1, 2, 3, 4],
+            tmp_path,
+            workers=3,
+            rate_limit=None,
+            base_url=rod_stub_server.base_url,
+        )
+
+        assert downloaded == [tmp_path / f"{rod_id}.rod" for rod_id in (1, 2, 3, 4)]
+        assert sorted(rod_stub_server.requests) == [1, 3, 4]
+        assert (tmp_path / "3.rod").read_text(encoding="utf-8") == "data_3\n"
+
+    def test_concurrent_download_failures_are_skipped(self, rod_stub_server, tmp_path):
+        rod_stub_server.missing.add(2)
+
+        downloaded = rod_batch.download_rod_files(
+            [1, 2, 3], tmp_path, workers=2, base_url=rod_stub_server.base_url
+        )
+
+        assert downloaded == [tmp_path / "1.rod", tmp_path / "3.rod"]
+
+
+class TestIterRodDownloads:
+    def test_downloads_pause_while_results_are_not_consumed(
+        self, tmp_path, monkeypatch
+    ):
+        requested = []
+
+        def fake_save(rod_id, output_dir=None, **kwargs):
+            requested.append(rod_id)
+            path = output_dir / f"{rod_id}.rod"
+            path.write_text("data_x\n", encoding="utf-8")
+            return path
+
+        monkeypatch.setattr(rod_batch, "save_rod_file_from_ROD_via_API", fake_save)
+        downloads = rod_batch.iter_rod_downloads(
+            list(range(10)), tmp_path, workers=1, buffer_size=1
+        )
+
+        first_id, _ = next(downloads)
+        time.sleep(0.3)
+        # one consumed, one waiting in the buffer, one blocked on putting it
+        assert first_id == 0
+        assert len(requested) <= 3
+
+        downloads.close()
+        assert len(requested) <= 4
+
+    def test_existing_files_come_first(self, tmp_path, monkeypatch):
+        (tmp_path / "2.rod").write_text("already here", encoding="utf-8")
+        monkeypatch.setattr(
+            rod_batch,
+            "save_rod_file_from_ROD_via_API",
+            lambda rod_id, output_dir=None, **kwargs: None,
+        )
+
+        results = list(rod_batch.iter_rod_downloads([1, 2], tmp_path))
+
+        assert results == [(2, tmp_path / "2.rod"), (1, None)]
+
+
+def _nexus_contents(nxs_file: Path) -> dict[str, tuple]:
+    """Every object's value and attributes, minus the root's per-file ones."""
+    contents: dict[str, tuple] = {}
+
+    def collect(name, obj):
+        value = obj[()] if isinstance(obj, h5py.Dataset) else None
+        attrs = {key: np.asarray(attr).tolist() for key, attr in obj.attrs.items()}
+        contents[name] = (np.asarray(value).tolist(), attrs)
+
+    with h5py.File(nxs_file, "r") as nexus:
+        nexus.visititems(collect)
+    return contents
+
 
 class TestConvertRodFiles:
     def test_converts_real_rod_fixture_to_nxs(self, tmp_path):
@@ -123,6 +222,33 @@ class TestConvertRodFiles:
         assert converted == [tmp_path / "rod_file_1000679.nxs"]
         assert converted[0].is_file()
 
+    def test_logs_each_generated_output_file(self, tmp_path, caplog):
+        shutil.copy(ROD_FIXTURE, tmp_path / "rod_file_1000679.rod")
+
+        with caplog.at_level("INFO"):
+            converted = rod_batch.convert_rod_files(tmp_path)
+
+        assert f"The output file generated: {converted[0]}." in caplog.text
+
+    def test_output_matches_pynxtools_convert(self, tmp_path):
+        # _convert_rod_file runs the steps of convert() one by one.
+        from pynxtools.dataconverter.convert import convert
+
+        rod_file = tmp_path / "rod_file_1000679.rod"
+        shutil.copy(ROD_FIXTURE, rod_file)
+
+        assert rod_batch._convert_rod_file(rod_file, tmp_path / "batch.nxs") is None
+        convert(
+            input_file=(str(rod_file),),
+            reader="raman",
+            nxdl="NXraman",
+            output=str(tmp_path / "convert.nxs"),
+        )
+
+        assert _nexus_contents(tmp_path / "batch.nxs") == _nexus_contents(
+            tmp_path / "convert.nxs"
+        )
+
     def test_converts_into_separate_output_dir(self, tmp_path):
         input_dir = tmp_path / "in"
         output_dir = tmp_path / "out"
@@ -146,6 +272,132 @@ class TestConvertRodFiles:
 
         assert converted == []
 
+    def test_parallel_conversion_returns_sorted_paths(self, tmp_path):
+        for stem in ("c", "a", "b"):
+            shutil.copy(ROD_FIXTURE, tmp_path / f"{stem}.rod")
+        (tmp_path / "broken.rod").write_text("not a valid cif file", encoding="utf-8")
+
+        with_jobs = rod_batch.convert_rod_files(tmp_path, jobs=2)
+
+        assert with_jobs == [tmp_path / f"{stem}.nxs" for stem in ("a", "b", "c")]
+        assert all(path.is_file() for path in with_jobs)
+
+    def test_parallel_conversion_failure_is_logged_per_file(self, tmp_path, caplog):
+        shutil.copy(ROD_FIXTURE, tmp_path / "good.rod")
+        (tmp_path / "broken.rod").write_text("not a valid cif file", encoding="utf-8")
+
+        with caplog.at_level("ERROR"):
+            converted = rod_batch.convert_rod_files(tmp_path, jobs=2)
+
+        assert converted == [tmp_path / "good.nxs"]
+        assert "Failed to convert" in caplog.text
+        assert "broken.rod" in caplog.text
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_rod_files_can_be_a_generator(tmp_path, jobs):
+    for stem in ("a", "b", "c"):
+        shutil.copy(ROD_FIXTURE, tmp_path / f"{stem}.rod")
+    taken = []
+
+    def rod_files():
+        for stem in ("c", "a"):
+            taken.append(stem)
+            yield tmp_path / f"{stem}.rod"
+
+    converted = rod_batch.convert_rod_files(tmp_path, jobs=jobs, rod_files=rod_files())
+
+    assert taken == ["c", "a"]
+    assert converted == [tmp_path / "a.nxs", tmp_path / "c.nxs"]
+    assert not (tmp_path / "b.nxs").exists()
+
+
+def test_worker_timings_are_emitted_in_the_parent(tmp_path):
+    for stem in ("a", "b"):
+        shutil.copy(ROD_FIXTURE, tmp_path / f"{stem}.rod")
+    records: list[dict] = []
+
+    with recording_timings(records.append):
+        rod_batch.convert_rod_files(tmp_path, jobs=2)
+
+    converted = sorted(
+        record["files"][0] for record in records if record["stage"] == "convert"
+    )
+    assert converted == ["a.rod", "b.rod"]
+
+
+def test_on_output_is_called_for_converted_and_up_to_date_outputs(tmp_path):
+    shutil.copy(ROD_FIXTURE, tmp_path / "a.rod")
+    rod_batch.convert_rod_files(tmp_path, incremental=True)
+    shutil.copy(ROD_FIXTURE, tmp_path / "b.rod")
+    (tmp_path / "c.rod").write_text("this is not a CIF file\n", encoding="utf-8")
+    outputs = []
+
+    rod_batch.convert_rod_files(
+        tmp_path,
+        incremental=True,
+        on_output=lambda rod_file, output_file: outputs.append(output_file.name),
+    )
+
+    assert sorted(outputs) == ["a.nxs", "b.nxs"]
+
+
+class TestIncrementalConversion:
+    def _count_conversions(self, monkeypatch) -> list[str]:
+        converted_stems = []
+        real_convert = rod_batch._convert_rod_file
+
+        def counting_convert(rod_file, output_file):
+            converted_stems.append(rod_file.stem)
+            return real_convert(rod_file, output_file)
+
+        monkeypatch.setattr(rod_batch, "_convert_rod_file", counting_convert)
+        return converted_stems
+
+    def test_rerun_skips_up_to_date_outputs(self, tmp_path, monkeypatch):
+        shutil.copy(ROD_FIXTURE, tmp_path / "a.rod")
+        rod_batch.convert_rod_files(tmp_path, incremental=True)
+        shutil.copy(ROD_FIXTURE, tmp_path / "b.rod")
+        converted_stems = self._count_conversions(monkeypatch)
+
+        converted = rod_batch.convert_rod_files(tmp_path, incremental=True)
+
+        assert converted_stems == ["b"]
+        assert converted == [tmp_path / "a.nxs", tmp_path / "b.nxs"]
+
+    def test_changed_input_is_rebuilt(self, tmp_path, monkeypatch):
+        rod_file = tmp_path / "a.rod"
+        shutil.copy(ROD_FIXTURE, rod_file)
+        rod_batch.convert_rod_files(tmp_path, incremental=True)
+        rod_file.write_text(
+            rod_file.read_text(encoding="utf-8") + "\n", encoding="utf-8"
+        )
+        converted_stems = self._count_conversions(monkeypatch)
+
+        rod_batch.convert_rod_files(tmp_path, incremental=True)
+
+        assert converted_stems == ["a"]
+
+    def test_deleted_output_is_rebuilt(self, tmp_path, monkeypatch):
+        shutil.copy(ROD_FIXTURE, tmp_path / "a.rod")
+        rod_batch.convert_rod_files(tmp_path, incremental=True)
+        (tmp_path / "a.nxs").unlink()
+        converted_stems = self._count_conversions(monkeypatch)
+
+        rod_batch.convert_rod_files(tmp_path, incremental=True)
+
+        assert converted_stems == ["a"]
+        assert (tmp_path / "a.nxs").is_file()
+
+    def test_non_incremental_run_rebuilds_everything(self, tmp_path, monkeypatch):
+        shutil.copy(ROD_FIXTURE, tmp_path / "a.rod")
+        rod_batch.convert_rod_files(tmp_path, incremental=True)
+        converted_stems = self._count_conversions(monkeypatch)
+
+        rod_batch.convert_rod_files(tmp_path)
+
+        assert converted_stems == ["a"]
+
 
 class TestCollectRodIds:
     def test_collects_ids_from_args_only(self):
@@ -167,7 +419,7 @@ class TestCollectRodIds:
 class TestDownloadRodFilesCli:
     """The `download` sub-command: download-only, no conversion/metadata."""
 
-    def _fake_save(self, rod_id, output_dir=None):
+    def _fake_save(self, rod_id, output_dir=None, **kwargs):
         path = output_dir / f"{rod_id}.rod"
         shutil.copy(ROD_FIXTURE, path)
         return path
@@ -212,6 +464,33 @@ class TestDownloadRodFilesCli:
         assert not (tmp_path / "1000679.nxs").exists()
         assert not (tmp_path / "nomad.json").exists()
 
+    def test_downloads_are_added_to_the_peak_index(self, runner, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            rod_batch, "save_rod_file_from_ROD_via_API", self._fake_save
+        )
+
+        result = runner.invoke(
+            download_rod_files_cli,
+            ["1000679", "--output-dir", str(tmp_path), "--yes"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Peak index updated with 1 new or changed" in result.output
+        assert 1000679 in PeakIndex.load(tmp_path / PEAK_INDEX_FILENAME)
+
+    def test_no_peak_index_leaves_it_alone(self, runner, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            rod_batch, "save_rod_file_from_ROD_via_API", self._fake_save
+        )
+
+        result = runner.invoke(
+            download_rod_files_cli,
+            ["1000679", "--output-dir", str(tmp_path), "--yes", "--no-peak-index"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert not (tmp_path / PEAK_INDEX_FILENAME).exists()
+
     def test_no_prompt_when_all_files_already_present(
         self, runner, tmp_path, monkeypatch
     ):
@@ -223,7 +502,7 @@ class TestDownloadRodFilesCli:
         monkeypatch.setattr(
             rod_batch,
             "save_rod_file_from_ROD_via_API",
-            lambda rod_id, output_dir=None: (_ for _ in ()).throw(
+            lambda rod_id, output_dir=None, **kwargs: (_ for _ in ()).throw(
                 AssertionError("should not re-download an existing file")
             ),
         )
@@ -278,7 +557,7 @@ class TestBuildRodUploadBatchCli:
     everything downstream (conversion, nomad.json) runs for real.
     """
 
-    def _fake_save(self, rod_id, output_dir=None):
+    def _fake_save(self, rod_id, output_dir=None, **kwargs):
         path = output_dir / f"{rod_id}.rod"
         shutil.copy(ROD_FIXTURE, path)
         return path
@@ -324,6 +603,181 @@ class TestBuildRodUploadBatchCli:
         metadata = json.loads((tmp_path / "nomad.json").read_text(encoding="utf-8"))
         assert "Raman Open Database" in metadata["comment"]
 
+    def test_zip_option_packs_outputs_with_nomad_json(
+        self, runner, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            rod_batch, "save_rod_file_from_ROD_via_API", self._fake_save
+        )
+        zip_path = tmp_path / "upload.zip"
+
+        result = runner.invoke(
+            build_rod_upload_batch,
+            [
+                "1000679",
+                "1000680",
+                "--output-dir",
+                str(tmp_path / "batch"),
+                "--yes",
+                "--zip",
+                str(zip_path),
+                "--zip-include-sources",
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        shard = tmp_path / "upload-001.zip"
+        assert f"Upload ready: {shard}" in result.output
+        with zipfile.ZipFile(shard) as upload:
+            assert sorted(upload.namelist()) == [
+                "1000679.nxs",
+                "1000679.rod",
+                "1000680.nxs",
+                "1000680.rod",
+                "nomad.json",
+            ]
+            metadata = json.loads(upload.read("nomad.json"))
+        assert "Raman Open Database" in metadata["comment"]
+
+    def test_timings_print_a_summary_and_write_a_log(
+        self, runner, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            rod_batch, "save_rod_file_from_ROD_via_API", self._fake_save
+        )
+        timings_log = tmp_path / "timings.jsonl"
+
+        result = runner.invoke(
+            build_rod_upload_batch,
+            [
+                "1000679",
+                "--output-dir",
+                str(tmp_path / "batch"),
+                "--yes",
+                "--timings",
+                "--timings-log",
+                str(timings_log),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "p95 [s]" in result.output
+        records = [
+            json.loads(line)
+            for line in timings_log.read_text(encoding="utf-8").splitlines()
+        ]
+        stages = {record["stage"] for record in records}
+        assert {"download", "parse", "read", "validate", "write", "convert"} <= stages
+        download = next(record for record in records if record["stage"] == "download")
+        assert download["files"] == ["1000679.rod"]
+        assert download["bytes"] == ROD_FIXTURE.stat().st_size
+
+    def test_resume_skips_converted_and_failed_ids(self, runner, tmp_path, monkeypatch):
+        requested: list[int] = []
+
+        def flaky_save(rod_id, output_dir=None, **kwargs):
+            requested.append(rod_id)
+            if rod_id == 1000680:
+                return None
+            return self._fake_save(rod_id, output_dir=output_dir)
+
+        monkeypatch.setattr(rod_batch, "save_rod_file_from_ROD_via_API", flaky_save)
+        args = ["1000679", "1000680", "--output-dir", str(tmp_path), "--yes"]
+
+        first = runner.invoke(build_rod_upload_batch, args)
+        assert first.exit_code == 0, first.output
+        assert "1/2 ROD ID(s) converted to NeXus, 1 failed." in first.output
+        assert "1000680: download failed" in first.output
+
+        requested.clear()
+        converted_stems: list[str] = []
+        real_convert = rod_batch._convert_rod_file
+
+        def counting_convert(rod_file, output_file):
+            converted_stems.append(rod_file.stem)
+            return real_convert(rod_file, output_file)
+
+        monkeypatch.setattr(rod_batch, "_convert_rod_file", counting_convert)
+        resumed = runner.invoke(build_rod_upload_batch, [*args, "--resume"])
+        assert resumed.exit_code == 0, resumed.output
+        assert "1 ID(s) already converted, 1 failed ID(s) skipped, 0 to go" in (
+            resumed.output
+        )
+        assert requested == []
+        assert converted_stems == []
+
+        monkeypatch.setattr(
+            rod_batch, "save_rod_file_from_ROD_via_API", self._fake_save
+        )
+        retried = runner.invoke(
+            build_rod_upload_batch, [*args, "--resume", "--retry-failed"]
+        )
+        assert retried.exit_code == 0, retried.output
+        assert converted_stems == ["1000680"]
+        assert "2/2 ROD ID(s) converted to NeXus, 0 failed." in retried.output
+
+    def test_resume_repacks_converted_ids_into_the_zip(
+        self, runner, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            rod_batch, "save_rod_file_from_ROD_via_API", self._fake_save
+        )
+        batch_dir = tmp_path / "batch"
+        runner.invoke(
+            build_rod_upload_batch, ["1000679", "--output-dir", str(batch_dir), "-y"]
+        )
+
+        result = runner.invoke(
+            build_rod_upload_batch,
+            [
+                "1000679",
+                "1000680",
+                "--output-dir",
+                str(batch_dir),
+                "--yes",
+                "--resume",
+                "--zip",
+                str(tmp_path / "upload.zip"),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        with zipfile.ZipFile(tmp_path / "upload-001.zip") as upload:
+            assert sorted(upload.namelist()) == [
+                "1000679.nxs",
+                "1000680.nxs",
+                "nomad.json",
+            ]
+
+    def test_conversion_starts_while_downloads_are_still_running(
+        self, runner, tmp_path, monkeypatch
+    ):
+        first_converted = threading.Event()
+        real_convert = rod_batch._convert_rod_file
+
+        def signalling_convert(rod_file, output_file):
+            error = real_convert(rod_file, output_file)
+            first_converted.set()
+            return error
+
+        def fake_save(rod_id, output_dir=None, **kwargs):
+            # the second download only finishes once the first file was
+            # converted -- which never happens if conversion waited for it
+            if rod_id == 1000680:
+                assert first_converted.wait(timeout=60)
+            return self._fake_save(rod_id, output_dir=output_dir)
+
+        monkeypatch.setattr(rod_batch, "_convert_rod_file", signalling_convert)
+        monkeypatch.setattr(rod_batch, "save_rod_file_from_ROD_via_API", fake_save)
+
+        result = runner.invoke(
+            build_rod_upload_batch,
+            ["1000679", "1000680", "--output-dir", str(tmp_path), "--yes"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "2/2 ROD ID(s) converted to NeXus, 0 failed." in result.output
+
     def test_ids_file_is_combined_with_positional_ids(
         self, runner, tmp_path, monkeypatch
     ):
@@ -367,7 +821,7 @@ class TestBuildRodUploadBatchCli:
 
         calls = []
 
-        def fake_save(rod_id, output_dir=None):
+        def fake_save(rod_id, output_dir=None, **kwargs):
             calls.append(rod_id)
             return self._fake_save(rod_id, output_dir=output_dir)
 
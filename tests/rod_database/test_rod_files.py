@@ -0,0 +1,61 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the helpers shared by the rod_database commands (rod_files.py)."""
+
+from pathlib import Path
+
+import pytest
+
+from pynxtools_raman.rod_database.rod_files import atomic_write, map_rod_files
+
+
+def _name_length(rod_file: Path) -> int:
+    return len(rod_file.name)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_map_rod_files_keeps_the_order(jobs):
+    rod_files = [Path(f"rod_file_{'1' * n}.rod") for n in range(1, 12)]
+
+    assert list(map_rod_files(_name_length, rod_files, jobs)) == [
+        len(rod_file.name) for rod_file in rod_files
+    ]
+
+
+def test_atomic_write_replaces_the_file_once_complete(tmp_path):
+    path = tmp_path / "index.json"
+    path.write_text("old")
+
+    with atomic_write(path) as partial_path:
+        partial_path.write_text("new")
+        assert path.read_text() == "old"
+
+    assert path.read_text() == "new"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_write_keeps_the_old_file_on_errors(tmp_path):
+    path = tmp_path / "index.json"
+    path.write_text("old")
+
+    with pytest.raises(RuntimeError), atomic_write(path) as partial_path:
+        partial_path.write_text("half")
+        raise RuntimeError("interrupted")
+
+    assert path.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [path]
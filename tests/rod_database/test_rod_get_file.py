@@ -34,7 +34,9 @@ def test_save_rod_file_writes_into_output_dir(tmp_path, monkeypatch):
         def raise_for_status(self):
             pass
 
-    monkeypatch.setattr(rod_get_file.requests, "post", lambda url: FakeResponse())
+    monkeypatch.setattr(
+        rod_get_file.requests, "post", lambda url, **kwargs: FakeResponse()
+    )
 
     path = rod_get_file.save_rod_file_from_ROD_via_API(1000679, output_dir=tmp_path)
 
@@ -49,7 +51,9 @@ def test_save_rod_file_creates_output_dir_if_missing(tmp_path, monkeypatch):
         def raise_for_status(self):
             pass
 
-    monkeypatch.setattr(rod_get_file.requests, "post", lambda url: FakeResponse())
+    monkeypatch.setattr(
+        rod_get_file.requests, "post", lambda url, **kwargs: FakeResponse()
+    )
     missing_dir = tmp_path / "nested" / "dir"
 
     path = rod_get_file.save_rod_file_from_ROD_via_API(1000679, output_dir=missing_dir)
@@ -59,11 +63,93 @@ def test_save_rod_file_creates_output_dir_if_missing(tmp_path, monkeypatch):
 
 
 def test_save_rod_file_returns_none_on_request_error(tmp_path, monkeypatch):
-    def raise_connection_error(url):
+    def raise_connection_error(url, **kwargs):
         raise requests.exceptions.ConnectionError("no network")
 
     monkeypatch.setattr(rod_get_file.requests, "post", raise_connection_error)
+    monkeypatch.setattr(rod_get_file.time, "sleep", lambda seconds: None)
 
     path = rod_get_file.save_rod_file_from_ROD_via_API(1000679, output_dir=tmp_path)
 
     assert path is None
+
+
+class TestDownloadAgainstStubServer:
+    """save_rod_file_from_ROD_via_API against a real local HTTP server."""
+
+    def test_downloads_through_a_shared_session(self, rod_stub_server, tmp_path):
+        with rod_get_file.create_session() as session:
+            path = rod_get_file.save_rod_file_from_ROD_via_API(
+                1000679,
+                output_dir=tmp_path,
+                session=session,
+                base_url=rod_stub_server.base_url,
+            )
+
+        assert path == tmp_path / "1000679.rod"
+        assert path.read_text(encoding="utf-8") == "data_1000679\n"
+
+    def test_server_errors_are_retried_with_backoff(
+        self, rod_stub_server, tmp_path, monkeypatch
+    ):
+        delays = []
+        monkeypatch.setattr(rod_get_file.time, "sleep", delays.append)
+        rod_stub_server.failures[1000679] = 2
+
+        path = rod_get_file.save_rod_file_from_ROD_via_API(
+            1000679,
+            output_dir=tmp_path,
+            backoff=0.5,
+            base_url=rod_stub_server.base_url,
+        )
+
+        assert path == tmp_path / "1000679.rod"
+        assert delays == [0.5, 1.0]
+        assert rod_stub_server.requests == [1000679] * 3
+
+    def test_gives_up_after_the_last_retry(
+        self, rod_stub_server, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(rod_get_file.time, "sleep", lambda seconds: None)
+        rod_stub_server.failures[1000679] = 10
+
+        path = rod_get_file.save_rod_file_from_ROD_via_API(
+            1000679, output_dir=tmp_path, retries=2, base_url=rod_stub_server.base_url
+        )
+
+        assert path is None
+        assert rod_stub_server.requests == [1000679] * 3
+
+    def test_client_errors_are_not_retried(self, rod_stub_server, tmp_path):
+        rod_stub_server.missing.add(1000679)
+
+        path = rod_get_file.save_rod_file_from_ROD_via_API(
+            1000679, output_dir=tmp_path, base_url=rod_stub_server.base_url
+        )
+
+        assert path is None
+        assert rod_stub_server.requests == [1000679]
+
+
+class TestRateLimiter:
+    def test_disabled_limiter_never_sleeps(self, monkeypatch):
+        monkeypatch.setattr(
+            rod_get_file.time,
+            "sleep",
+            lambda seconds: (_ for _ in ()).throw(AssertionError("slept")),
+        )
+        limiter = rod_get_file.RateLimiter(None)
+
+        for _ in range(5):
+            limiter.wait()
+
+    def test_calls_are_spaced_by_the_interval(self, monkeypatch):
+        delays = []
+        monkeypatch.setattr(rod_get_file.time, "monotonic", lambda: 100.0)
+        monkeypatch.setattr(rod_get_file.time, "sleep", delays.append)
+        limiter = rod_get_file.RateLimiter(4.0)
+
+        for _ in range(3):
+            limiter.wait()
+
+        assert delays == [0.25, 0.5]
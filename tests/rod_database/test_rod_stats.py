@@ -23,8 +23,13 @@ from pathlib import Path
 import pytest
 from click.testing import CliRunner
 
-from pynxtools_raman.rod_database import DEFAULT_ROD_BATCH_DIR
-from pynxtools_raman.rod_database.rod_stats import analyze_rod_keys, count_rod_keys
+from pynxtools_raman.rod_database import DEFAULT_ROD_BATCH_DIR, rod_stats
+from pynxtools_raman.rod_database.rod_stats import (
+    KEY_CACHE_FILENAME,
+    analyze_rod_keys,
+    count_rod_keys,
+    scan_rod_keys,
+)
 
 ROD_FIXTURE = Path(__file__).parents[1] / "data" / "rod" / "rod_file_1000679.rod"
 
@@ -63,6 +68,63 @@ class TestCountRodKeys:
         assert count_rod_keys(tmp_path) == {}
 
 
+class TestScanRodKeys:
+    def _count_scans(self, monkeypatch) -> list[str]:
+        scanned = []
+        real_scan = rod_stats._scan_rod_file_keys
+
+        def counting_scan(rod_file):
+            scanned.append(rod_file.name)
+            return real_scan(rod_file)
+
+        monkeypatch.setattr(rod_stats, "_scan_rod_file_keys", counting_scan)
+        return scanned
+
+    def test_returns_counts_and_number_of_files(self, tmp_path):
+        shutil.copy(ROD_FIXTURE, tmp_path / "a.rod")
+        shutil.copy(ROD_FIXTURE, tmp_path / "b.rod")
+
+        counts, n_files = scan_rod_keys(tmp_path)
+
+        assert n_files == 2
+        assert counts["_raman_spectrum.intensity"] == 2
+
+    def test_parallel_scan_matches_serial_scan(self, tmp_path):
+        for name in ("a", "b", "c"):
+            shutil.copy(ROD_FIXTURE, tmp_path / f"{name}.rod")
+
+        assert scan_rod_keys(tmp_path, jobs=2) == scan_rod_keys(tmp_path)
+
+    def test_cached_files_are_not_rescanned(self, tmp_path, monkeypatch):
+        cache_file = tmp_path / KEY_CACHE_FILENAME
+        shutil.copy(ROD_FIXTURE, tmp_path / "a.rod")
+        first_counts, _ = scan_rod_keys(tmp_path, cache_file=cache_file)
+        shutil.copy(ROD_FIXTURE, tmp_path / "b.rod")
+        scanned = self._count_scans(monkeypatch)
+
+        counts, n_files = scan_rod_keys(tmp_path, cache_file=cache_file)
+
+        assert scanned == ["b.rod"]
+        assert n_files == 2
+        assert counts["_publ_author_name"] == 2 * first_counts["_publ_author_name"]
+
+    def test_modified_file_is_rescanned(self, tmp_path, monkeypatch):
+        cache_file = tmp_path / KEY_CACHE_FILENAME
+        rod_file = tmp_path / "a.rod"
+        shutil.copy(ROD_FIXTURE, rod_file)
+        scan_rod_keys(tmp_path, cache_file=cache_file)
+        rod_file.write_text(
+            rod_file.read_text(encoding="utf-8") + "_extra_key value\n",
+            encoding="utf-8",
+        )
+        scanned = self._count_scans(monkeypatch)
+
+        counts, _ = scan_rod_keys(tmp_path, cache_file=cache_file)
+
+        assert scanned == ["a.rod"]
+        assert counts["_extra_key"] == 1
+
+
 class TestAnalyzeRodKeysCli:
     def test_writes_report_file_at_explicit_output(self, runner, tmp_path):
         shutil.copy(ROD_FIXTURE, tmp_path / "rod_file_1000679.rod")
@@ -106,6 +168,17 @@ class TestAnalyzeRodKeysCli:
             assert result.exit_code == 0, result.output
             assert (batch_dir / "rod_key_statistics.txt").is_file()
 
+    def test_cache_is_written_unless_disabled(self, runner, tmp_path):
+        shutil.copy(ROD_FIXTURE, tmp_path / "rod_file_1000679.rod")
+
+        result = runner.invoke(analyze_rod_keys, [str(tmp_path), "--no-cache"])
+        assert result.exit_code == 0, result.output
+        assert not (tmp_path / KEY_CACHE_FILENAME).exists()
+
+        result = runner.invoke(analyze_rod_keys, [str(tmp_path), "--jobs", "2"])
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / KEY_CACHE_FILENAME).is_file()
+
     def test_nonexistent_rod_dir_fails(self, runner, tmp_path):
         result = runner.invoke(analyze_rod_keys, [str(tmp_path / "does_not_exist")])
         assert result.exit_code != 0
@@ -0,0 +1,188 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the similarity search over ROD reference spectra
+(similarity_search.py)."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from pynxtools_raman.parsers.witec import WitecParser
+from pynxtools_raman.rod_database.similarity_search import (
+    SimilaritySearch,
+    cache_path_for,
+    make_grid,
+    normalize,
+    resample,
+    search_spectra_cli,
+)
+from pynxtools_raman.rod_database.spectral_archive import build_spectral_archive
+
+DATA_DIR = Path(__file__).parents[1] / "data"
+ROD_FIXTURE = DATA_DIR / "rod" / "rod_file_1000679.rod"
+WITEC_FIXTURE = DATA_DIR / "witec" / "Si-wafer-Raman-Spectrum-1.txt"
+
+# ROD ID -> peak positions (cm^-1) of its synthetic reference spectrum
+REFERENCE_PEAKS = {
+    1000001: (520.0,),
+    1000002: (465.0, 1085.0),
+    1000003: (1000.0, 1600.0),
+}
+
+
+def _peaks(raman_shift: np.ndarray, centers: tuple[float, ...]) -> np.ndarray:
+    return sum(
+        (1000 * np.exp(-(((raman_shift - center) / 4) ** 2)) for center in centers),
+        start=np.full_like(raman_shift, 10.0),
+    )
+
+
+@pytest.fixture()
+def archive_path(tmp_path, write_synthetic_rod) -> Path:
+    raman_shift = np.arange(100.0, 1800.0, 1.3)
+    for rod_id, centers in REFERENCE_PEAKS.items():
+        write_synthetic_rod(
+            tmp_path / f"{rod_id}.rod", raman_shift, _peaks(raman_shift, centers)
+        )
+    return build_spectral_archive(tmp_path)[0]
+
+
+def test_resample_sorts_and_zero_fills():
+    grid = np.array([0.0, 1.5, 2.5, 10.0])
+
+    resampled = resample(np.array([3.0, 1.0, 2.0]), np.array([30.0, 10.0, 20.0]), grid)
+
+    assert resampled.tolist() == [0.0, 15.0, 25.0, 0.0]
+
+
+@pytest.mark.parametrize("metric", ["cosine", "pearson"])
+def test_normalize_gives_unit_rows(metric):
+    rows = np.array([[1.0, 2.0, 3.0], [0.0, 0.0, 0.0], [2.0, 2.0, 2.0]])
+
+    normalized = normalize(rows, metric)
+
+    assert normalized.dtype == np.float32
+    assert np.linalg.norm(normalized[0]) == pytest.approx(1.0)
+    assert not normalized[1].any()
+    if metric == "pearson":
+        assert not normalized[2].any()
+    assert rows[0].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_normalize_rejects_unknown_metric():
+    with pytest.raises(ValueError, match="Unknown metric"):
+        normalize(np.ones(3), "euclidean")
+
+
+class TestSimilaritySearch:
+    @pytest.mark.parametrize("metric", ["cosine", "pearson"])
+    def test_best_match_first(self, archive_path, metric):
+        search = SimilaritySearch.from_archive(archive_path, metric)
+        raman_shift = np.linspace(200.0, 1500.0, 500)
+
+        matches = search.search(raman_shift, _peaks(raman_shift, (466.0, 1086.0)))
+
+        assert [rod_id for rod_id, _ in matches][0] == 1000002
+        assert len(matches) == len(REFERENCE_PEAKS)
+        scores = [score for _, score in matches]
+        assert scores == sorted(scores, reverse=True)
+        assert scores[0] > 0.9
+
+    def test_search_many_scores_every_query(self, archive_path):
+        search = SimilaritySearch.from_archive(archive_path)
+        raman_shift = np.arange(100.0, 1800.0, 0.7)
+
+        results = search.search_many(
+            [
+                (raman_shift, _peaks(raman_shift, (520.0,))),
+                (raman_shift, _peaks(raman_shift, (1000.0, 1600.0))),
+            ],
+            top_k=1,
+        )
+
+        assert [[rod_id for rod_id, _ in matches] for matches in results] == [
+            [1000001],
+            [1000003],
+        ]
+
+    def test_reference_matrix_is_cached(self, archive_path):
+        first = SimilaritySearch.from_archive(archive_path, "pearson")
+        cache_path = cache_path_for(archive_path, "pearson")
+        cached_mtime = cache_path.stat().st_mtime_ns
+
+        second = SimilaritySearch.from_archive(archive_path, "pearson")
+
+        assert cache_path.stat().st_mtime_ns == cached_mtime
+        np.testing.assert_array_equal(first.matrix, second.matrix)
+        assert second.matrix.dtype == np.float32
+
+    def test_cache_is_rebuilt_for_another_grid(self, archive_path):
+        SimilaritySearch.from_archive(archive_path)
+
+        search = SimilaritySearch.from_archive(
+            archive_path, grid=make_grid(400.0, 1200.0, 5.0)
+        )
+
+        assert search.matrix.shape == (len(REFERENCE_PEAKS), 161)
+
+    def test_search_parser_needs_post_processing(self, archive_path):
+        search = SimilaritySearch.from_archive(archive_path, use_cache=False)
+        parser = WitecParser()
+        parser.parse(WITEC_FIXTURE)
+
+        with pytest.raises(ValueError, match="post_process"):
+            search.search_parser(parser)
+
+        parser.post_process(
+            {"/ENTRY[entry]/instrument/beam_incident/wavelength": 532.1}
+        )
+        assert search.search_parser(parser, top_k=1)[0][0] == 1000001
+
+
+def test_cli_lists_best_matches(archive_path):
+    result = CliRunner().invoke(
+        search_spectra_cli,
+        [
+            str(WITEC_FIXTURE),
+            "--laser-wavelength",
+            "532.1",
+            "--archive",
+            str(archive_path),
+            "--top-k",
+            "2",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0] == f"{WITEC_FIXTURE}:"
+    assert len(lines) == 3
+    assert lines[1].split("\t")[0].strip() == "1000001"
+    assert lines[1].endswith("K-cymrite")
+
+
+def test_cli_rejects_other_files(archive_path):
+    result = CliRunner().invoke(
+        search_spectra_cli,
+        [str(ROD_FIXTURE), "--laser-wavelength", "532", "--archive", str(archive_path)],
+    )
+
+    assert result.exit_code != 0
+    assert "is not a WITec export" in result.output
@@ -0,0 +1,161 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the columnar spectral archive (spectral_archive.py)."""
+
+import math
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from pynxtools_raman.parsers.rod import RodParser
+from pynxtools_raman.rod_database.spectral_archive import (
+    ARCHIVE_FILENAME,
+    SpectralArchive,
+    build_spectral_archive,
+    build_spectral_archive_cli,
+)
+
+ROD_FIXTURE = Path(__file__).parents[1] / "data" / "rod" / "rod_file_1000679.rod"
+
+
+def _write_scaled_copy(path: Path, factor: float) -> None:
+    """The fixture, with every intensity multiplied by factor."""
+    head, loop = ROD_FIXTURE.read_text(encoding="utf-8").split(
+        "_raman_spectrum.intensity\n"
+    )
+    rows = []
+    for line in loop.splitlines():
+        shift, intensity = line.split()
+        rows.append(f"{shift} {float(intensity) * factor}")
+    path.write_text(
+        head + "_raman_spectrum.intensity\n" + "\n".join(rows) + "\n",
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture()
+def rod_dir(tmp_path) -> Path:
+    shutil.copy(ROD_FIXTURE, tmp_path / "1000679.rod")
+    _write_scaled_copy(tmp_path / "1000042.rod", 2.0)
+    (tmp_path / "1000100.rod").write_text("not a CIF file\n", encoding="utf-8")
+    shutil.copy(ROD_FIXTURE, tmp_path / "not-an-id.rod")
+    return tmp_path
+
+
+@pytest.fixture(scope="module")
+def fixture_spectrum() -> tuple[np.ndarray, np.ndarray]:
+    parser = RodParser()
+    parser.parse(ROD_FIXTURE)
+    return (
+        parser.data["_raman_spectrum.raman_shift"],
+        parser.data["_raman_spectrum.intensity"],
+    )
+
+
+class TestBuildSpectralArchive:
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_archives_every_parsable_record(self, rod_dir, caplog, jobs):
+        archive_path, n_records = build_spectral_archive(rod_dir, jobs=jobs)
+
+        assert archive_path == rod_dir / ARCHIVE_FILENAME
+        assert n_records == 2
+        with SpectralArchive(archive_path) as archive:
+            assert archive.rod_ids.tolist() == [1000042, 1000679]
+        assert "Leaving" in caplog.text and "1000100.rod" in caplog.text
+        assert "not-an-id.rod: not named after a ROD ID" in caplog.text
+
+    def test_no_partial_file_is_left_behind(self, rod_dir):
+        build_spectral_archive(rod_dir)
+
+        assert [path.name for path in rod_dir.glob("*.h5*")] == [ARCHIVE_FILENAME]
+
+    def test_empty_directory(self, tmp_path):
+        archive_path, n_records = build_spectral_archive(tmp_path)
+
+        assert n_records == 0
+        with SpectralArchive(archive_path) as archive:
+            assert len(archive) == 0
+            assert archive.metadata_table()["formula"].tolist() == []
+
+
+class TestSpectralArchive:
+    @pytest.fixture()
+    def archive(self, rod_dir):
+        archive_path, _ = build_spectral_archive(rod_dir)
+        with SpectralArchive(archive_path) as archive:
+            yield archive
+
+    def test_spectrum_by_rod_id(self, archive, fixture_spectrum):
+        raman_shift, intensity = archive.spectrum(1000679)
+        np.testing.assert_array_equal(raman_shift, fixture_spectrum[0])
+        np.testing.assert_array_equal(intensity, fixture_spectrum[1])
+
+        _, doubled = archive.spectrum(1000042)
+        np.testing.assert_allclose(doubled, 2 * fixture_spectrum[1])
+
+    def test_unknown_rod_id(self, archive):
+        assert 1000100 not in archive
+        with pytest.raises(KeyError, match="1000100"):
+            archive.spectrum(1000100)
+
+    def test_metadata(self, archive):
+        metadata = archive.metadata(1000679)
+
+        assert metadata["formula"] == "O9 Si3 Al K H2"
+        assert metadata["mineral_name"] == "K-cymrite"
+        assert metadata["laser_wavelength"] == 488.0
+        assert metadata["cod_code"] == ""
+
+    def test_metadata_table_is_aligned_with_rod_ids(self, archive):
+        table = archive.metadata_table()
+
+        assert table["mineral_name"].tolist() == ["K-cymrite", "K-cymrite"]
+        assert table["laser_wavelength"].tolist() == [488.0, 488.0]
+
+    def test_spectra_iterates_all_or_selected_ids(self, archive, fixture_spectrum):
+        everything = list(archive.spectra())
+        selected = list(archive.spectra([1000679]))
+
+        assert [rod_id for rod_id, _, _ in everything] == [1000042, 1000679]
+        np.testing.assert_array_equal(everything[1][2], selected[0][2])
+
+    def test_rejects_other_hdf5_files(self, tmp_path):
+        import h5py
+
+        other = tmp_path / "other.h5"
+        with h5py.File(other, "w") as file:
+            file["x"] = [1]
+
+        with pytest.raises(ValueError, match="not a spectral archive"):
+            SpectralArchive(other)
+
+
+def test_cli_reports_archived_records(rod_dir):
+    output = rod_dir / "corpus.h5"
+
+    result = CliRunner().invoke(
+        build_spectral_archive_cli, [str(rod_dir), "--output", str(output)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert f"Archived 2 spectra in {output}." in result.output
+    with SpectralArchive(output) as archive:
+        assert not math.isnan(archive.metadata(1000042)["laser_wavelength"])
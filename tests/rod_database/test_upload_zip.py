@@ -0,0 +1,94 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the size-capped upload ZIP writer (upload_zip.py)."""
+
+import os
+import zipfile
+
+from pynxtools_raman.rod_database.upload_zip import ShardedUploadZip
+
+
+def _write_random(path, size):
+    # random bytes don't compress, so shard sizes stay close to the input
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+class TestShardedUploadZip:
+    def test_single_shard_with_root_files(self, tmp_path):
+        first = _write_random(tmp_path / "a.nxs", 100)
+        second = _write_random(tmp_path / "b.nxs", 100)
+
+        with ShardedUploadZip(
+            tmp_path / "out" / "upload.zip", root_files={"nomad.json": "{}\n"}
+        ) as upload_zip:
+            upload_zip.add(first)
+            upload_zip.add(second)
+
+        assert upload_zip.shards == [tmp_path / "out" / "upload-001.zip"]
+        with zipfile.ZipFile(upload_zip.shards[0]) as upload:
+            assert upload.namelist() == ["nomad.json", "a.nxs", "b.nxs"]
+            assert upload.read("a.nxs") == first.read_bytes()
+
+    def test_splits_into_shards_under_the_size_cap(self, tmp_path):
+        files = [_write_random(tmp_path / f"{i}.nxs", 40_000) for i in range(5)]
+        max_shard_bytes = 100_000
+
+        with ShardedUploadZip(
+            tmp_path / "upload.zip",
+            max_shard_bytes=max_shard_bytes,
+            root_files={"nomad.json": "{}\n"},
+        ) as upload_zip:
+            for path in files:
+                upload_zip.add(path)
+
+        assert len(upload_zip.shards) == 3
+        packed = []
+        for shard in upload_zip.shards:
+            assert shard.stat().st_size <= max_shard_bytes
+            with zipfile.ZipFile(shard) as upload:
+                assert "nomad.json" in upload.namelist()
+                packed += [name for name in upload.namelist() if name != "nomad.json"]
+        assert packed == [path.name for path in files]
+
+    def test_group_stays_in_one_shard(self, tmp_path):
+        first = _write_random(tmp_path / "a.nxs", 30_000)
+        nxs = _write_random(tmp_path / "b.nxs", 30_000)
+        rod = _write_random(tmp_path / "b.rod", 30_000)
+
+        with ShardedUploadZip(
+            tmp_path / "upload.zip", max_shard_bytes=70_000
+        ) as upload_zip:
+            upload_zip.add(first)
+            upload_zip.add(nxs, rod)
+
+        with zipfile.ZipFile(upload_zip.shards[1]) as upload:
+            assert upload.namelist() == ["b.nxs", "b.rod"]
+
+    def test_oversized_file_gets_its_own_shard(self, tmp_path, caplog):
+        small = _write_random(tmp_path / "a.nxs", 100)
+        large = _write_random(tmp_path / "b.nxs", 5_000)
+
+        with ShardedUploadZip(
+            tmp_path / "upload.zip", max_shard_bytes=1_000
+        ) as upload_zip:
+            upload_zip.add(small)
+            upload_zip.add(large)
+
+        assert len(upload_zip.shards) == 2
+        assert "exceed(s) the maximum shard size" in caplog.text
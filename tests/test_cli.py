@@ -17,10 +17,20 @@
 #
 """CLI tests for the top-level ``pynx-raman`` dispatcher."""
 
+import re
+import subprocess
+import sys
+
+import click
 import pytest
 from click.testing import CliRunner
 
-from pynxtools_raman.cli import pynx_raman
+from pynxtools_raman.cli import LAZY_SUBCOMMANDS, pynx_raman
+
+# Modules `pynx-raman --help` must not import, and those importing the CLI
+# module itself must not import.
+HEAVY_MODULES = ("pynxtools.dataconverter.convert", "gemmi", "requests", "numpy")
+CLI_IMPORT_HEAVY_MODULES = ("gemmi", "h5py", "pynxtools.dataconverter")
 
 
 @pytest.fixture()
@@ -32,7 +42,15 @@ class TestPynxRamanGroup:
     def test_lists_all_subcommands(self, runner):
         result = runner.invoke(pynx_raman, ["--help"])
         assert result.exit_code == 0
-        for name in ("download", "build-upload-batch", "analyze-keys"):
+        for name in (
+            "download",
+            "build-upload-batch",
+            "analyze-keys",
+            "build-archive",
+            "search-spectra",
+            "match-peaks",
+            "query",
+        ):
             assert name in result.output
 
     def test_unknown_command_fails(self, runner):
@@ -52,3 +70,57 @@ class TestPynxRamanGroup:
         result = runner.invoke(pynx_raman, ["analyze-keys", "--help"])
         assert result.exit_code == 0
         assert "ROD_DIR" in result.output
+
+
+class TestLazySubcommands:
+    @pytest.mark.parametrize("name", sorted(LAZY_SUBCOMMANDS))
+    def test_help_summary_is_the_first_docstring_line(self, name):
+        # The group's --help shows the summaries from LAZY_SUBCOMMANDS without
+        # importing anything; keep them in sync with the real docstrings.
+        summary = LAZY_SUBCOMMANDS[name][2]
+        command = pynx_raman.get_command(click.Context(pynx_raman), name)
+
+        assert command.help.splitlines()[0] == summary
+
+    def test_help_does_not_import_heavy_dependencies(self):
+        code = (
+            "import sys\n"
+            "from click.testing import CliRunner\n"
+            "from pynxtools_raman.cli import pynx_raman\n"
+            "CliRunner().invoke(pynx_raman, ['--help'])\n"
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "[]"
+
+    def test_importing_the_cli_does_not_import_heavy_dependencies(self):
+        code = (
+            "import sys\n"
+            "import pynxtools_raman.cli\n"
+            f"print([m for m in {CLI_IMPORT_HEAVY_MODULES!r} if m in sys.modules])\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "[]"
+        # wall-clock time varies too much between machines to assert on;
+        # only reported (see pytest -rP)
+        pattern = re.compile(
+            r"import time:\s+\d+ \|\s+(\d+) \|\s+pynxtools_raman\.cli$"
+        )
+        cumulative_us = next(
+            (
+                int(match.group(1))
+                for match in map(pattern.match, result.stderr.splitlines())
+                if match
+            ),
+            None,
+        )
+        print(f"importing pynxtools_raman.cli took {cumulative_us} us")
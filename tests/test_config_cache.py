@@ -0,0 +1,81 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the parsed config-file cache (config_cache.py)."""
+
+import os
+from pathlib import Path
+
+from pynxtools.dataconverter.readers.utils import parse_flatten_json
+
+from pynxtools_raman.config_cache import load_config_dict
+from pynxtools_raman.reader import CONFIG_DIR, RamanReader
+
+WITEC_FIXTURE = (
+    Path(__file__).parent / "data" / "witec" / "Si-wafer-Raman-Spectrum-1.txt"
+)
+WITEC_ELN = Path(__file__).parent / "data" / "witec" / "eln_data.yaml"
+
+
+def test_matches_parse_flatten_json():
+    for config_file in CONFIG_DIR.glob("*.json"):
+        assert load_config_dict(config_file) == parse_flatten_json(
+            config_file, create_link_dict=False
+        )
+
+
+def test_config_is_parsed_once_per_modification(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"/ENTRY[entry]/title": "@attrs:title"}')
+    parsed = []
+
+    def counting_parse(*args, **kwargs):
+        parsed.append(args[0])
+        return parse_flatten_json(*args, **kwargs)
+
+    monkeypatch.setattr(
+        "pynxtools_raman.config_cache.parse_flatten_json", counting_parse
+    )
+
+    assert load_config_dict(config_file) == {"/ENTRY[entry]/title": "@attrs:title"}
+    load_config_dict(str(config_file))
+    assert len(parsed) == 1
+
+    config_file.write_text('{"/ENTRY[entry]/title": "fixed title"}')
+    os.utime(config_file, ns=(0, config_file.stat().st_mtime_ns + 1_000_000))
+
+    assert load_config_dict(config_file) == {"/ENTRY[entry]/title": "fixed title"}
+    assert len(parsed) == 2
+
+
+def test_callers_get_their_own_copy(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"/ENTRY[entry]/title": "@attrs:title"}')
+
+    load_config_dict(config_file).clear()
+
+    assert load_config_dict(config_file) == {"/ENTRY[entry]/title": "@attrs:title"}
+
+
+def test_reader_hands_the_parser_config_to_multi_format_reader():
+    reader = RamanReader()
+
+    template = reader.read(file_paths=(str(WITEC_FIXTURE), str(WITEC_ELN)))
+
+    assert reader.config_file is None
+    assert reader.config_dict == load_config_dict(CONFIG_DIR / "config_file_witec.json")
+    assert template["/ENTRY[entry]/DATA[data]/AXISNAME[x_values]"] is not None
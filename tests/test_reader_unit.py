@@ -19,16 +19,21 @@
 guard behavior, as opposed to tests/test_reader.py's end-to-end conversion test.
 """
 
+import shutil
 from pathlib import Path
 
+import numpy as np
 import pytest
 
-from pynxtools_raman.reader import RamanReader
+from pynxtools_raman.parsers.rod import RodParser
+from pynxtools_raman.parsers.witec import WitecParser
+from pynxtools_raman.reader import CONFIG_DIR, RamanReader, _normalize_eln_key
 
 ROD_FIXTURE = Path(__file__).parent / "data" / "rod" / "rod_file_1000679.rod"
 WITEC_FIXTURE = (
     Path(__file__).parent / "data" / "witec" / "Si-wafer-Raman-Spectrum-1.txt"
 )
+WITEC_ELN = Path(__file__).parent / "data" / "witec" / "eln_data.yaml"
 
 
 class TestGetAttr:
@@ -64,6 +69,48 @@ class TestGetAttr:
         assert "No axis name corresponding to the path foo" in caplog.text
 
 
+class TestGetElnData:
+    def test_template_key_is_mapped_to_the_eln_key(self):
+        reader = RamanReader()
+        reader.eln_data = {
+            "/ENTRY[entry]/instrument/detector_ccd/count_time": 1.5,
+        }
+
+        value = reader.get_eln_data(
+            "/ENTRY[entry]/INSTRUMENT[instrument]/detector_TYPE[detector_ccd]/count_time",
+            "",
+        )
+
+        assert value == 1.5
+
+    def test_normalization_is_memoized(self):
+        _normalize_eln_key.cache_clear()
+        key = "/ENTRY[entry]/INSTRUMENT[instrument]/OPTICAL_LENS[objective_lens]/type"
+
+        assert _normalize_eln_key(key, "entry") == (
+            "/ENTRY[entry]/instrument/objective_lens/type"
+        )
+        _normalize_eln_key(key, "entry")
+
+        assert _normalize_eln_key.cache_info().hits == 1
+
+    def test_missing_key_warns(self, caplog):
+        reader = RamanReader()
+        reader.eln_data = {}
+
+        assert reader.get_eln_data("/ENTRY[entry]/TITLE[title]", "") is None
+        assert "after its modification to '/ENTRY[entry]/title'" in caplog.text
+
+    def test_missing_key_warns_once_per_conversion(self, caplog):
+        reader = RamanReader()
+        reader.eln_data = {}
+
+        for _ in range(3):
+            reader.get_eln_data("/ENTRY[entry]/TITLE[title]", "")
+
+        assert caplog.text.count("No key found during eln_data processing") == 1
+
+
 class TestGetData:
     def test_resolves_from_data(self):
         reader = RamanReader()
@@ -126,3 +173,126 @@ class TestHandleFileSkipsOnMismatch:
         assert result == {}
         assert reader._active_parser is not None
         assert reader.data
+
+
+class TestTheoreticalRodFiles:
+    @pytest.fixture()
+    def theoretical_rod(self, tmp_path) -> Path:
+        path = tmp_path / "theoretical.rod"
+        path.write_text(
+            ROD_FIXTURE.read_text(encoding="utf-8").replace(
+                "_raman_spectrum.intensity", "_raman_theoretical_spectrum.intensity"
+            ),
+            encoding="utf-8",
+        )
+        return path
+
+    def test_theoretical_file_is_skipped(self, theoretical_rod, caplog):
+        reader = RamanReader()
+
+        assert reader.handle_data_file(str(theoretical_rod)) == {}
+        assert reader._entries == []
+        assert "Theoretical Raman data .rod file found" in caplog.text
+
+    def test_theoretical_file_is_skipped_among_others(self, theoretical_rod, tmp_path):
+        measured = tmp_path / "measured.rod"
+        shutil.copy(ROD_FIXTURE, measured)
+
+        template = RamanReader().read(file_paths=(str(measured), str(theoretical_rod)))
+
+        assert template["/@default"] == "entry"
+
+
+class TestUnusedAttrsCollection:
+    def test_arrays_are_written_in_full(self):
+        reader = RamanReader()
+        reader.missing_meta_data = {"loop": np.arange(1001, dtype=np.float64)}
+
+        (value,) = reader._unused_attrs_collection().values()
+
+        assert value == str([float(i) for i in range(1001)])
+
+
+class TestMultiEntryRead:
+    """Several spectrum files in one read() -> one NXentry per file."""
+
+    @staticmethod
+    def _copies(tmp_path, fixture, names):
+        paths = []
+        for name in names:
+            path = tmp_path / f"{name}{fixture.suffix}"
+            shutil.copy(fixture, path)
+            paths.append(str(path))
+        return paths
+
+    def test_each_rod_file_becomes_its_own_entry(self, tmp_path):
+        file_paths = self._copies(tmp_path, ROD_FIXTURE, ["a", "b"])
+
+        template = RamanReader().read(file_paths=tuple(file_paths))
+
+        keys = list(template.keys())
+        assert not any(key.startswith("/ENTRY[entry]/") for key in keys)
+        for entry_name in ("entry_a", "entry_b"):
+            prefix = f"/ENTRY[{entry_name}]/"
+            assert template[f"{prefix}DATA[data]/AXISNAME[x_values_raman]"][
+                :3
+            ].tolist() == [50.0, 51.262, 52.523]
+            assert any(
+                key.startswith(f"{prefix}COLLECTION[unused_rod_keys]/") for key in keys
+            )
+        assert template["/@default"] == "entry_a"
+
+    def test_single_file_keeps_the_plain_entry_name(self, tmp_path):
+        file_paths = self._copies(tmp_path, ROD_FIXTURE, ["a"])
+
+        template = RamanReader().read(file_paths=tuple(file_paths))
+
+        assert template["/@default"] == "entry"
+        assert any(
+            key.startswith("/ENTRY[entry]/COLLECTION[unused_rod_keys]/")
+            for key in template.keys()
+        )
+
+    def test_eln_data_only_goes_to_the_entries_that_use_it(self, tmp_path, monkeypatch):
+        file_paths = self._copies(tmp_path, ROD_FIXTURE, ["rod"]) + self._copies(
+            tmp_path, WITEC_FIXTURE, ["witec"]
+        )
+        eln_data_seen = {}
+        for parser_class in (RodParser, WitecParser):
+            post_process = parser_class.post_process
+
+            def spy(parser, eln_data, post_process=post_process):
+                eln_data_seen[type(parser)] = eln_data
+                post_process(parser, eln_data)
+
+            monkeypatch.setattr(parser_class, "post_process", spy)
+        # a config file of its own must not add a further, plain "entry"
+        file_paths += [str(WITEC_ELN), str(CONFIG_DIR / "config_file_rod.json")]
+
+        template = RamanReader().read(file_paths=tuple(file_paths))
+
+        assert eln_data_seen[RodParser] == {}
+        assert eln_data_seen[WitecParser]
+        keys = list(template.keys())
+        assert "/ENTRY[entry_witec]/USER[user]/name" in keys
+        assert not any(key.startswith("/ENTRY[entry_rod]/USER[") for key in keys)
+        assert {key.split("/")[1] for key in keys} == {
+            "@default",
+            "ENTRY[entry_rod]",
+            "ENTRY[entry_witec]",
+        }
+
+    def test_duplicate_file_stems_get_distinct_entries(self, tmp_path):
+        (tmp_path / "one").mkdir()
+        (tmp_path / "two").mkdir()
+        first = self._copies(tmp_path / "one", WITEC_FIXTURE, ["spectrum"])
+        second = self._copies(tmp_path / "two", WITEC_FIXTURE, ["spectrum"])
+        reader = RamanReader()
+
+        for path in first + second:
+            reader.handle_txt_file(path)
+
+        assert [name for name, _ in reader._entries] == [
+            "entry_spectrum",
+            "entry_spectrum_2",
+        ]
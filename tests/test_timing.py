@@ -0,0 +1,154 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the opt-in stage timing (timing.py)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pynxtools_raman.reader import RamanReader
+from pynxtools_raman.timing import (
+    JsonLinesSink,
+    StageTimings,
+    collecting_timings,
+    recording_timings,
+    timed,
+    timing_enabled,
+)
+
+WITEC_FIXTURE = (
+    Path(__file__).parent / "data" / "witec" / "Si-wafer-Raman-Spectrum-1.txt"
+)
+WITEC_ELN = Path(__file__).parent / "data" / "witec" / "eln_data.yaml"
+
+
+class TestTimed:
+    def test_nothing_is_recorded_without_a_sink(self):
+        assert not timing_enabled()
+        with timed("parse") as record:
+            pass
+
+        assert record == {}
+
+    def test_record_has_stage_files_bytes_and_seconds(self, tmp_path):
+        file = tmp_path / "spectrum.txt"
+        file.write_bytes(b"12345")
+        records: list[dict] = []
+
+        with recording_timings(records.append):
+            with timed("parse", file, None):
+                pass
+
+        assert len(records) == 1
+        assert records[0]["stage"] == "parse"
+        assert records[0]["files"] == ["spectrum.txt"]
+        assert records[0]["bytes"] == 5
+        assert records[0]["seconds"] >= 0
+        assert not timing_enabled()
+
+    def test_record_is_emitted_when_the_stage_raises(self):
+        records: list[dict] = []
+
+        with recording_timings(records.append), pytest.raises(ValueError):
+            with timed("parse"):
+                raise ValueError("broken")
+
+        assert [record["stage"] for record in records] == ["parse"]
+
+    def test_collecting_bypasses_the_registered_sinks(self):
+        records: list[dict] = []
+
+        with recording_timings(records.append):
+            with collecting_timings() as collected:
+                with timed("convert"):
+                    pass
+
+        assert records == []
+        assert [record["stage"] for record in collected] == ["convert"]
+
+
+class TestSinks:
+    def test_json_lines_sink_appends_one_object_per_line(self, tmp_path):
+        log = tmp_path / "timings.jsonl"
+
+        for _ in range(2):
+            with JsonLinesSink(log) as sink, recording_timings(sink):
+                with timed("read"):
+                    pass
+
+        lines = log.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["stage"] for line in lines] == ["read", "read"]
+
+    def test_stage_timings_summary(self):
+        timings = StageTimings()
+        for seconds in range(1, 21):
+            timings({"stage": "parse", "seconds": float(seconds), "bytes": 10})
+        timings({"stage": "write", "seconds": 0.5})
+
+        summary = timings.summary()
+
+        assert list(summary) == ["parse", "write"]
+        assert summary["parse"] == {
+            "count": 20,
+            "total": 210.0,
+            "p50": 10.0,
+            "p95": 19.0,
+            "bytes": 200,
+        }
+        assert summary["write"]["p95"] == 0.5
+
+    def test_format_table_has_a_row_per_stage(self):
+        timings = StageTimings()
+        timings({"stage": "parse", "seconds": 0.25})
+
+        lines = timings.format_table().splitlines()
+
+        assert lines[0].split() == [
+            "Stage",
+            "Count",
+            "Total",
+            "[s]",
+            "p50",
+            "[s]",
+            "p95",
+            "[s]",
+            "Bytes",
+        ]
+        assert lines[1].split() == ["parse", "1", "0.250", "0.2500", "0.2500", "0"]
+
+
+def test_reader_stages_are_timed():
+    timings = StageTimings()
+
+    with recording_timings(timings):
+        RamanReader().read(file_paths=(str(WITEC_FIXTURE), str(WITEC_ELN)))
+
+    # the template itself is filled by MultiFormatReader, within "read"
+    assert set(timings.summary()) == {"parse", "post_process", "read"}
+
+
+def test_reader_times_filling_each_entry(tmp_path):
+    second = tmp_path / "second.txt"
+    second.write_bytes(WITEC_FIXTURE.read_bytes())
+    timings = StageTimings()
+
+    with recording_timings(timings):
+        RamanReader().read(file_paths=(str(WITEC_FIXTURE), str(second), str(WITEC_ELN)))
+
+    assert timings.summary()["fill_template"]["count"] == 2